@@ -0,0 +1,3 @@
+from cassio.cache.semantic_cache import SemanticCache
+
+__all__ = ["SemanticCache"]
@@ -0,0 +1,244 @@
+"""
+A semantic (i.e. approximate-match) cache backed by a vector table:
+payloads are stored along with a vector and retrieved by ANN for any
+query vector similar enough to a stored one.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import numpy as np
+
+from cassio.table.table_types import RowWithDistanceType, SessionType
+from cassio.table.tables import MetadataVectorCassandraTable
+
+
+class SemanticCache:
+    """
+    Each entry is a payload (a string) stored with its vector in a
+    metadata+vector table, whose row_id is a digest of the vector itself.
+
+    A lookup runs an ANN query for the single closest entry and returns its
+    payload if the similarity (`metric`, cosine by default) passes the
+    threshold. In front of that, a small in-process LRU layer answers exact
+    repeats of the vectors written or found through this instance,
+    with no round trip to the database.
+
+    Expiry relies on the table `ttl_seconds` (overridable per entry);
+    the in-process layer honours the same expiry.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        vector_dimension: Any,
+        session: Optional[SessionType] = None,
+        keyspace: Optional[str] = None,
+        similarity_threshold: float = 0.95,
+        metric: str = "cos",
+        ttl_seconds: Optional[int] = None,
+        local_cache_size: int = 256,
+        **kwargs: Any,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.metric = metric
+        self.ttl_seconds = ttl_seconds
+        self.local_cache_size = local_cache_size
+        # vector_id => (expiry time, payload)
+        self._local_entries: OrderedDict[
+            str, Tuple[Optional[float], str]
+        ] = OrderedDict()
+        self._local_lock = threading.Lock()
+        #
+        self.table = MetadataVectorCassandraTable(
+            session=session,
+            keyspace=keyspace,
+            table=table,
+            vector_dimension=vector_dimension,
+            ttl_seconds=ttl_seconds,
+            primary_key_type="TEXT",
+            **kwargs,
+        )
+
+    @staticmethod
+    def _vector_id(vector: List[float]) -> str:
+        # vectors are stored as float32, so that is what identifies them
+        return hashlib.sha256(
+            np.asarray(vector, dtype=np.float32).tobytes()
+        ).hexdigest()
+
+    def _local_get(self, vector_id: str) -> Optional[str]:
+        with self._local_lock:
+            entry = self._local_entries.get(vector_id)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._local_entries[vector_id]
+                return None
+            self._local_entries.move_to_end(vector_id)
+            return payload
+
+    def _local_put(
+        self, vector_id: str, payload: str, ttl_seconds: Optional[int]
+    ) -> None:
+        if self.local_cache_size <= 0:
+            return
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds is not None else None
+        with self._local_lock:
+            self._local_entries[vector_id] = (expires_at, payload)
+            self._local_entries.move_to_end(vector_id)
+            while len(self._local_entries) > self.local_cache_size:
+                self._local_entries.popitem(last=False)
+
+    def _local_delete(self, vector_id: str) -> None:
+        with self._local_lock:
+            self._local_entries.pop(vector_id, None)
+
+    def _local_clear(self) -> None:
+        with self._local_lock:
+            self._local_entries.clear()
+
+    def _get_put_kwargs(
+        self,
+        vector: List[float],
+        payload: str,
+        metadata: Optional[Dict[str, Any]],
+        ttl_seconds: Optional[int],
+    ) -> Dict[str, Any]:
+        return {
+            "row_id": self._vector_id(vector),
+            "body_blob": payload,
+            "vector": vector,
+            "metadata": metadata or {},
+            "ttl_seconds": ttl_seconds if ttl_seconds is not None else self.ttl_seconds,
+        }
+
+    def put(
+        self,
+        vector: List[float],
+        payload: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        put_kwargs = self._get_put_kwargs(vector, payload, metadata, ttl_seconds)
+        self.table.put(**put_kwargs)
+        self._local_put(put_kwargs["row_id"], payload, put_kwargs["ttl_seconds"])
+
+    async def aput(
+        self,
+        vector: List[float],
+        payload: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        put_kwargs = self._get_put_kwargs(vector, payload, metadata, ttl_seconds)
+        await self.table.aput(**put_kwargs)
+        self._local_put(put_kwargs["row_id"], payload, put_kwargs["ttl_seconds"])
+
+    def _get_lookup_kwargs(
+        self,
+        vector: List[float],
+        threshold: Optional[float],
+        metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        lookup_kwargs: Dict[str, Any] = {
+            "vector": vector,
+            "n": 1,
+            "metric": self.metric,
+            "metric_threshold": (
+                threshold if threshold is not None else self.similarity_threshold
+            ),
+        }
+        if metadata:
+            lookup_kwargs["metadata"] = metadata
+        return lookup_kwargs
+
+    def _finalize_lookup(
+        self, vector_id: str, hits: List[RowWithDistanceType]
+    ) -> Optional[RowWithDistanceType]:
+        if hits == []:
+            return None
+        hit = hits[0]
+        if hit["row_id"] == vector_id:
+            # an exact match: worth keeping in the local layer as well
+            self._local_put(vector_id, hit["body_blob"], self.ttl_seconds)
+        return hit
+
+    def lookup_row(
+        self,
+        vector: List[float],
+        threshold: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[RowWithDistanceType]:
+        """
+        Return the closest stored row (with its "distance") if it passes
+        the threshold, else None. This always queries the database.
+        """
+        hits = self.table.metric_ann_search(
+            **self._get_lookup_kwargs(vector, threshold, metadata)
+        )
+        return self._finalize_lookup(self._vector_id(vector), list(hits))
+
+    async def alookup_row(
+        self,
+        vector: List[float],
+        threshold: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[RowWithDistanceType]:
+        hits = await self.table.ametric_ann_search(
+            **self._get_lookup_kwargs(vector, threshold, metadata)
+        )
+        return self._finalize_lookup(self._vector_id(vector), list(hits))
+
+    def lookup(
+        self,
+        vector: List[float],
+        threshold: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Return the payload cached for the most similar vector,
+        provided it passes the threshold, or None.
+        """
+        if not metadata:
+            local_payload = self._local_get(self._vector_id(vector))
+            if local_payload is not None:
+                return local_payload
+        hit = self.lookup_row(vector, threshold=threshold, metadata=metadata)
+        return cast(Optional[str], hit["body_blob"] if hit is not None else None)
+
+    async def alookup(
+        self,
+        vector: List[float],
+        threshold: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        if not metadata:
+            local_payload = self._local_get(self._vector_id(vector))
+            if local_payload is not None:
+                return local_payload
+        hit = await self.alookup_row(vector, threshold=threshold, metadata=metadata)
+        return cast(Optional[str], hit["body_blob"] if hit is not None else None)
+
+    def delete(self, vector: List[float]) -> None:
+        """Will not complain if the entry does not exist."""
+        vector_id = self._vector_id(vector)
+        self._local_delete(vector_id)
+        self.table.delete(row_id=vector_id)
+
+    async def adelete(self, vector: List[float]) -> None:
+        vector_id = self._vector_id(vector)
+        self._local_delete(vector_id)
+        await self.table.adelete(row_id=vector_id)
+
+    def clear(self) -> None:
+        self._local_clear()
+        self.table.clear()
+
+    async def aclear(self) -> None:
+        self._local_clear()
+        await self.table.aclear()
@@ -2,9 +2,21 @@ import asyncio
 import json
 import logging
 from asyncio import InvalidStateError, Task
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from cassandra.cluster import ResponseFuture, ResultSet
+from cassandra.concurrent import execute_concurrent
 from cassandra.query import PreparedStatement, SimpleStatement
 
 from cassio.config import check_resolve_keyspace, check_resolve_session
@@ -17,7 +29,7 @@ from cassio.table.cql import (
     TRUNCATE_TABLE_CQL_TEMPLATE,
     CQLOpType,
 )
-from cassio.table.query import Predicate
+from cassio.table.query import Predicate, check_no_disjunctions
 from cassio.table.table_types import (
     ColumnSpecType,
     RowType,
@@ -25,6 +37,7 @@ from cassio.table.table_types import (
     normalize_type_desc,
 )
 from cassio.table.utils import (
+    call_wrapped_async,
     handle_multicolumn_packing,
     handle_multicolumn_unpacking,
     execute_cql,
@@ -45,6 +58,9 @@ logging.setLoggerClass(CustomLogger)
 
 logger = logging.getLogger(__name__)
 
+# max in-flight statements for the "many statements at once" operations
+DEFAULT_CONCURRENCY = 16
+
 
 class BaseTable:
     ordering_in_partition: Optional[Union[str, List[str]]] = None
@@ -169,6 +185,11 @@ class BaseTable:
             tuple(where_clause_vals),
         )
 
+    def _normalize_query_kwargs(self, args_dict: Dict[str, Any]) -> Dict[str, Any]:
+        # checked before any mixin rewrites the kwargs (e.g. metadata to strings)
+        check_no_disjunctions(args_dict)
+        return self._normalize_kwargs(args_dict, is_write=False)
+
     def _normalize_kwargs(
         self, args_dict: Dict[str, Any], is_write: bool
     ) -> Dict[str, Any]:
@@ -193,7 +214,7 @@ class BaseTable:
         return repacked_row
 
     def _get_delete_cql(self, **kwargs: Any) -> Tuple[str, Tuple[Any, ...]]:
-        n_kwargs = self._normalize_kwargs(kwargs, is_write=False)
+        n_kwargs = self._normalize_query_kwargs(kwargs)
         (
             rest_kwargs,
             where_clause_blocks,
@@ -275,7 +296,7 @@ class BaseTable:
     def _parse_select_core_params(
         self, **kwargs: Any
     ) -> Tuple[str, str, Tuple[Any, ...]]:
-        n_kwargs = self._normalize_kwargs(kwargs, is_write=False)
+        n_kwargs = self._normalize_query_kwargs(kwargs)
         # TODO: work on a columns: Optional[List[str]] = None
         # (but with nuanced handling of the column-magic we have here)
         columns = None
@@ -616,3 +637,137 @@ class BaseTable:
             Iterable[RowType],
             await execute_cql(self.session, statement, args),
         )
+
+    async def aexecute_cql_pages(
+        self,
+        cql_semitemplate: str,
+        args: Tuple[Any, ...] = tuple(),
+    ) -> AsyncIterator[List[RowType]]:
+        """
+        Run a read statement, yielding its results one page at a time
+        (each page is fetched only when the previous one is consumed).
+        """
+        final_cql = self._finalize_cql_semitemplate(cql_semitemplate)
+        statement = await asyncio.to_thread(self._obtain_prepared_statement, final_cql)
+        logger.debug(f'aExecuting statement "{final_cql}" as prepared, paged')
+        paging_state = None
+        while True:
+            result_set = await call_wrapped_async(
+                self.session.execute_async, statement, args, paging_state=paging_state
+            )
+            yield list(getattr(result_set, "current_rows", result_set))
+            paging_state = getattr(result_set, "paging_state", None)
+            if paging_state is None:
+                break
+
+    def execute_cql_concurrently(
+        self,
+        cql_semitemplate: str,
+        op_type: CQLOpType,
+        args_list: List[Tuple[Any, ...]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Iterable[RowType]]:
+        """
+        Run the same (prepared) statement once per entry in `args_list`,
+        with at most `concurrency` executions in flight at any time.
+        Results are returned in the order of `args_list`.
+        """
+        return self.execute_mixed_cql_concurrently(
+            [(cql_semitemplate, args) for args in args_list],
+            op_type,
+            concurrency=concurrency,
+        )
+
+    async def aexecute_cql_concurrently(
+        self,
+        cql_semitemplate: str,
+        op_type: CQLOpType,
+        args_list: List[Tuple[Any, ...]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Iterable[RowType]]:
+        return await self.aexecute_mixed_cql_concurrently(
+            [(cql_semitemplate, args) for args in args_list],
+            op_type,
+            concurrency=concurrency,
+        )
+
+    def execute_mixed_cql_concurrently(
+        self,
+        statements: List[Tuple[str, Tuple[Any, ...]]],
+        op_type: CQLOpType,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Iterable[RowType]]:
+        """
+        Like execute_cql_concurrently, for a list of (cql_semitemplate, args)
+        pairs: each distinct statement is prepared once.
+        """
+        if op_type == CQLOpType.SCHEMA:
+            raise RuntimeError("Schema operations cannot be concurrent")
+        final_cqls = [
+            self._finalize_cql_semitemplate(cql_semitemplate)
+            for cql_semitemplate, _ in statements
+        ]
+        prepared_statements = [
+            self._obtain_prepared_statement(final_cql) for final_cql in final_cqls
+        ]
+        logger.debug(
+            f"Executing {len(statements)} prepared statements concurrently "
+            f'(first: "{final_cqls[0] if final_cqls else ""}")'
+        )
+        results = execute_concurrent(
+            self.session,
+            [
+                (statement, args)
+                for statement, (_, args) in zip(prepared_statements, statements)
+            ],
+            concurrency=concurrency,
+            raise_on_first_error=True,
+            results_generator=False,
+        )
+        return [cast(Iterable[RowType], result) for _, result in results]
+
+    async def aexecute_mixed_cql_concurrently(
+        self,
+        statements: List[Tuple[str, Tuple[Any, ...]]],
+        op_type: CQLOpType,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Iterable[RowType]]:
+        if op_type == CQLOpType.SCHEMA:
+            raise RuntimeError("Schema operations cannot be concurrent")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _aexecute_one(
+            cql_semitemplate: str, args: Tuple[Any, ...]
+        ) -> Iterable[RowType]:
+            async with semaphore:
+                return await self.aexecute_cql(
+                    cql_semitemplate, op_type=op_type, args=args
+                )
+
+        return list(
+            await asyncio.gather(
+                *(
+                    _aexecute_one(cql_semitemplate, args)
+                    for cql_semitemplate, args in statements
+                )
+            )
+        )
+
+    def _merge_result_sets_by_primary_key(
+        self, result_sets: Iterable[Iterable[RowType]]
+    ) -> List[RowType]:
+        """
+        Concatenate (raw) result sets, keeping only the first occurrence
+        of each primary key.
+        """
+        primary_key_cols = [col for col, _ in self._schema_primary_key()]
+        seen_keys: Set[Tuple[Any, ...]] = set()
+        merged: List[RowType] = []
+        for result_set in result_sets:
+            for raw_row in result_set:
+                row = raw_row if isinstance(raw_row, dict) else raw_row._asdict()
+                row_key = tuple(row[pkc] for pkc in primary_key_cols)
+                if row_key not in seen_keys:
+                    seen_keys.add(row_key)
+                    merged.append(row)
+        return merged
@@ -0,0 +1,146 @@
+"""
+Bucketing strategies for clustered tables, to bound the size of partitions.
+
+A `bucket` column is added to the partition key, so that each (logical)
+partition is spread over several (physical) partitions. The buckets in use
+for each partition are recorded in a side "registry" table, which reads
+and deletes go through; writes pick the bucket with the strategy.
+"""
+
+import datetime
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+BUCKET_COLUMN = "bucket"
+BUCKET_COLUMN_TYPE = "BIGINT"
+
+# the partitions for which in-process bucketing state is kept (LRU)
+MAX_TRACKED_PARTITIONS = 10000
+
+# offset between the UUID epoch (1582-10-15) and the Unix epoch, in 100ns units
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def _row_id_timestamp(row_id: Any) -> Optional[float]:
+    # time-based row_ids (TIMEUUID, TIMESTAMP), or multi-column ones
+    # starting with such a value, carry their own time
+    if isinstance(row_id, tuple):
+        return _row_id_timestamp(row_id[0]) if row_id else None
+    if isinstance(row_id, uuid.UUID) and row_id.version == 1:
+        return (row_id.time - _UUID_EPOCH_OFFSET) / 1e7
+    if isinstance(row_id, datetime.datetime):
+        return row_id.timestamp()
+    return None
+
+
+def clustering_sort_key(row_id: Any) -> Any:
+    """
+    A Python sort key ordering row_id values as Cassandra does:
+    TIMEUUIDs, in particular, are ordered by their time first.
+    """
+    if isinstance(row_id, tuple):
+        return tuple(clustering_sort_key(value) for value in row_id)
+    if isinstance(row_id, uuid.UUID) and row_id.version == 1:
+        return (row_id.time, row_id.bytes)
+    return row_id
+
+
+class BucketingStrategy:
+    """
+    How rows of a partition are assigned to buckets. Buckets are integers,
+    increasing over time: reads visit them newest-first for DESC-ordered
+    partitions (oldest-first for ASC ones) and stop once enough rows are found,
+    which is exact as long as newer buckets hold later rows in clustering
+    order (e.g. time-based row_ids).
+    """
+
+    def needs_latest_bucket(self, partition_key: Hashable) -> bool:
+        """Whether `bucket_for_write` needs the latest registered bucket."""
+        return False
+
+    def bucket_for_row_id(self, row_id: Any) -> Optional[int]:
+        """The bucket of a row_id, if it can be told from the row_id alone."""
+        return None
+
+    def bucket_for_write(
+        self, partition_key: Hashable, row_id: Any, latest_bucket: Optional[int]
+    ) -> int:
+        raise NotImplementedError
+
+    def forget(self, partition_key: Hashable) -> None:
+        """Drop any state kept for a (deleted) partition."""
+        return None
+
+
+class TimeBucketing(BucketingStrategy):
+    """
+    Fixed-duration buckets. The time is taken from the row_id for time-based
+    row_ids (TIMEUUID or TIMESTAMP, possibly as first row_id column), so that
+    these rows can be read and deleted without consulting the registry;
+    otherwise the time of the write is used.
+    """
+
+    def __init__(
+        self, bucket_seconds: float, clock: Callable[[], float] = time.time
+    ) -> None:
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive.")
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+
+    def bucket_for_row_id(self, row_id: Any) -> Optional[int]:
+        timestamp = _row_id_timestamp(row_id)
+        if timestamp is None:
+            return None
+        return int(timestamp // self.bucket_seconds)
+
+    def bucket_for_write(
+        self, partition_key: Hashable, row_id: Any, latest_bucket: Optional[int]
+    ) -> int:
+        row_id_bucket = self.bucket_for_row_id(row_id)
+        if row_id_bucket is not None:
+            return row_id_bucket
+        return int(self.clock() // self.bucket_seconds)
+
+
+class CountBucketing(BucketingStrategy):
+    """
+    Buckets of (about) `rows_per_bucket` rows each. Rows are counted
+    in-process: a process resumes from the latest registered bucket, and
+    concurrent writers to the same partition may overfill buckets
+    (by at most `rows_per_bucket` rows per writer).
+    """
+
+    def __init__(self, rows_per_bucket: int) -> None:
+        if rows_per_bucket <= 0:
+            raise ValueError("rows_per_bucket must be positive.")
+        self.rows_per_bucket = rows_per_bucket
+        # partition_key => (current bucket, rows written to it)
+        self._counters: OrderedDict[Hashable, Tuple[int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def needs_latest_bucket(self, partition_key: Hashable) -> bool:
+        with self._lock:
+            return partition_key not in self._counters
+
+    def bucket_for_write(
+        self, partition_key: Hashable, row_id: Any, latest_bucket: Optional[int]
+    ) -> int:
+        with self._lock:
+            counter = self._counters.pop(partition_key, None)
+            if counter is None:
+                counter = (0 if latest_bucket is None else latest_bucket, 0)
+            bucket, count = counter
+            if count >= self.rows_per_bucket:
+                bucket, count = bucket + 1, 0
+            self._counters[partition_key] = (bucket, count + 1)
+            if len(self._counters) > MAX_TRACKED_PARTITIONS:
+                self._counters.popitem(last=False)
+            return bucket
+
+    def forget(self, partition_key: Hashable) -> None:
+        with self._lock:
+            self._counters.pop(partition_key, None)
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from cassandra.query import PreparedStatement, SimpleStatement
 
@@ -40,6 +40,17 @@ CREATE_ENTRIES_INDEX_CQL_TEMPLATE = (
     ""
 )
 
+# the registry of the buckets of each partition, for bucketed clustered tables
+CREATE_BUCKETS_TABLE_CQL_TEMPLATE = """CREATE TABLE IF NOT EXISTS {{table_fqname}}_buckets ({columns_spec} bucket BIGINT, PRIMARY KEY (({pk_spec}), bucket)) WITH CLUSTERING ORDER BY (bucket DESC);"""  # noqa: E501
+
+INSERT_BUCKET_CQL_TEMPLATE = """INSERT INTO {{table_fqname}}_buckets ({columns_desc}, bucket) VALUES ({value_placeholders}, %s);"""  # noqa: E501
+
+SELECT_BUCKETS_CQL_TEMPLATE = (
+    """SELECT bucket FROM {{table_fqname}}_buckets {where_clause} {limit_clause};"""
+)
+
+DELETE_BUCKETS_CQL_TEMPLATE = """DELETE FROM {{table_fqname}}_buckets {where_clause};"""
+
 SELECT_ANN_CQL_TEMPLATE = """SELECT {columns_desc} FROM {{table_fqname}} {where_clause} ORDER BY {vector_column} ANN OF %s {limit_clause};"""  # noqa: E501
 
 CQLStatementType = Union[str, SimpleStatement, PreparedStatement]
@@ -47,6 +58,34 @@ StatementWithArgs = Tuple[CQLStatementType, Tuple[Any, ...]]
 StatementStrWithArgs = Tuple[str, Tuple[Any, ...]]
 
 
+# Mock response future, always already completed
+class MockResponseFuture:
+    has_more_pages = False
+    _col_names = None
+    _col_types = None
+    _continuous_paging_session = None
+
+    def __init__(self, rows: List[Any]):
+        self.rows = rows
+
+    def result(self) -> List[Any]:
+        return self.rows
+
+    def add_callbacks(
+        self,
+        callback: Callable[..., Any],
+        errback: Callable[..., Any],
+        callback_args: Tuple[Any, ...] = tuple(),
+        callback_kwargs: Optional[Dict[str, Any]] = None,
+        errback_args: Tuple[Any, ...] = tuple(),
+        errback_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        callback(self.rows, *callback_args, **(callback_kwargs or {}))
+
+    def clear_callbacks(self) -> None:
+        return None
+
+
 # Mock DB session
 class MockDBSession:
     def __init__(self, verbose: bool = False):
@@ -114,6 +153,14 @@ class MockDBSession:
         self.statements.append((statement, arguments))
         return []
 
+    def execute_async(
+        self,
+        statement: CQLStatementType,
+        arguments: Tuple[Any, ...] = tuple(),
+        **kwargs: Any,
+    ) -> MockResponseFuture:
+        return MockResponseFuture(self.execute(statement, arguments))
+
     def last_raw(self, n: int) -> List[StatementWithArgs]:
         if n <= 0:
             return []
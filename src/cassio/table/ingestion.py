@@ -0,0 +1,276 @@
+"""
+Bulk ingestion of texts into vector tables: embedding calls are batched,
+and run while the writes of the previous batches are in flight.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import itertools
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+# An item to ingest is either a text or a dict of row arguments ("put" kwargs)
+# including the text as "body_blob" (and possibly row_id, metadata, ...).
+IngestionItemType = Union[str, Dict[str, Any]]
+EmbeddingFunctionType = Callable[
+    [List[str]], Union[List[List[float]], Awaitable[List[List[float]]]]
+]
+
+# how many embedded batches can be waiting for their writes (async pipeline)
+EMBEDDED_BATCH_QUEUE_SIZE = 2
+
+
+def default_row_id(text: str) -> str:
+    # content-addressed: re-ingesting a text overwrites the same row
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class IngestionReport:
+    """
+    Progress of an ingestion. `resume_from` is the position (in the input
+    items) from which to restart after a failure: all items before it are
+    known to be written.
+    """
+
+    def __init__(self, start_from: int) -> None:
+        self.start_from = start_from
+        self.resume_from = start_from
+        self.num_written = 0
+        self.num_batches = 0
+        self.embedding_seconds = 0.0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.num_written / self.elapsed_seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"IngestionReport(num_written={self.num_written}, "
+            f"num_batches={self.num_batches}, "
+            f"resume_from={self.resume_from}, "
+            f"embedding_seconds={self.embedding_seconds:.3f}, "
+            f"elapsed_seconds={self.elapsed_seconds:.3f})"
+        )
+
+
+class IngestionError(Exception):
+    """An ingestion failed: `report` tells where to resume from."""
+
+    def __init__(self, message: str, report: IngestionReport) -> None:
+        super().__init__(message)
+        self.report = report
+
+
+class _CompletionTracker:
+    # keeps report.resume_from at the first position not yet written
+    def __init__(self, report: IngestionReport) -> None:
+        self.report = report
+        self._written: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def mark_written(self, position: int) -> None:
+        with self._lock:
+            self.report.num_written += 1
+            self._written.add(position)
+            while self.report.resume_from in self._written:
+                self._written.remove(self.report.resume_from)
+                self.report.resume_from += 1
+
+
+def _to_row(item: IngestionItemType, row_id_fn: Callable[[str], Any]) -> Dict[str, Any]:
+    row = {"body_blob": item} if isinstance(item, str) else dict(item)
+    if "body_blob" not in row:
+        raise ValueError("Items to ingest must have a 'body_blob' text.")
+    if "vector" in row:
+        raise ValueError("Items to ingest must not have a 'vector': embed_fn makes it.")
+    if "row_id" not in row:
+        row["row_id"] = row_id_fn(row["body_blob"])
+    return row
+
+
+def _batches(
+    items: Iterable[IngestionItemType],
+    batch_size: int,
+    start_from: int,
+    row_id_fn: Callable[[str], Any],
+) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    positioned_items = itertools.islice(enumerate(items), start_from, None)
+    while True:
+        batch = [
+            (position, _to_row(item, row_id_fn))
+            for position, item in itertools.islice(positioned_items, batch_size)
+        ]
+        if batch == []:
+            return
+        yield batch
+
+
+def _check_vectors(vectors: List[List[float]], batch_length: int) -> None:
+    if len(vectors) != batch_length:
+        raise ValueError(
+            f"The embedding function returned {len(vectors)} vectors "
+            f"for {batch_length} texts."
+        )
+
+
+def ingest(
+    table: Any,
+    items: Iterable[IngestionItemType],
+    embed_fn: EmbeddingFunctionType,
+    batch_size: int = 32,
+    max_in_flight: int = 16,
+    start_from: int = 0,
+    row_id_fn: Callable[[str], Any] = default_row_id,
+    progress_callback: Optional[Callable[[IngestionReport], None]] = None,
+) -> IngestionReport:
+    report = IngestionReport(start_from)
+    tracker = _CompletionTracker(report)
+    slots = threading.BoundedSemaphore(max_in_flight)
+    write_errors: List[BaseException] = []
+    started = time.monotonic()
+
+    def _on_written(_: Any, position: int) -> None:
+        tracker.mark_written(position)
+        slots.release()
+
+    def _on_write_error(exc: BaseException, position: int) -> None:
+        write_errors.append(exc)
+        slots.release()
+
+    failure: Optional[BaseException] = None
+    try:
+        for batch in _batches(items, batch_size, start_from, row_id_fn):
+            if write_errors:
+                break
+            embedding_started = time.monotonic()
+            vectors = embed_fn([row["body_blob"] for _, row in batch])
+            if inspect.isawaitable(vectors):
+                raise ValueError("Use aingest with an asynchronous embed_fn.")
+            _check_vectors(vectors, len(batch))
+            report.embedding_seconds += time.monotonic() - embedding_started
+            # the writes proceed while the next batch is embedded
+            for (position, row), vector in zip(batch, vectors):
+                slots.acquire()
+                try:
+                    response_future = table.put_async(**row, vector=vector)
+                except Exception:
+                    # no callback will ever free this slot
+                    slots.release()
+                    raise
+                response_future.add_callbacks(
+                    _on_written,
+                    _on_write_error,
+                    callback_args=(position,),
+                    errback_args=(position,),
+                )
+            report.num_batches += 1
+            if progress_callback is not None:
+                report.elapsed_seconds = time.monotonic() - started
+                progress_callback(report)
+    except Exception as exc:
+        failure = exc
+    # wait for all pending writes
+    for _ in range(max_in_flight):
+        slots.acquire()
+    report.elapsed_seconds = time.monotonic() - started
+    if failure is None and write_errors:
+        failure = write_errors[0]
+    if failure is not None:
+        raise IngestionError(f"Ingestion failed: {failure}", report) from failure
+    return report
+
+
+async def aingest(
+    table: Any,
+    items: Iterable[IngestionItemType],
+    embed_fn: EmbeddingFunctionType,
+    batch_size: int = 32,
+    max_in_flight: int = 16,
+    start_from: int = 0,
+    row_id_fn: Callable[[str], Any] = default_row_id,
+    progress_callback: Optional[Callable[[IngestionReport], None]] = None,
+) -> IngestionReport:
+    report = IngestionReport(start_from)
+    tracker = _CompletionTracker(report)
+    slots = asyncio.Semaphore(max_in_flight)
+    write_errors: List[BaseException] = []
+    embedded_batches: asyncio.Queue[
+        Optional[Tuple[List[Tuple[int, Dict[str, Any]]], List[List[float]]]]
+    ] = asyncio.Queue(maxsize=EMBEDDED_BATCH_QUEUE_SIZE)
+    started = time.monotonic()
+
+    async def _embed(texts: List[str]) -> List[List[float]]:
+        if inspect.iscoroutinefunction(embed_fn):
+            return await embed_fn(texts)  # type: ignore[no-any-return]
+        vectors = await asyncio.to_thread(embed_fn, texts)
+        if inspect.isawaitable(vectors):
+            return await vectors
+        return vectors
+
+    async def _produce() -> None:
+        # embedding side: fill the queue with embedded batches, then a None
+        try:
+            for batch in _batches(items, batch_size, start_from, row_id_fn):
+                embedding_started = time.monotonic()
+                vectors = await _embed([row["body_blob"] for _, row in batch])
+                _check_vectors(vectors, len(batch))
+                report.embedding_seconds += time.monotonic() - embedding_started
+                await embedded_batches.put((batch, vectors))
+                if write_errors:
+                    break
+        finally:
+            await embedded_batches.put(None)
+
+    async def _write(position: int, row: Dict[str, Any]) -> None:
+        try:
+            await table.aput(**row)
+            tracker.mark_written(position)
+        except Exception as exc:
+            write_errors.append(exc)
+        finally:
+            slots.release()
+
+    producer = asyncio.ensure_future(_produce())
+    write_tasks: Set[asyncio.Task[None]] = set()
+    while True:
+        embedded_batch = await embedded_batches.get()
+        if embedded_batch is None:
+            break
+        if write_errors:
+            continue
+        batch, vectors = embedded_batch
+        for (position, row), vector in zip(batch, vectors):
+            await slots.acquire()
+            task = asyncio.ensure_future(_write(position, {**row, "vector": vector}))
+            write_tasks.add(task)
+            task.add_done_callback(write_tasks.discard)
+        report.num_batches += 1
+        if progress_callback is not None:
+            report.elapsed_seconds = time.monotonic() - started
+            progress_callback(report)
+    if write_tasks:
+        await asyncio.wait(write_tasks)
+    report.elapsed_seconds = time.monotonic() - started
+    failure: Optional[BaseException] = producer.exception()
+    if failure is None and write_errors:
+        failure = write_errors[0]
+    if failure is not None:
+        raise IngestionError(f"Ingestion failed: {failure}", report) from failure
+    return report
@@ -0,0 +1,134 @@
+"""
+Per-table encoding/decoding of the metadata dictionaries to/from the
+metadata columns, with a faster JSON backend (orjson) used when available.
+"""
+
+import json
+import math
+from typing import Any, Callable, Dict, Optional, Tuple, cast
+
+from cassio.table.table_types import MetadataIndexingPolicy, is_metadata_field_indexed
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# beyond this many distinct field names, indexing decisions are not cached
+MAX_CACHED_FIELD_NAMES = 4096
+
+
+def json_dumps_sorted(value: Any) -> str:
+    """
+    Compact JSON with sorted keys. For string-valued dicts (such as the
+    metadata blobs) the output is the same with either backend, i.e. that
+    of the json module, non-ASCII characters included (escaped as \\uXXXX).
+    Other values may be written differently (e.g. 1e16 vs. 1e+16).
+    """
+    if HAS_ORJSON:
+        try:
+            dumped = str(orjson.dumps(value, option=orjson.OPT_SORT_KEYS), "utf-8")
+            # orjson does not escape non-ASCII: leave that to the stdlib
+            if dumped.isascii():
+                return dumped
+        except TypeError:
+            # e.g. non-string keys or huge ints: the stdlib handles those
+            pass
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def json_loads(json_string: str) -> Any:
+    if HAS_ORJSON:
+        return orjson.loads(json_string)
+    return json.loads(json_string)
+
+
+def _coerce_float(value: float) -> str:
+    # repr is what json.dumps does for finite floats (NaN, Infinity otherwise)
+    return repr(value) if math.isfinite(value) else json.dumps(value)
+
+
+# exact-type dispatch for the common cases (subclasses go the slow way)
+_string_coercers: Dict[type, Callable[[Any], str]] = {
+    str: lambda value: cast(str, value),
+    bool: lambda value: "true" if value else "false",
+    # we don't want to store '1' and '1.0' differently
+    # for the sake of metadata-filtered retrieval:
+    int: lambda value: _coerce_float(float(value)),
+    float: _coerce_float,
+    type(None): lambda value: "null",
+}
+
+
+def coerce_metadata_value(value: Any) -> str:
+    """
+    The string stored (and matched) for a metadata value:
+        - strings are unchanged
+        - floats and integers v: JSON for float(v) (so 1 and 1.0 match)
+        - booleans: 'true'/'false' (JSON style)
+        - None => 'null' (JSON style)
+        - anything else v => str(v)
+    """
+    coercer = _string_coercers.get(type(value))
+    if coercer is not None:
+        return coercer(value)
+    if isinstance(value, str):
+        return str(value)
+    elif isinstance(value, bool):
+        # bool MUST come before int in this chain of ifs!
+        return json.dumps(bool(value))
+    elif isinstance(value, int):
+        return _coerce_float(float(value))
+    elif isinstance(value, float):
+        return _coerce_float(float(value))
+    else:
+        # when all else fails ...
+        return str(value)
+
+
+class MetadataCodec:
+    """
+    Splits metadata dicts into indexed and non-indexed ("attributes") parts
+    according to an indexing policy, caching the decision for each field name,
+    and reassembles the metadata dict of rows read back.
+    """
+
+    def __init__(self, indexing_policy: MetadataIndexingPolicy) -> None:
+        self.indexing_policy = indexing_policy
+        self._indexed_fields: Dict[str, bool] = {}
+
+    def is_indexed(self, field_name: str) -> bool:
+        indexed = self._indexed_fields.get(field_name)
+        if indexed is None:
+            indexed = is_metadata_field_indexed(field_name, self.indexing_policy)
+            if len(self._indexed_fields) < MAX_CACHED_FIELD_NAMES:
+                self._indexed_fields[field_name] = indexed
+        return indexed
+
+    def split(self, md_dict: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Return the indexed part of the metadata (values untouched) and the
+        serialized non-indexed part (None if empty), in a single pass.
+        """
+        indexed: Dict[str, Any] = {}
+        attributes: Dict[str, str] = {}
+        for k, v in md_dict.items():
+            if self.is_indexed(k):
+                indexed[k] = v
+            else:
+                attributes[k] = coerce_metadata_value(v)
+        return indexed, (json_dumps_sorted(attributes) if attributes else None)
+
+    @staticmethod
+    def merge(
+        attributes_blob: Optional[str], indexed_part: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """The metadata dict of a row, indexed fields taking precedence."""
+        if attributes_blob is None:
+            return dict(indexed_part) if indexed_part else {}
+        metadata = cast(Dict[str, Any], json_loads(attributes_blob))
+        if indexed_part:
+            metadata.update(indexed_part)
+        return metadata
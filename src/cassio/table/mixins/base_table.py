@@ -3,3 +3,7 @@ from cassio.table.base_table import BaseTable
 
 class BaseTableMixin(BaseTable):
     """All other mixins should inherit from this one."""
+
+    # mixins reading partitions by index, i.e. not through the bucket
+    # registry, opt out of bucketing (see ClusteredMixin)
+    supports_bucketing: bool = True
@@ -1,8 +1,39 @@
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from cassandra.cluster import ResponseFuture
 
-from cassio.table.cql import DELETE_CQL_TEMPLATE, SELECT_CQL_TEMPLATE, CQLOpType
+from cassio.table.base_table import DEFAULT_CONCURRENCY
+from cassio.table.bucketing import (
+    BUCKET_COLUMN,
+    BUCKET_COLUMN_TYPE,
+    BucketingStrategy,
+    clustering_sort_key,
+)
+from cassio.table.cql import (
+    CREATE_BUCKETS_TABLE_CQL_TEMPLATE,
+    DELETE_BUCKETS_CQL_TEMPLATE,
+    DELETE_CQL_TEMPLATE,
+    INSERT_BUCKET_CQL_TEMPLATE,
+    SELECT_BUCKETS_CQL_TEMPLATE,
+    SELECT_CQL_TEMPLATE,
+    CQLOpType,
+)
+from cassio.table.query import Predicate
 from cassio.table.table_types import ColumnSpecType, RowType, normalize_type_desc
 from cassio.table.utils import (
     handle_multicolumn_packing,
@@ -11,8 +42,32 @@ from cassio.table.utils import (
 
 from .base_table import BaseTableMixin
 
+logger = logging.getLogger(__name__)
+
 PARTITION_ID_TYPE = Union[Any, Tuple[Any]]
 
+# how get_partitions combines the rows of the partitions
+MERGE_INTERLEAVE = "interleave"
+MERGE_BY_CLUSTERING = "by_clustering"
+
+
+class PartitionPage:
+    """
+    A page of rows of a partition, in clustering order, and the cursor
+    (a row_id) to get the next page with. `next_cursor` is None
+    when there are no more rows.
+    """
+
+    def __init__(self, rows: List[RowType], next_cursor: Any) -> None:
+        self.rows = rows
+        self.next_cursor = next_cursor
+
+    def __repr__(self) -> str:
+        return (
+            f"PartitionPage(rows=<{len(self.rows)} rows>, "
+            f"next_cursor={self.next_cursor!r})"
+        )
+
 
 class ClusteredMixin(BaseTableMixin):
     def __init__(
@@ -21,8 +76,14 @@ class ClusteredMixin(BaseTableMixin):
         partition_id_type: Union[str, List[str]] = ["TEXT"],
         partition_id: Optional[PARTITION_ID_TYPE] = None,
         ordering_in_partition: Union[str, List[str]] = "ASC",
+        bucketing: Optional[BucketingStrategy] = None,
         **kwargs: Any,
     ) -> None:
+        if bucketing is not None and not self.supports_bucketing:
+            raise ValueError(
+                f"Bucketing is not supported by {type(self).__name__}: "
+                "its searches do not go through the buckets."
+            )
         self.partition_id_type = normalize_type_desc(partition_id_type)
         self.partition_id = partition_id
         if isinstance(ordering_in_partition, str):
@@ -31,9 +92,20 @@ class ClusteredMixin(BaseTableMixin):
             self.ordering_in_partition = [
                 ordering.upper() for ordering in ordering_in_partition
             ]
+            if bucketing is not None and len(set(self.ordering_in_partition)) > 1:
+                raise ValueError(
+                    "Bucketing requires the same ordering on all clustering columns."
+                )
+        self.bucketing = bucketing
         super().__init__(*pargs, **kwargs)
 
     def _schema_pk(self) -> List[ColumnSpecType]:
+        if self.bucketing is None:
+            return self._schema_partition_id()
+        else:
+            return self._schema_partition_id() + [(BUCKET_COLUMN, BUCKET_COLUMN_TYPE)]
+
+    def _schema_partition_id(self) -> List[ColumnSpecType]:
         if len(self.partition_id_type) == 1:
             return [
                 ("partition_id", self.partition_id_type[0]),
@@ -47,16 +119,340 @@ class ClusteredMixin(BaseTableMixin):
     def _schema_cc(self) -> List[ColumnSpecType]:
         return self._schema_row_id()
 
-    def _get_delete_partition_cql(
+    def _get_partition_id_values(
+        self, partition_id: Optional[PARTITION_ID_TYPE] = None
+    ) -> Dict[str, Any]:
+        _partition_id = self.partition_id if partition_id is None else partition_id
+        if _partition_id is None:
+            raise ValueError("A partition_id is required for bucketed tables.")
+        return handle_multicolumn_unpacking(
+            {"partition_id": _partition_id},
+            "partition_id",
+            [col for col, _ in self._schema_partition_id()],
+        )
+
+    def _get_partition_key(
+        self, partition_id: Optional[PARTITION_ID_TYPE] = None
+    ) -> Hashable:
+        pid_values = self._get_partition_id_values(partition_id)
+        return tuple(pid_values[col] for col, _ in self._schema_partition_id())
+
+    def _get_create_buckets_table_cql(self) -> str:
+        return CREATE_BUCKETS_TABLE_CQL_TEMPLATE.format(
+            columns_spec=" ".join(
+                f"{col} {col_type}," for col, col_type in self._schema_partition_id()
+            ),
+            pk_spec=", ".join(col for col, _ in self._schema_partition_id()),
+        )
+
+    def _get_buckets_where_clause(
+        self, partition_id: Optional[PARTITION_ID_TYPE] = None
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        pid_values = self._get_partition_id_values(partition_id)
+        where_clause = "WHERE " + " AND ".join(f"{col} = %s" for col in pid_values)
+        return where_clause, tuple(pid_values.values())
+
+    def _get_select_buckets_cql(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        latest_only: bool = False,
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        where_clause, where_cql_vals = self._get_buckets_where_clause(partition_id)
+        select_cql = SELECT_BUCKETS_CQL_TEMPLATE.format(
+            where_clause=where_clause,
+            limit_clause="LIMIT 1" if latest_only else "",
+        )
+        return select_cql, where_cql_vals
+
+    def _get_register_bucket_cql(
+        self, partition_id: Optional[PARTITION_ID_TYPE], bucket: int
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        pid_values = self._get_partition_id_values(partition_id)
+        insert_cql = INSERT_BUCKET_CQL_TEMPLATE.format(
+            columns_desc=", ".join(pid_values.keys()),
+            value_placeholders=", ".join("%s" for _ in pid_values),
+        )
+        return insert_cql, tuple(pid_values.values()) + (bucket,)
+
+    def _get_delete_buckets_cql(
         self, partition_id: Optional[PARTITION_ID_TYPE] = None
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        where_clause, where_cql_vals = self._get_buckets_where_clause(partition_id)
+        delete_cql = DELETE_BUCKETS_CQL_TEMPLATE.format(where_clause=where_clause)
+        return delete_cql, where_cql_vals
+
+    def db_setup(self) -> None:
+        super().db_setup()
+        if self.bucketing is not None:
+            self.execute_cql(
+                self._get_create_buckets_table_cql(), op_type=CQLOpType.SCHEMA
+            )
+
+    async def adb_setup(self) -> None:
+        await super().adb_setup()
+        if self.bucketing is not None:
+            await self.aexecute_cql(
+                self._get_create_buckets_table_cql(), op_type=CQLOpType.SCHEMA
+            )
+
+    @staticmethod
+    def _buckets_from_rows(rows: Iterable[Any]) -> List[int]:
+        return [
+            row.bucket if not isinstance(row, dict) else row[BUCKET_COLUMN]
+            for row in rows
+        ]
+
+    def _get_buckets(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        latest_only: bool = False,
+    ) -> List[int]:
+        # newest first
+        select_cql, select_cql_vals = self._get_select_buckets_cql(
+            partition_id, latest_only=latest_only
+        )
+        return self._buckets_from_rows(
+            self.execute_cql(select_cql, args=select_cql_vals, op_type=CQLOpType.READ)
+        )
+
+    async def _aget_buckets(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        latest_only: bool = False,
+    ) -> List[int]:
+        select_cql, select_cql_vals = self._get_select_buckets_cql(
+            partition_id, latest_only=latest_only
+        )
+        return self._buckets_from_rows(
+            await self.aexecute_cql(
+                select_cql, args=select_cql_vals, op_type=CQLOpType.READ
+            )
+        )
+
+    def _forget_partition_buckets(self, partition_key: Hashable) -> None:
+        assert self.bucketing is not None
+        self.bucketing.forget(partition_key)
+
+    def _get_newest_bucket_row(self, raw_rows: Iterable[Any]) -> Optional[RowType]:
+        # copies of a row in several buckets (racing writers): the newest wins
+        dict_rows = [
+            raw_row if isinstance(raw_row, dict) else raw_row._asdict()
+            for raw_row in raw_rows
+        ]
+        if dict_rows == []:
+            return None
+        return max(dict_rows, key=lambda dict_row: dict_row[BUCKET_COLUMN])
+
+    def _find_row_bucket(
+        self, partition_id: Optional[PARTITION_ID_TYPE], row_id: Any
+    ) -> Optional[int]:
+        # where a row already is, if anywhere: rewrites stay in that bucket
+        buckets = self._get_buckets(partition_id)
+        if buckets == []:
+            return None
+        select_cql, select_vals = self._get_select_cql(
+            partition_id=self.partition_id if partition_id is None else partition_id,
+            row_id=row_id,
+            **{BUCKET_COLUMN: buckets},
+        )
+        newest_row = self._get_newest_bucket_row(
+            self.execute_cql(select_cql, args=select_vals, op_type=CQLOpType.READ)
+        )
+        return None if newest_row is None else newest_row[BUCKET_COLUMN]
+
+    async def _afind_row_bucket(
+        self, partition_id: Optional[PARTITION_ID_TYPE], row_id: Any
+    ) -> Optional[int]:
+        buckets = await self._aget_buckets(partition_id)
+        if buckets == []:
+            return None
+        select_cql, select_vals = self._get_select_cql(
+            partition_id=self.partition_id if partition_id is None else partition_id,
+            row_id=row_id,
+            **{BUCKET_COLUMN: buckets},
+        )
+        newest_row = self._get_newest_bucket_row(
+            await self.aexecute_cql(
+                select_cql, args=select_vals, op_type=CQLOpType.READ
+            )
+        )
+        return None if newest_row is None else newest_row[BUCKET_COLUMN]
+
+    def _get_bucketed_write_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # the registry is written (upserted, every time: another process may
+        # have deleted the partition meanwhile) before the row, so that reads
+        # never miss it.
+        # Rows whose bucket cannot be told from the row_id cost one more read,
+        # to find (and overwrite) a previous version of the row.
+        assert self.bucketing is not None
+        partition_id = kwargs.get("partition_id")
+        partition_key = self._get_partition_key(partition_id)
+        row_id = kwargs.get("row_id")
+        bucket: Optional[int] = None
+        if self.bucketing.bucket_for_row_id(row_id) is None:
+            bucket = self._find_row_bucket(partition_id, row_id)
+        if bucket is None:
+            latest_bucket: Optional[int] = None
+            if self.bucketing.needs_latest_bucket(partition_key):
+                latest_bucket = next(
+                    iter(self._get_buckets(partition_id, latest_only=True)), None
+                )
+            bucket = self.bucketing.bucket_for_write(
+                partition_key, row_id, latest_bucket
+            )
+        register_cql, register_cql_vals = self._get_register_bucket_cql(
+            partition_id, bucket
+        )
+        self.execute_cql(register_cql, args=register_cql_vals, op_type=CQLOpType.WRITE)
+        return {**kwargs, BUCKET_COLUMN: bucket}
+
+    async def _aget_bucketed_write_kwargs(
+        self, kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        assert self.bucketing is not None
+        partition_id = kwargs.get("partition_id")
+        partition_key = self._get_partition_key(partition_id)
+        row_id = kwargs.get("row_id")
+        bucket: Optional[int] = None
+        if self.bucketing.bucket_for_row_id(row_id) is None:
+            bucket = await self._afind_row_bucket(partition_id, row_id)
+        if bucket is None:
+            latest_bucket: Optional[int] = None
+            if self.bucketing.needs_latest_bucket(partition_key):
+                latest_bucket = next(
+                    iter(await self._aget_buckets(partition_id, latest_only=True)),
+                    None,
+                )
+            bucket = self.bucketing.bucket_for_write(
+                partition_key, row_id, latest_bucket
+            )
+        register_cql, register_cql_vals = self._get_register_bucket_cql(
+            partition_id, bucket
+        )
+        await self.aexecute_cql(
+            register_cql, args=register_cql_vals, op_type=CQLOpType.WRITE
+        )
+        return {**kwargs, BUCKET_COLUMN: bucket}
+
+    def _get_bucketed_key_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # the row's own bucket if it can be told, else all (registered) buckets
+        assert self.bucketing is not None
+        bucket = self.bucketing.bucket_for_row_id(kwargs.get("row_id"))
+        if bucket is not None:
+            return {**kwargs, BUCKET_COLUMN: bucket}
+        return {**kwargs, BUCKET_COLUMN: self._get_buckets(kwargs.get("partition_id"))}
+
+    async def _aget_bucketed_key_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        assert self.bucketing is not None
+        bucket = self.bucketing.bucket_for_row_id(kwargs.get("row_id"))
+        if bucket is not None:
+            return {**kwargs, BUCKET_COLUMN: bucket}
+        return {
+            **kwargs,
+            BUCKET_COLUMN: await self._aget_buckets(kwargs.get("partition_id")),
+        }
+
+    def _extract_where_clause_blocks(
+        self, args_dict: Any
+    ) -> Tuple[Any, List[str], Tuple[Any, ...]]:
+        # a list of buckets (i.e. several physical partitions) becomes an IN
+        buckets = args_dict.get(BUCKET_COLUMN)
+        if not isinstance(buckets, list):
+            return super()._extract_where_clause_blocks(args_dict)
+        (
+            residual_args,
+            where_clause_blocks,
+            where_clause_vals,
+        ) = super()._extract_where_clause_blocks(
+            {k: v for k, v in args_dict.items() if k != BUCKET_COLUMN}
+        )
+        return (
+            residual_args,
+            where_clause_blocks + [f"{BUCKET_COLUMN} IN %s"],
+            where_clause_vals + (tuple(buckets),),
+        )
+
+    def put(self, **kwargs: Any) -> None:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = self._get_bucketed_write_kwargs(kwargs)
+        super().put(**kwargs)
+
+    def put_async(self, **kwargs: Any) -> ResponseFuture:
+        """
+        On bucketed tables, finding the bucket (and registering it) blocks
+        before the write is started: use `aput` to avoid blocking.
+        """
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = self._get_bucketed_write_kwargs(kwargs)
+        return super().put_async(**kwargs)
+
+    async def aput(self, **kwargs: Any) -> None:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = await self._aget_bucketed_write_kwargs(kwargs)
+        await super().aput(**kwargs)
+
+    def get(self, **kwargs: Any) -> Optional[RowType]:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = self._get_bucketed_key_kwargs(kwargs)
+            if isinstance(kwargs[BUCKET_COLUMN], list):
+                self._ensure_db_setup()
+                select_cql, select_vals = self._get_select_cql(**kwargs)
+                newest_row = self._get_newest_bucket_row(
+                    self.execute_cql(
+                        select_cql, args=select_vals, op_type=CQLOpType.READ
+                    )
+                )
+                return None if newest_row is None else self._normalize_row(newest_row)
+        return super().get(**kwargs)
+
+    async def aget(self, **kwargs: Any) -> Optional[RowType]:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = await self._aget_bucketed_key_kwargs(kwargs)
+            if isinstance(kwargs[BUCKET_COLUMN], list):
+                await self._aensure_db_setup()
+                select_cql, select_vals = self._get_select_cql(**kwargs)
+                newest_row = self._get_newest_bucket_row(
+                    await self.aexecute_cql(
+                        select_cql, args=select_vals, op_type=CQLOpType.READ
+                    )
+                )
+                return None if newest_row is None else self._normalize_row(newest_row)
+        return await super().aget(**kwargs)
+
+    def delete(self, **kwargs: Any) -> None:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = self._get_bucketed_key_kwargs(kwargs)
+        super().delete(**kwargs)
+
+    def delete_async(self, **kwargs: Any) -> ResponseFuture:
+        """
+        On bucketed tables, reading the buckets (unless the row_id tells
+        the bucket) blocks before the delete is started: use `adelete`
+        to avoid blocking.
+        """
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = self._get_bucketed_key_kwargs(kwargs)
+        return super().delete_async(**kwargs)
+
+    async def adelete(self, **kwargs: Any) -> None:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            kwargs = await self._aget_bucketed_key_kwargs(kwargs)
+        await super().adelete(**kwargs)
+
+    def _get_delete_partition_cql(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        buckets: Optional[List[int]] = None,
     ) -> Tuple[str, Tuple[Any, ...]]:
         _partition_id = self.partition_id if partition_id is None else partition_id
         #
         _pid_dict = handle_multicolumn_unpacking(
             {"partition_id": _partition_id},
             "partition_id",
-            [col for col, _ in self._schema_pk()],
+            [col for col, _ in self._schema_partition_id()],
         )
+        if buckets is not None:
+            _pid_dict[BUCKET_COLUMN] = buckets
         (
             rest_kwargs,
             where_clause_blocks,
@@ -72,21 +468,168 @@ class ClusteredMixin(BaseTableMixin):
     def delete_partition(
         self, partition_id: Optional[PARTITION_ID_TYPE] = None
     ) -> None:
-        delete_cql, delete_cql_vals = self._get_delete_partition_cql(partition_id)
+        if self.bucketing is None:
+            delete_cql, delete_cql_vals = self._get_delete_partition_cql(partition_id)
+            self.execute_cql(delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE)
+            return
+        # all buckets, then their registry
+        delete_cql, delete_cql_vals = self._get_delete_partition_cql(
+            partition_id, self._get_buckets(partition_id)
+        )
         self.execute_cql(delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE)
+        delete_b_cql, delete_b_cql_vals = self._get_delete_buckets_cql(partition_id)
+        self.execute_cql(delete_b_cql, args=delete_b_cql_vals, op_type=CQLOpType.WRITE)
+        self._forget_partition_buckets(self._get_partition_key(partition_id))
 
     def delete_partition_async(
         self, partition_id: Optional[PARTITION_ID_TYPE] = None
     ) -> ResponseFuture:
-        delete_cql, delete_cql_vals = self._get_delete_partition_cql(partition_id)
-        return self.execute_cql_async(
+        """
+        On bucketed tables, the buckets are read (blocking) before the delete
+        is started, and the returned future covers the rows only: the registry
+        is deleted afterwards, failures being logged. Use `adelete_partition`
+        to await both without blocking.
+        """
+        if self.bucketing is None:
+            delete_cql, delete_cql_vals = self._get_delete_partition_cql(partition_id)
+            return self.execute_cql_async(
+                delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE
+            )
+        delete_cql, delete_cql_vals = self._get_delete_partition_cql(
+            partition_id, self._get_buckets(partition_id)
+        )
+        delete_b_cql, delete_b_cql_vals = self._get_delete_buckets_cql(partition_id)
+        partition_key = self._get_partition_key(partition_id)
+        response_future = self.execute_cql_async(
             delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE
         )
 
+        def _log_failure(exc: Exception, step: str) -> None:
+            logger.warning(
+                f"Deleting the {step} of partition {partition_key} failed: {exc}"
+            )
+
+        # the registry goes only once the buckets are gone
+        def _on_buckets_deleted(_: Any) -> None:
+            self._forget_partition_buckets(partition_key)
+            self.execute_cql_async(
+                delete_b_cql, args=delete_b_cql_vals, op_type=CQLOpType.WRITE
+            ).add_callbacks(
+                lambda _: None, _log_failure, errback_args=("bucket registry",)
+            )
+
+        response_future.add_callbacks(
+            _on_buckets_deleted, _log_failure, errback_args=("rows",)
+        )
+        return response_future
+
     async def adelete_partition(
         self, partition_id: Optional[PARTITION_ID_TYPE] = None
     ) -> None:
-        delete_cql, delete_cql_vals = self._get_delete_partition_cql(partition_id)
+        if self.bucketing is None:
+            delete_cql, delete_cql_vals = self._get_delete_partition_cql(partition_id)
+            await self.aexecute_cql(
+                delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE
+            )
+            return
+        delete_cql, delete_cql_vals = self._get_delete_partition_cql(
+            partition_id, await self._aget_buckets(partition_id)
+        )
+        await self.aexecute_cql(
+            delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE
+        )
+        delete_b_cql, delete_b_cql_vals = self._get_delete_buckets_cql(partition_id)
+        await self.aexecute_cql(
+            delete_b_cql, args=delete_b_cql_vals, op_type=CQLOpType.WRITE
+        )
+        self._forget_partition_buckets(self._get_partition_key(partition_id))
+
+    def _get_delete_range_cql(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        row_id: Any = None,
+        buckets: Optional[List[int]] = None,
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        _partition_id = self.partition_id if partition_id is None else partition_id
+        if _partition_id is None:
+            raise ValueError("A partition_id is required for range deletes.")
+        if row_id is None:
+            raise ValueError(
+                "A row_id (prefix and/or Predicate) is required for range deletes."
+            )
+        if isinstance(row_id, (tuple, list)) and any(
+            isinstance(value, Predicate) for value in row_id[:-1]
+        ):
+            # Cassandra only allows a slice on the last restricted clustering column
+            raise ValueError(
+                "Only the last given row_id column can have a Predicate "
+                "in range deletes."
+            )
+        #
+        bucket_kwargs = {} if buckets is None else {BUCKET_COLUMN: buckets}
+        n_kwargs = self._normalize_query_kwargs(
+            {"partition_id": _partition_id, "row_id": row_id, **bucket_kwargs}
+        )
+        (
+            rest_kwargs,
+            where_clause_blocks,
+            delete_cql_vals,
+        ) = self._extract_where_clause_blocks(n_kwargs)
+        assert rest_kwargs == {}
+        where_clause = "WHERE " + " AND ".join(where_clause_blocks)
+        delete_cql = DELETE_CQL_TEMPLATE.format(
+            where_clause=where_clause,
+        )
+        return delete_cql, delete_cql_vals
+
+    def delete_range(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        row_id: Any = None,
+    ) -> None:
+        """
+        Delete, with a single statement (and a single range tombstone), the
+        rows of a partition whose row_id is in a range or has a given prefix.
+
+        `row_id` is a Predicate on the (single) clustering column, e.g.
+        `Predicate("<", cutoff)`, or for multi-column row_ids a tuple with
+        equality values for the first columns and possibly a Predicate last,
+        e.g. `("page0", Predicate(">=", 10))` or `("page0",)` (prefix).
+        """
+        buckets = None if self.bucketing is None else self._get_buckets(partition_id)
+        delete_cql, delete_cql_vals = self._get_delete_range_cql(
+            partition_id, row_id, buckets
+        )
+        self.execute_cql(delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE)
+
+    def delete_range_async(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        row_id: Any = None,
+    ) -> ResponseFuture:
+        """
+        On bucketed tables, reading the buckets blocks before the delete
+        is started: use `adelete_range` to avoid blocking.
+        """
+        buckets = None if self.bucketing is None else self._get_buckets(partition_id)
+        delete_cql, delete_cql_vals = self._get_delete_range_cql(
+            partition_id, row_id, buckets
+        )
+        return self.execute_cql_async(
+            delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE
+        )
+
+    async def adelete_range(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        row_id: Any = None,
+    ) -> None:
+        buckets = (
+            None if self.bucketing is None else await self._aget_buckets(partition_id)
+        )
+        delete_cql, delete_cql_vals = self._get_delete_range_cql(
+            partition_id, row_id, buckets
+        )
         await self.aexecute_cql(
             delete_cql, args=delete_cql_vals, op_type=CQLOpType.WRITE
         )
@@ -106,7 +649,7 @@ class ClusteredMixin(BaseTableMixin):
         new_args_dict = handle_multicolumn_unpacking(
             new_args_dict0,
             "partition_id",
-            [col for col, _ in self._schema_pk()],
+            [col for col, _ in self._schema_partition_id()],
         )
 
         return super()._normalize_kwargs(new_args_dict, is_write=is_write)
@@ -116,35 +659,94 @@ class ClusteredMixin(BaseTableMixin):
         repacked_row = handle_multicolumn_packing(
             unpacked_row=pre_normalized,
             key_name="partition_id",
-            unpacked_keys=[col for col, _ in self._schema_pk()],
+            unpacked_keys=[col for col, _ in self._schema_partition_id()],
         )
+        if self.bucketing is not None:
+            return {k: v for k, v in repacked_row.items() if k != BUCKET_COLUMN}
         return repacked_row
 
+    def _clustering_orderings(self) -> List[str]:
+        cc_columns = [col for col, _ in self._schema_cc()]
+        assert self.ordering_in_partition is not None
+        if isinstance(self.ordering_in_partition, str):
+            return [self.ordering_in_partition for _ in cc_columns]
+        else:
+            return list(self.ordering_in_partition)
+
+    def _get_cursor_where_clause_blocks(
+        self, after: Any = None, before: Any = None
+    ) -> Tuple[List[str], Tuple[Any, ...]]:
+        # "after"/"before" refer to the clustering order of the partition,
+        # whatever the ASC/DESC ordering of the clustering columns.
+        cc_columns = [col for col, _ in self._schema_cc()]
+        orderings = self._clustering_orderings()
+        if len(cc_columns) > 1 and len(set(orderings)) > 1:
+            if after is not None or before is not None:
+                raise ValueError(
+                    "Cursor pagination requires the same ordering "
+                    "on all clustering columns."
+                )
+        is_asc = orderings[0] == "ASC"
+        where_clause_blocks: List[str] = []
+        where_clause_vals: List[Any] = []
+        for cursor, asc_operator, desc_operator in [
+            (after, ">", "<"),
+            (before, "<", ">"),
+        ]:
+            if cursor is None:
+                continue
+            pred_op_name, pred_value = Predicate(
+                asc_operator if is_asc else desc_operator, cursor
+            ).render()
+            if len(cc_columns) == 1:
+                where_clause_blocks.append(f"{cc_columns[0]} {pred_op_name} %s")
+                where_clause_vals.append(pred_value)
+            else:
+                # a multi-column relation on (a prefix of) the clustering key
+                cursor_values = list(pred_value)
+                assert 0 < len(cursor_values) <= len(cc_columns)
+                cursor_columns = ", ".join(cc_columns[: len(cursor_values)])
+                placeholders = ", ".join("%s" for _ in cursor_values)
+                where_clause_blocks.append(
+                    f"({cursor_columns}) {pred_op_name} ({placeholders})"
+                )
+                where_clause_vals += cursor_values
+        return where_clause_blocks, tuple(where_clause_vals)
+
+    @staticmethod
+    def _is_backward_page(after: Any, before: Any) -> bool:
+        # only `before` given: read backwards from the cursor
+        # (the nearest rows to it), then flip the rows back in clustering order
+        return before is not None and after is None
+
     def _get_get_partition_cql(
         self,
         partition_id: Optional[PARTITION_ID_TYPE] = None,
         n: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        after: Any = None,
+        before: Any = None,
         **kwargs: Any,
     ) -> Tuple[str, Tuple[Any, ...]]:
         _partition_id = self.partition_id if partition_id is None else partition_id
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            raise ValueError(
+                "Partitions of bucketed tables are read one bucket at a time."
+            )
         #
-        # TODO: work on a columns: Optional[List[str]] = None
-        # (but with nuanced handling of the column-magic we have here)
-        columns = None
+        # columns, if given, are raw (i.e. schema) column names: the
+        # resulting rows are not suitable for _normalize_row.
         if columns is None:
             columns_desc = "*"
         else:
-            # TODO: handle translations here?
-            # columns_desc = ", ".join(columns)
-            raise NotImplementedError("Column selection is not implemented.")
+            columns_desc = ", ".join(columns)
         # WHERE can admit other sources (e.g. medata if the corresponding mixin)
         # so we escalate to standard WHERE-creation route and reinject the partition
-        n_kwargs = self._normalize_kwargs(
+        n_kwargs = self._normalize_query_kwargs(
             {
                 **{"partition_id": _partition_id},
                 **kwargs,
-            },
-            is_write=False,
+            }
         )
         (
             rest_kwargs,
@@ -154,14 +756,29 @@ class ClusteredMixin(BaseTableMixin):
 
         # check for exhaustion:
         assert rest_kwargs == {}
-        where_clause = "WHERE " + " AND ".join(where_clause_blocks)
-        where_cql_vals = list(select_cql_vals)
+        cursor_clause_blocks, cursor_cql_vals = self._get_cursor_where_clause_blocks(
+            after, before
+        )
+        where_clause = "WHERE " + " AND ".join(
+            where_clause_blocks + cursor_clause_blocks
+        )
+        where_cql_vals = list(select_cql_vals) + list(cursor_cql_vals)
         #
+        if self._is_backward_page(after, before):
+            flipped = {"ASC": "DESC", "DESC": "ASC"}
+            order_clause = "ORDER BY " + ", ".join(
+                f"{col} {flipped[ordering]}"
+                for (col, _), ordering in zip(
+                    self._schema_cc(), self._clustering_orderings()
+                )
+            )
+        else:
+            order_clause = ""
         if n is None:
-            limit_clause = ""
+            limit_clause = order_clause
             limit_cql_vals = []
         else:
-            limit_clause = "LIMIT %s"
+            limit_clause = f"{order_clause} LIMIT %s".strip()
             limit_cql_vals = [n]
         #
         select_cql = SELECT_CQL_TEMPLATE.format(
@@ -172,22 +789,217 @@ class ClusteredMixin(BaseTableMixin):
         get_p_cql_vals = tuple(where_cql_vals + limit_cql_vals)
         return select_cql, get_p_cql_vals
 
+    def _normalize_partition_rows(
+        self, raw_rows: Iterable[Any], after: Any, before: Any
+    ) -> Iterable[RowType]:
+        rows = (self._normalize_row(raw_row) for raw_row in raw_rows)
+        if self._is_backward_page(after, before):
+            return list(rows)[::-1]
+        else:
+            return rows
+
+    def _bucket_reading_order(
+        self, buckets: List[int], after: Any, before: Any
+    ) -> List[int]:
+        # buckets come newest-first
+        oldest_first = self._clustering_orderings()[0] == "ASC"
+        if self._is_backward_page(after, before):
+            oldest_first = not oldest_first
+        return buckets[::-1] if oldest_first else buckets
+
+    def _merge_bucket_rows(
+        self,
+        rows: List[RowType],
+        bucket_rows: Iterable[RowType],
+        n: Optional[int],
+        after: Any,
+        before: Any,
+        bucket: int,
+        row_buckets: Dict[Any, int],
+    ) -> List[RowType]:
+        # a row_id met in several buckets (racing writers) is kept only
+        # from the newest one: `row_buckets` tracks where each was read from
+        fresh_rows: List[RowType] = []
+        stale_row_ids: Set[Any] = set()
+        for row in bucket_rows:
+            seen_bucket = row_buckets.get(row["row_id"])
+            if seen_bucket is None or seen_bucket < bucket:
+                if seen_bucket is not None:
+                    stale_row_ids.add(row["row_id"])
+                row_buckets[row["row_id"]] = bucket
+                fresh_rows.append(row)
+        merged = list(
+            heapq.merge(
+                [row for row in rows if row["row_id"] not in stale_row_ids],
+                fresh_rows,
+                key=lambda row: clustering_sort_key(row["row_id"]),
+                reverse=self._clustering_orderings()[0] == "DESC",
+            )
+        )
+        if n is not None and len(merged) > n:
+            # keep the n rows nearest to the cursor
+            if self._is_backward_page(after, before):
+                return merged[-n:]
+            else:
+                return merged[:n]
+        return merged
+
+    def _get_bucketed_partition(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE],
+        n: Optional[int],
+        after: Any,
+        before: Any,
+        **kwargs: Any,
+    ) -> List[RowType]:
+        rows: List[RowType] = []
+        row_buckets: Dict[Any, int] = {}
+        buckets = self._bucket_reading_order(
+            self._get_buckets(partition_id), after, before
+        )
+        for bucket in buckets:
+            bucket_rows = self.get_partition(
+                partition_id,
+                n,
+                after=after,
+                before=before,
+                **{**kwargs, **{BUCKET_COLUMN: bucket}},
+            )
+            rows = self._merge_bucket_rows(
+                rows, bucket_rows, n, after, before, bucket, row_buckets
+            )
+            if n is not None and len(rows) >= n:
+                break
+        return rows
+
+    def _get_bucketed_partitions(
+        self,
+        partition_ids: Sequence[PARTITION_ID_TYPE],
+        n: Optional[int],
+        concurrency: int,
+        after: Any,
+        before: Any,
+        **kwargs: Any,
+    ) -> List[List[RowType]]:
+        # as _get_bucketed_partition for all partitions at once: in each
+        # round, the next bucket of every partition still short of rows
+        # is read, concurrently
+        bucket_lists = [
+            self._bucket_reading_order(
+                self._buckets_from_rows(result_set), after, before
+            )
+            for result_set in self.execute_mixed_cql_concurrently(
+                [
+                    self._get_select_buckets_cql(partition_id)
+                    for partition_id in partition_ids
+                ],
+                op_type=CQLOpType.READ,
+                concurrency=concurrency,
+            )
+        ]
+        partition_rows: List[List[RowType]] = [[] for _ in partition_ids]
+        row_buckets: List[Dict[Any, int]] = [{} for _ in partition_ids]
+        read_buckets = [0 for _ in partition_ids]
+        while True:
+            pending = [
+                p_i
+                for p_i, buckets in enumerate(bucket_lists)
+                if read_buckets[p_i] < len(buckets)
+                and (n is None or len(partition_rows[p_i]) < n)
+            ]
+            if pending == []:
+                return partition_rows
+            round_buckets = [bucket_lists[p_i][read_buckets[p_i]] for p_i in pending]
+            result_sets = self.execute_mixed_cql_concurrently(
+                [
+                    self._get_get_partition_cql(
+                        partition_ids[p_i],
+                        n,
+                        after=after,
+                        before=before,
+                        **{**kwargs, **{BUCKET_COLUMN: bucket}},
+                    )
+                    for p_i, bucket in zip(pending, round_buckets)
+                ],
+                op_type=CQLOpType.READ,
+                concurrency=concurrency,
+            )
+            for p_i, bucket, result_set in zip(pending, round_buckets, result_sets):
+                partition_rows[p_i] = self._merge_bucket_rows(
+                    partition_rows[p_i],
+                    self._normalize_partition_rows(result_set, after, before),
+                    n,
+                    after,
+                    before,
+                    bucket,
+                    row_buckets[p_i],
+                )
+                read_buckets[p_i] += 1
+
+    async def _aget_bucketed_partition(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE],
+        n: Optional[int],
+        after: Any,
+        before: Any,
+        **kwargs: Any,
+    ) -> List[RowType]:
+        rows: List[RowType] = []
+        row_buckets: Dict[Any, int] = {}
+        buckets = self._bucket_reading_order(
+            await self._aget_buckets(partition_id), after, before
+        )
+        for bucket in buckets:
+            bucket_rows = await self.aget_partition(
+                partition_id,
+                n,
+                after=after,
+                before=before,
+                **{**kwargs, **{BUCKET_COLUMN: bucket}},
+            )
+            rows = self._merge_bucket_rows(
+                rows, bucket_rows, n, after, before, bucket, row_buckets
+            )
+            if n is not None and len(rows) >= n:
+                break
+        return rows
+
     def get_partition(
         self,
         partition_id: Optional[PARTITION_ID_TYPE] = None,
         n: Optional[int] = None,
+        after: Any = None,
+        before: Any = None,
         **kwargs: Any,
     ) -> Iterable[RowType]:
+        """
+        Read (up to `n`) rows of a partition, in clustering order.
+
+        With `after` and/or `before` (row_id values), only the rows strictly
+        after/before them in clustering order are read, so that pages are
+        fetched without reading the preceding rows again. With `before` alone,
+        the `n` rows closest to it are returned (still in clustering order).
+        See `get_partition_page` for a ready-made cursor.
+
+        On bucketed tables, the buckets are read one after the other (in
+        clustering order: newest-first for DESC partitions), merging their
+        rows, until `n` rows are found.
+        """
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            return self._get_bucketed_partition(
+                partition_id, n, after=after, before=before, **kwargs
+            )
         select_cql, get_p_cql_vals = self._get_get_partition_cql(
-            partition_id, n, **kwargs
+            partition_id, n, after=after, before=before, **kwargs
         )
-        return (
-            self._normalize_row(raw_row)
-            for raw_row in self.execute_cql(
+        return self._normalize_partition_rows(
+            self.execute_cql(
                 select_cql,
                 args=get_p_cql_vals,
                 op_type=CQLOpType.READ,
-            )
+            ),
+            after,
+            before,
         )
 
     def get_partition_async(
@@ -202,16 +1014,199 @@ class ClusteredMixin(BaseTableMixin):
         self,
         partition_id: Optional[PARTITION_ID_TYPE] = None,
         n: Optional[int] = None,
+        after: Any = None,
+        before: Any = None,
         **kwargs: Any,
     ) -> Iterable[RowType]:
+        if self.bucketing is not None and BUCKET_COLUMN not in kwargs:
+            return await self._aget_bucketed_partition(
+                partition_id, n, after=after, before=before, **kwargs
+            )
         select_cql, get_p_cql_vals = self._get_get_partition_cql(
-            partition_id, n, **kwargs
+            partition_id, n, after=after, before=before, **kwargs
         )
-        return (
-            self._normalize_row(raw_row)
-            for raw_row in await self.aexecute_cql(
+        return self._normalize_partition_rows(
+            await self.aexecute_cql(
                 select_cql,
                 args=get_p_cql_vals,
                 op_type=CQLOpType.READ,
+            ),
+            after,
+            before,
+        )
+
+    def _make_partition_page(
+        self, rows: List[RowType], n: int, after: Any, before: Any
+    ) -> PartitionPage:
+        if len(rows) < n:
+            next_cursor = None
+        elif self._is_backward_page(after, before):
+            next_cursor = rows[0]["row_id"]
+        else:
+            next_cursor = rows[-1]["row_id"]
+        return PartitionPage(rows=rows, next_cursor=next_cursor)
+
+    def get_partition_page(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        n: int = 20,
+        after: Any = None,
+        before: Any = None,
+        **kwargs: Any,
+    ) -> PartitionPage:
+        """
+        Keyset pagination over a partition: read a page of `n` rows (in
+        clustering order) and return it with the cursor for the next page.
+
+        Paging forward, pass the `next_cursor` as `after`; paging backward
+        (i.e. started with `before` alone), pass it as `before` again.
+        """
+        rows = list(
+            self.get_partition(partition_id, n, after=after, before=before, **kwargs)
+        )
+        return self._make_partition_page(rows, n, after, before)
+
+    async def aget_partition_page(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        n: int = 20,
+        after: Any = None,
+        before: Any = None,
+        **kwargs: Any,
+    ) -> PartitionPage:
+        rows = list(
+            await self.aget_partition(
+                partition_id, n, after=after, before=before, **kwargs
             )
         )
+        return self._make_partition_page(rows, n, after, before)
+
+    def _merge_partitions(
+        self,
+        partition_ids: Sequence[PARTITION_ID_TYPE],
+        partition_rows: List[List[RowType]],
+        merge: Optional[str],
+    ) -> Union[Dict[Any, List[RowType]], List[RowType]]:
+        if merge is None:
+            # (multi-column partition_ids given as lists become hashable tuples)
+            return {
+                (tuple(p_id) if isinstance(p_id, list) else p_id): rows
+                for p_id, rows in zip(partition_ids, partition_rows)
+            }
+        elif merge == MERGE_INTERLEAVE:
+            return [
+                row
+                for row_group in itertools.zip_longest(*partition_rows)
+                for row in row_group
+                if row is not None
+            ]
+        else:
+            # ties go to the partition coming first in partition_ids
+            return list(
+                heapq.merge(
+                    *partition_rows,
+                    key=lambda row: clustering_sort_key(row["row_id"]),
+                    reverse=self._clustering_orderings()[0] == "DESC",
+                )
+            )
+
+    def _check_partitions_merge(self, merge: Optional[str]) -> None:
+        if merge not in {None, MERGE_INTERLEAVE, MERGE_BY_CLUSTERING}:
+            raise ValueError(f"Unknown merge mode '{merge}'.")
+        if merge == MERGE_BY_CLUSTERING and len(set(self._clustering_orderings())) > 1:
+            raise ValueError(
+                "Merging by clustering requires the same ordering "
+                "on all clustering columns."
+            )
+
+    def get_partitions(
+        self,
+        partition_ids: Sequence[PARTITION_ID_TYPE],
+        n_per_partition: Optional[int] = None,
+        merge: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> Union[Dict[Any, List[RowType]], List[RowType]]:
+        """
+        Read (up to `n_per_partition`) rows of each of several partitions,
+        concurrently, with the same prepared statement. Further arguments
+        are as for `get_partition`.
+
+        With merge=None, return a dict {partition_id: rows}; with
+        merge="interleave", a single list taking rows from each partition in
+        turn; with merge="by_clustering", a single list in clustering order.
+        On bucketed tables, the partitions advance bucket by bucket together,
+        each round of bucket reads being run concurrently.
+        """
+        self._check_partitions_merge(merge)
+        if self.bucketing is not None:
+            partition_rows = self._get_bucketed_partitions(
+                partition_ids,
+                n_per_partition,
+                concurrency,
+                kwargs.pop("after", None),
+                kwargs.pop("before", None),
+                **kwargs,
+            )
+        else:
+            result_sets = self.execute_mixed_cql_concurrently(
+                [
+                    self._get_get_partition_cql(partition_id, n_per_partition, **kwargs)
+                    for partition_id in partition_ids
+                ],
+                op_type=CQLOpType.READ,
+                concurrency=concurrency,
+            )
+            partition_rows = [
+                list(
+                    self._normalize_partition_rows(
+                        result_set, kwargs.get("after"), kwargs.get("before")
+                    )
+                )
+                for result_set in result_sets
+            ]
+        return self._merge_partitions(partition_ids, partition_rows, merge)
+
+    async def aget_partitions(
+        self,
+        partition_ids: Sequence[PARTITION_ID_TYPE],
+        n_per_partition: Optional[int] = None,
+        merge: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> Union[Dict[Any, List[RowType]], List[RowType]]:
+        self._check_partitions_merge(merge)
+        if self.bucketing is not None:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def _aget_one(partition_id: PARTITION_ID_TYPE) -> List[RowType]:
+                async with semaphore:
+                    return list(
+                        await self.aget_partition(
+                            partition_id, n_per_partition, **kwargs
+                        )
+                    )
+
+            partition_rows = list(
+                await asyncio.gather(
+                    *(_aget_one(partition_id) for partition_id in partition_ids)
+                )
+            )
+        else:
+            result_sets = await self.aexecute_mixed_cql_concurrently(
+                [
+                    self._get_get_partition_cql(partition_id, n_per_partition, **kwargs)
+                    for partition_id in partition_ids
+                ],
+                op_type=CQLOpType.READ,
+                concurrency=concurrency,
+            )
+            partition_rows = [
+                list(
+                    self._normalize_partition_rows(
+                        result_set, kwargs.get("after"), kwargs.get("before")
+                    )
+                )
+                for result_set in result_sets
+            ]
+        return self._merge_partitions(partition_ids, partition_rows, merge)
@@ -1,6 +1,19 @@
 import asyncio
-import json
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, cast
+import re
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from cassandra.cluster import ResponseFuture
 
@@ -9,29 +22,128 @@ from cassio.table.cql import (
     SELECT_CQL_TEMPLATE,
     CQLOpType,
 )
+from cassio.table.metadata_codec import (
+    MetadataCodec,
+    coerce_metadata_value,
+    json_dumps_sorted,
+    json_loads,
+)
+from cassio.table.planner import (
+    DEFAULT_MAX_FETCH,
+    SAI_STRATEGY,
+    MetadataStatistics,
+    QueryPlan,
+    plan_metadata_query,
+)
+from cassio.table.query import (
+    Predicate,
+    expand_disjunctions,
+    has_disjunctions,
+)
 from cassio.table.table_types import (
     ColumnSpecType,
     MetadataIndexingMode,
     MetadataIndexingPolicy,
     RowType,
-    is_metadata_field_indexed,
 )
 
 from .base_table import BaseTableMixin
 
+# columns making up the "metadata" of a row
+METADATA_COLUMNS = {"attributes_blob", "metadata_s", "metadata_n"}
+
+_BOOLEAN_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+
+
+def _to_boolean(value: Any) -> bool:
+    # unlike bool(), "false" is False and anything unexpected is refused
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in {0, 1}:
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _BOOLEAN_STRINGS:
+        return _BOOLEAN_STRINGS[value.strip().lower()]
+    raise ValueError(f"Cannot convert {value!r} to a boolean.")
+
+
+# conversion of promoted metadata values, by column type (default: unchanged)
+PROMOTED_VALUE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "TEXT": coerce_metadata_value,
+    "DOUBLE": float,
+    "FLOAT": float,
+    "INT": int,
+    "BIGINT": int,
+    "BOOLEAN": _to_boolean,
+}
+PROMOTED_FIELD_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 
 class MetadataMixin(BaseTableMixin):
+    supports_bucketing = False
+
     def __init__(
         self,
         *pargs: Any,
         metadata_indexing: Union[Tuple[str, Iterable[str]], str] = "all",
+        metadata_numeric: bool = False,
+        promoted_metadata: Optional[Union[Dict[str, str], Iterable[str]]] = None,
+        planner_max_fetch: int = DEFAULT_MAX_FETCH,
         **kwargs: Any,
     ) -> None:
+        self.metadata_numeric = metadata_numeric
+        self.metadata_statistics: Optional[MetadataStatistics] = None
+        self.planner_max_fetch = planner_max_fetch
+        self.promoted_metadata = self._normalize_promoted_metadata(promoted_metadata)
         self.metadata_indexing_policy = self._normalize_metadata_indexing_policy(
             metadata_indexing
         )
+        self.metadata_codec = MetadataCodec(self.metadata_indexing_policy)
+        self._promoted_columns = {
+            self._promoted_column(field_name) for field_name in self.promoted_metadata
+        }
         super().__init__(*pargs, **kwargs)
 
+    @staticmethod
+    def _normalize_promoted_metadata(
+        promoted_metadata: Optional[Union[Dict[str, str], Iterable[str]]],
+    ) -> Dict[str, str]:
+        # field name => CQL type of its column (TEXT if just names are given)
+        if promoted_metadata is None:
+            return {}
+        if isinstance(promoted_metadata, dict):
+            promoted = {k: v.upper() for k, v in promoted_metadata.items()}
+        else:
+            promoted = {k: "TEXT" for k in promoted_metadata}
+        for field_name in promoted:
+            if not PROMOTED_FIELD_NAME_PATTERN.match(field_name):
+                raise ValueError(
+                    f"Metadata field '{field_name}' cannot be promoted to a column."
+                )
+        return promoted
+
+    @staticmethod
+    def _promoted_column(field_name: str) -> str:
+        return f"md_{field_name}"
+
+    @staticmethod
+    def _get_create_promoted_index_cql(field_name: str) -> str:
+        return BaseTableMixin._get_create_index_cql(
+            index_name=f"idx_md_{field_name}",
+            index_column=MetadataMixin._promoted_column(field_name),
+            index_options=[],
+        )
+
+    def _convert_promoted_value(self, field_name: str, value: Any) -> Any:
+        if value is None:
+            return None
+        converter = PROMOTED_VALUE_CONVERTERS.get(self.promoted_metadata[field_name])
+        if converter is None:
+            return value
+        if isinstance(value, Predicate):
+            pred_op_name, pred_value = value.render()
+            return Predicate(pred_op_name, converter(pred_value))
+        return converter(value)
+
     @staticmethod
     def _normalize_metadata_indexing_policy(
         metadata_indexing: Union[Tuple[str, Iterable[str]], str],
@@ -74,10 +186,22 @@ class MetadataMixin(BaseTableMixin):
         return (mode, fields)
 
     def _schema_da(self) -> List[ColumnSpecType]:
-        return super()._schema_da() + [
-            ("attributes_blob", "TEXT"),
-            ("metadata_s", "MAP<TEXT,TEXT>"),
-        ]
+        numeric_columns = [("metadata_n", "MAP<TEXT,DOUBLE>")]
+        return (
+            super()._schema_da()
+            + [
+                ("attributes_blob", "TEXT"),
+                ("metadata_s", "MAP<TEXT,TEXT>"),
+            ]
+            + (numeric_columns if self.metadata_numeric else [])
+            + [
+                (self._promoted_column(field_name), column_type)
+                for field_name, column_type in self.promoted_metadata.items()
+            ]
+        )
+
+    def _entries_index_columns(self) -> List[str]:
+        return ["metadata_s"] + (["metadata_n"] if self.metadata_numeric else [])
 
     @staticmethod
     def _get_create_entries_index_cql(entries_index_column: str) -> str:
@@ -90,110 +214,106 @@ class MetadataMixin(BaseTableMixin):
         return create_index_cql
 
     def db_setup(self) -> None:
-        # Currently: an 'entries' index on the metadata_s column
+        # Currently: an 'entries' index on the metadata_s (and metadata_n) column
         super().db_setup()
         #
-        for entries_index_column in ["metadata_s"]:
+        for entries_index_column in self._entries_index_columns():
             create_index_cql = self._get_create_entries_index_cql(entries_index_column)
             self.execute_cql(create_index_cql, op_type=CQLOpType.SCHEMA)
+        for field_name in self.promoted_metadata:
+            self.execute_cql(
+                self._get_create_promoted_index_cql(field_name),
+                op_type=CQLOpType.SCHEMA,
+            )
 
     async def adb_setup(self) -> None:
-        # Currently: an 'entries' index on the metadata_s column
+        # Currently: an 'entries' index on the metadata_s (and metadata_n) column
         await super().adb_setup()
         #
-        for entries_index_column in ["metadata_s"]:
+        for entries_index_column in self._entries_index_columns():
             create_index_cql = self._get_create_entries_index_cql(entries_index_column)
             await self.aexecute_cql(create_index_cql, op_type=CQLOpType.SCHEMA)
+        for field_name in self.promoted_metadata:
+            await self.aexecute_cql(
+                self._get_create_promoted_index_cql(field_name),
+                op_type=CQLOpType.SCHEMA,
+            )
 
     @staticmethod
     def _serialize_md_dict(md_dict: Dict[str, Any]) -> str:
-        return json.dumps(md_dict, separators=(",", ":"), sort_keys=True)
+        return json_dumps_sorted(md_dict)
 
     @staticmethod
     def _deserialize_md_dict(md_string: str) -> Dict[str, Any]:
-        return cast(Dict[str, Any], json.loads(md_string))
+        return cast(Dict[str, Any], json_loads(md_string))
 
     @staticmethod
     def _coerce_string(value: Any) -> str:
-        if isinstance(value, str):
-            return value
-        elif isinstance(value, bool):
-            # bool MUST come before int in this chain of ifs!
-            return json.dumps(value)
-        elif isinstance(value, int):
-            # we don't want to store '1' and '1.0' differently
-            # for the sake of metadata-filtered retrieval:
-            return json.dumps(float(value))
-        elif isinstance(value, float):
-            return json.dumps(value)
-        elif value is None:
-            return json.dumps(value)
-        else:
-            # when all else fails ...
-            return str(value)
+        return coerce_metadata_value(value)
 
-    def _split_metadata_fields(self, md_dict: Dict[str, Any]) -> Dict[str, Any]:
+    def _split_metadata_fields(
+        self, md_dict: Dict[str, Any], is_write: bool = True
+    ) -> Dict[str, Any]:
         """
         Split the *indexed* part of the metadata in separate parts,
         one per Cassandra column.
 
-        Currently: everything gets cast to a string and goes to a single table
-        column. This means:
+        Everything gets cast to a string and goes to the metadata_s column.
+        This means:
             - strings are fine
             - floats and integers v: they are cast to str(v)
             - booleans: 'true'/'false' (JSON style)
             - None => 'null' (JSON style)
             - anything else v => str(v), no questions asked
 
-        Caveat: one gets strings back when reading metadata
+        With `metadata_numeric`, numbers are also written (as doubles) to the
+        metadata_n column, and read back as floats; `Predicate` values in
+        queries become (range) conditions on that column.
         """
-
-        # TODO: more care about types here
-        stringy_part = {k: self._coerce_string(v) for k, v in md_dict.items()}
+        stringy_part: Dict[str, str] = {}
+        numeric_part: Dict[str, Any] = {}
+        for k, v in md_dict.items():
+            if isinstance(v, Predicate):
+                if not self.metadata_numeric:
+                    raise ValueError(
+                        "Range conditions on metadata require metadata_numeric=True."
+                    )
+                numeric_part[k] = v
+            else:
+                stringy_part[k] = coerce_metadata_value(v)
+                if (
+                    is_write
+                    and self.metadata_numeric
+                    and isinstance(v, (int, float))
+                    and not isinstance(v, bool)
+                ):
+                    numeric_part[k] = float(v)
+        if self.metadata_numeric:
+            return {
+                "metadata_s": stringy_part,
+                "metadata_n": numeric_part,
+            }
         return {
             "metadata_s": stringy_part,
         }
 
     def _normalize_row(self, raw_row: Any) -> Dict[str, Any]:
-        md_columns_defaults: Dict[str, Any] = {
-            "metadata_s": {},
-        }
         pre_normalized = super()._normalize_row(raw_row)
         #
-        row_rest = {
-            k: v
-            for k, v in pre_normalized.items()
-            if k not in md_columns_defaults
-            if k != "attributes_blob"
-        }
-        mergee_md_fields = {
-            k: v for k, v in pre_normalized.items() if k in md_columns_defaults
-        }
-        normalized_mergee_md_fields = {
-            k: v if v is not None else md_columns_defaults[k]
-            for k, v in mergee_md_fields.items()
-        }
-        r_md_from_s = {
-            k: v for k, v in normalized_mergee_md_fields["metadata_s"].items()
-        }
-        #
-        raw_attr_blob = pre_normalized.get("attributes_blob")
-        if raw_attr_blob is not None:
-            r_attrs = self._deserialize_md_dict(raw_attr_blob)
-        else:
-            r_attrs = {}
-        #
-        row_metadata = {
-            "metadata": {
-                **r_attrs,
-                **r_md_from_s,
-            },
-        }
-        #
-        normalized = {
-            **row_metadata,
-            **row_rest,
-        }
+        metadata = self.metadata_codec.merge(
+            pre_normalized.get("attributes_blob"),
+            pre_normalized.get("metadata_s"),
+        )
+        if pre_normalized.get("metadata_n"):
+            metadata.update(pre_normalized["metadata_n"])
+        for field_name in self.promoted_metadata:
+            promoted_value = pre_normalized.get(self._promoted_column(field_name))
+            if promoted_value is not None:
+                metadata[field_name] = promoted_value
+        normalized: Dict[str, Any] = {"metadata": metadata}
+        for k, v in pre_normalized.items():
+            if k not in METADATA_COLUMNS and k not in self._promoted_columns:
+                normalized[k] = v
         return normalized
 
     def _normalize_kwargs(
@@ -201,42 +321,47 @@ class MetadataMixin(BaseTableMixin):
     ) -> Dict[str, Any]:
         _force_md_columns = "metadata" in args_dict and is_write
         _metadata_input_dict = args_dict.get("metadata", {})
+        # promoted fields go to their own columns (all of them, when writing)
+        promoted_fields: Dict[str, Any] = {}
+        if self.promoted_metadata:
+            promoted_fields = {
+                self._promoted_column(k): self._convert_promoted_value(
+                    k, _metadata_input_dict.get(k)
+                )
+                for k in self.promoted_metadata
+                if _force_md_columns or k in _metadata_input_dict
+            }
+            _metadata_input_dict = {
+                k: v
+                for k, v in _metadata_input_dict.items()
+                if k not in self.promoted_metadata
+            }
         # separate indexed and non-indexed (=attributes) as per indexing policy
-        metadata_indexed_dict = {
-            k: v
-            for k, v in _metadata_input_dict.items()
-            if is_metadata_field_indexed(k, self.metadata_indexing_policy)
-        }
-        attributes_dict = {
-            k: self._coerce_string(v)
-            for k, v in _metadata_input_dict.items()
-            if not is_metadata_field_indexed(k, self.metadata_indexing_policy)
-        }
+        metadata_indexed_dict, attributes_blob = self.metadata_codec.split(
+            _metadata_input_dict
+        )
         #
         attributes_fields: Dict[str, Any]
-        if attributes_dict != {}:
-            attributes_fields = {
-                "attributes_blob": self._serialize_md_dict(attributes_dict)
-            }
+        if attributes_blob is not None:
+            attributes_fields = {"attributes_blob": attributes_blob}
         else:
             attributes_fields = {"attributes_blob": None} if _force_md_columns else {}
         #
+        split_metadata_fields = self._split_metadata_fields(
+            metadata_indexed_dict, is_write=is_write
+        )
         if _force_md_columns:
-            new_metadata_fields = {
-                k: v
-                for k, v in self._split_metadata_fields(metadata_indexed_dict).items()
-            }
+            new_metadata_fields = split_metadata_fields
         else:
             new_metadata_fields = {
-                k: v
-                for k, v in self._split_metadata_fields(metadata_indexed_dict).items()
-                if v != {} and v != set()
+                k: v for k, v in split_metadata_fields.items() if v != {} and v != set()
             }
         #
         new_args_dict = {
             **{k: v for k, v in args_dict.items() if k != "metadata"},
             **attributes_fields,
             **new_metadata_fields,
+            **promoted_fields,
         }
         return super()._normalize_kwargs(new_args_dict, is_write=is_write)
 
@@ -248,7 +373,7 @@ class MetadataMixin(BaseTableMixin):
         assert "metadata" not in args_dict
         if "attributes_blob" in args_dict:
             raise ValueError("Non-indexed metadata fields cannot be used in queries.")
-        md_keys = {"metadata_s"}
+        md_keys = {"metadata_s", "metadata_n"}
         new_args_dict = {k: v for k, v in args_dict.items() if k not in md_keys}
         # Here the "metadata" entry is made into specific where clauses
         split_metadata = {k: v for k, v in args_dict.items() if k in md_keys}
@@ -258,6 +383,10 @@ class MetadataMixin(BaseTableMixin):
         for k, v in sorted(split_metadata.get("metadata_s", {}).items()):
             these_wc_blocks.append("metadata_s[%s] = %s")
             these_wc_vals_list.extend([k, v])
+        for k, v in sorted(split_metadata.get("metadata_n", {}).items()):
+            pred_op_name, pred_value = v.render()
+            these_wc_blocks.append(f"metadata_n[%s] {pred_op_name} %s")
+            these_wc_vals_list.extend([k, float(pred_value)])
         # no new kwargs keys are created, all goes to WHERE
         this_args_dict: Dict[str, Any] = {}
         these_wc_vals = tuple(these_wc_vals_list)
@@ -288,7 +417,133 @@ class MetadataMixin(BaseTableMixin):
         )
         return select_cql, select_vals
 
+    def _get_disjunctive_find_entries_cqls(
+        self, n: int, **kwargs: Any
+    ) -> List[Tuple[str, Tuple[Any, ...]]]:
+        return [
+            self._get_find_entries_cql(n, **sub_kwargs)
+            for sub_kwargs in expand_disjunctions(kwargs)
+        ]
+
+    def _get_metadata_sample_cql(self, sample_size: int) -> Tuple[str, Tuple[Any, ...]]:
+        select_cql = SELECT_CQL_TEMPLATE.format(
+            columns_desc="*",
+            where_clause="",
+            limit_clause="LIMIT %s",
+        )
+        return select_cql, (sample_size,)
+
+    def collect_metadata_statistics(self, sample_size: int = 1000) -> None:
+        """
+        Sample (up to) `sample_size` rows to estimate how selective each
+        metadata condition is. From then on, find_entries plans its queries
+        (see `explain`) with these statistics.
+        """
+        sample_cql, sample_vals = self._get_metadata_sample_cql(sample_size)
+        statistics = MetadataStatistics()
+        statistics.observe(
+            self._normalize_row(raw_row)
+            for raw_row in self.execute_cql(
+                sample_cql, args=sample_vals, op_type=CQLOpType.READ
+            )
+        )
+        self.metadata_statistics = statistics
+
+    async def acollect_metadata_statistics(self, sample_size: int = 1000) -> None:
+        sample_cql, sample_vals = self._get_metadata_sample_cql(sample_size)
+        statistics = MetadataStatistics()
+        statistics.observe(
+            self._normalize_row(raw_row)
+            for raw_row in await self.aexecute_cql(
+                sample_cql, args=sample_vals, op_type=CQLOpType.READ
+            )
+        )
+        self.metadata_statistics = statistics
+
+    def _is_partition_restricted(self, **kwargs: Any) -> bool:
+        if not all(col.startswith("partition_id") for col, _ in self._schema_pk()):
+            return False
+        partition_id = kwargs.get("partition_id", getattr(self, "partition_id", None))
+        return partition_id is not None
+
+    def _plan_find_entries(self, n: int, **kwargs: Any) -> QueryPlan:
+        md_dict = kwargs.get("metadata", {})
+        # only plain conditions on the metadata_s column can move client-side
+        plannable_metadata = {
+            k: v
+            for k, v in md_dict.items()
+            if not isinstance(v, Predicate)
+            if k not in self.promoted_metadata
+            if self.metadata_codec.is_indexed(k)
+        }
+        return plan_metadata_query(
+            self.metadata_statistics,
+            n,
+            plannable_metadata,
+            {k: v for k, v in md_dict.items() if k not in plannable_metadata},
+            self._is_partition_restricted(**kwargs),
+            self.planner_max_fetch,
+        )
+
+    def _get_planned_find_entries_cql(
+        self, plan: QueryPlan, **kwargs: Any
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        assert plan.fetch_n is not None
+        return self._get_find_entries_cql(
+            plan.fetch_n, **{**kwargs, "metadata": plan.server_metadata}
+        )
+
+    @staticmethod
+    def _filter_planned_rows(
+        plan: QueryPlan, n: int, result_set: Iterable[Any]
+    ) -> Optional[List[RowType]]:
+        # None if inconclusive (too few matches, but more rows were there)
+        raw_rows = [
+            raw_row if isinstance(raw_row, dict) else raw_row._asdict()
+            for raw_row in result_set
+        ]
+        matching = [raw_row for raw_row in raw_rows if plan.matches(raw_row)]
+        if len(matching) < n and plan.fetch_n is not None:
+            if len(raw_rows) >= plan.fetch_n:
+                return None
+        return matching[:n]
+
+    def explain(self, n: int, **kwargs: Any) -> str:
+        """
+        Describe how `find_entries(n, **kwargs)` would be run.
+        Disjunctive queries are described sub-query by sub-query.
+        """
+        if has_disjunctions(kwargs):
+            sub_queries = expand_disjunctions(kwargs)
+            return "\n".join(
+                f"sub-query {sq_i + 1}/{len(sub_queries)}:\n"
+                + self._plan_find_entries(n, **sub_kwargs).explain()
+                for sq_i, sub_kwargs in enumerate(sub_queries)
+            )
+        return self._plan_find_entries(n, **kwargs).explain()
+
     def _find_unnormalized_entries(self, n: int, **kwargs: Any) -> Iterable[RowType]:
+        if has_disjunctions(kwargs):
+            # concurrent sub-queries, then union (by primary key) up to n
+            result_sets = self.execute_mixed_cql_concurrently(
+                self._get_disjunctive_find_entries_cqls(n, **kwargs),
+                op_type=CQLOpType.READ,
+            )
+            return self._merge_result_sets_by_primary_key(result_sets)[:n]
+        plan = self._plan_find_entries(n, **kwargs)
+        if plan.strategy != SAI_STRATEGY:
+            planned_cql, planned_vals = self._get_planned_find_entries_cql(
+                plan, **kwargs
+            )
+            planned_rows = self._filter_planned_rows(
+                plan,
+                n,
+                self.execute_cql(
+                    planned_cql, args=planned_vals, op_type=CQLOpType.READ
+                ),
+            )
+            if planned_rows is not None:
+                return planned_rows
         select_cql, select_vals = self._get_find_entries_cql(n, **kwargs)
         result_set = self.execute_cql(
             select_cql, args=select_vals, op_type=CQLOpType.READ
@@ -313,6 +568,26 @@ class MetadataMixin(BaseTableMixin):
     async def _afind_unnormalized_entries(
         self, n: int, **kwargs: Any
     ) -> Iterable[RowType]:
+        if has_disjunctions(kwargs):
+            result_sets = await self.aexecute_mixed_cql_concurrently(
+                self._get_disjunctive_find_entries_cqls(n, **kwargs),
+                op_type=CQLOpType.READ,
+            )
+            return self._merge_result_sets_by_primary_key(result_sets)[:n]
+        plan = self._plan_find_entries(n, **kwargs)
+        if plan.strategy != SAI_STRATEGY:
+            planned_cql, planned_vals = self._get_planned_find_entries_cql(
+                plan, **kwargs
+            )
+            planned_rows = self._filter_planned_rows(
+                plan,
+                n,
+                await self.aexecute_cql(
+                    planned_cql, args=planned_vals, op_type=CQLOpType.READ
+                ),
+            )
+            if planned_rows is not None:
+                return planned_rows
         select_cql, select_vals = self._get_find_entries_cql(n, **kwargs)
         result_set = await self.aexecute_cql(
             select_cql, args=select_vals, op_type=CQLOpType.READ
@@ -331,58 +606,59 @@ class MetadataMixin(BaseTableMixin):
             )
         )
 
-    @staticmethod
-    def _get_to_delete_and_visited(
-        n: Optional[int],
-        batch_size: int,
-        visited_tuples: Set[Tuple[Any, ...]],
-        del_pkargs: Optional[List[Any]] = None,
-    ) -> Tuple[int, Set[Tuple[Any, ...]]]:
-        if del_pkargs is not None:
-            visited_tuples.update(tuple(del_pkarg) for del_pkarg in del_pkargs)
-        if n is not None:
-            to_delete = min(batch_size, n - len(visited_tuples))
-        else:
-            to_delete = batch_size
-        return to_delete, visited_tuples
+    def _get_find_primary_keys_cql(
+        self, n: Optional[int], **kwargs: Any
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        # a projection on the primary key columns only
+        _, where_clause, get_cql_vals = self._parse_select_core_params(**kwargs)
+        limit_clause, limit_cql_vals = ("LIMIT %s", [n]) if n is not None else ("", [])
+        select_cql = SELECT_CQL_TEMPLATE.format(
+            columns_desc=", ".join(col for col, _ in self._schema_primary_key()),
+            where_clause=where_clause,
+            limit_clause=limit_clause,
+        )
+        return select_cql, tuple(list(get_cql_vals) + limit_cql_vals)
+
+    def _get_delete_args(self, raw_key_row: Any) -> Dict[str, Any]:
+        key_row = (
+            raw_key_row if isinstance(raw_key_row, dict) else raw_key_row._asdict()
+        )
+        return {col: key_row[col] for col, _ in self._schema_primary_key()}
 
     def find_and_delete_entries(
         self, n: Optional[int] = None, batch_size: int = 20, **kwargs: Any
     ) -> int:
-        # Use `find_entries` to delete entries based
-        # on queries with metadata, etc. Suitable when `find_entries` is a fit.
-        # Returns the number of rows supposedly deleted.
-        # Warning: reads before writing. Not very efficient (nor Cassandraic).
-        #
-        # TODO: Use the 'columns' for a narrowed projection
-        # TODO: decouple finding and deleting (streaming) for faster performance
-        primary_key_cols = [col for col, _ in self._schema_primary_key()]
-        to_delete, visited_tuples = self._get_to_delete_and_visited(
-            n, batch_size, set()
-        )
-        while to_delete > 0:
-            del_pkargs = [
-                [found_row[pkc] for pkc in primary_key_cols]
-                for found_row in self._find_unnormalized_entries(n=to_delete, **kwargs)
-            ]
-            if del_pkargs == []:
-                break
-            d_futures = [
-                self.delete_async(
-                    **{pkc: pkv for pkc, pkv in zip(primary_key_cols, del_pkarg)}
-                )
-                for del_pkarg in del_pkargs
-                if tuple(del_pkarg) not in visited_tuples
-            ]
-            if d_futures == []:
+        """
+        Delete the (up to `n`) rows matching a `find_entries`-like query.
+        Returns the number of rows deleted.
+
+        Only the primary keys are read, page by page, while the deletions
+        (at most `batch_size` in flight) proceed: memory use does not grow
+        with the number of rows. Still a read-before-write, though: prefer
+        `delete_partition` (or `delete_range`) when applicable.
+        """
+        num_deleted = 0
+        for sub_kwargs in expand_disjunctions(kwargs):
+            if n is not None and num_deleted >= n:
                 break
-            for d_future in d_futures:
-                _ = d_future.result()
-            to_delete, visited_tuples = self._get_to_delete_and_visited(
-                n, batch_size, visited_tuples, del_pkargs
+            select_cql, select_vals = self._get_find_primary_keys_cql(
+                None if n is None else n - num_deleted, **sub_kwargs
             )
+            d_futures: Deque[ResponseFuture] = deque()
+            for raw_key_row in self.execute_cql(
+                select_cql, args=select_vals, op_type=CQLOpType.READ
+            ):
+                if len(d_futures) >= batch_size:
+                    d_futures.popleft().result()
+                d_futures.append(
+                    self.delete_async(**self._get_delete_args(raw_key_row))
+                )
+                num_deleted += 1
+            # all done before the next sub-query (which may find the same rows)
+            while d_futures:
+                d_futures.popleft().result()
         #
-        return len(visited_tuples)
+        return num_deleted
 
     def find_and_delete_entries_async(self, **kwargs: Any) -> ResponseFuture:
         raise NotImplementedError("Asynchronous reads are not supported.")
@@ -390,32 +666,38 @@ class MetadataMixin(BaseTableMixin):
     async def afind_and_delete_entries(
         self, n: Optional[int] = None, batch_size: int = 20, **kwargs: Any
     ) -> int:
-        primary_key_cols = [col for col, _ in self._schema_primary_key()]
-        #
-        batch_size = 20
-        to_delete, visited_tuples = self._get_to_delete_and_visited(
-            n, batch_size, set()
-        )
-        while to_delete > 0:
-            del_pkargs = [
-                [found_row[pkc] for pkc in primary_key_cols]
-                for found_row in await self._afind_unnormalized_entries(
-                    n=to_delete, **kwargs
-                )
-            ]
-            delete_coros = [
-                self.adelete(
-                    **{pkc: pkv for pkc, pkv in zip(primary_key_cols, del_pkarg)}
-                )
-                for del_pkarg in del_pkargs
-                if tuple(del_pkarg) not in visited_tuples
-            ]
-            if not delete_coros:
+        num_deleted = 0
+        for sub_kwargs in expand_disjunctions(kwargs):
+            if n is not None and num_deleted >= n:
                 break
-            await asyncio.gather(*delete_coros)
-
-            to_delete, visited_tuples = self._get_to_delete_and_visited(
-                n, batch_size, visited_tuples, del_pkargs
+            select_cql, select_vals = self._get_find_primary_keys_cql(
+                None if n is None else n - num_deleted, **sub_kwargs
             )
+            pending: Set[asyncio.Future[None]] = set()
+            try:
+                async for key_page in self.aexecute_cql_pages(
+                    select_cql, args=select_vals
+                ):
+                    for raw_key_row in key_page:
+                        if len(pending) >= batch_size:
+                            done, pending = await asyncio.wait(
+                                pending, return_when=asyncio.FIRST_COMPLETED
+                            )
+                            for d_task in done:
+                                d_task.result()
+                        pending.add(
+                            asyncio.ensure_future(
+                                self.adelete(**self._get_delete_args(raw_key_row))
+                            )
+                        )
+                        num_deleted += 1
+                if pending:
+                    await asyncio.gather(*pending)
+            except BaseException:
+                # no deletions are left running behind the error
+                for d_task in pending:
+                    d_task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise
         #
-        return len(visited_tuples)
+        return num_deleted
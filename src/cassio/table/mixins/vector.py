@@ -1,24 +1,108 @@
+import asyncio
+import functools
+import heapq
 import inspect
-from operator import itemgetter
-from typing import Any, Awaitable, Iterable, List, Optional, Tuple, Union
+import itertools
+import math
+import re
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
+import numpy as np
 from cassandra.cluster import ResponseFuture
+from numpy.typing import NDArray
 
-from cassio.table.base_table import BaseTable
-from cassio.table.cql import SELECT_ANN_CQL_TEMPLATE, CQLOpType
-from cassio.table.table_types import ColumnSpecType, RowType, RowWithDistanceType
-from cassio.utils.vector.distance_metrics import distance_metrics
+from cassio.table.base_table import DEFAULT_CONCURRENCY, BaseTable
+from cassio.table.cql import SELECT_ANN_CQL_TEMPLATE, SELECT_CQL_TEMPLATE, CQLOpType
+from cassio.table.ingestion import (
+    EmbeddingFunctionType,
+    IngestionItemType,
+    IngestionReport,
+    aingest,
+    default_row_id,
+    ingest,
+)
+from cassio.table.query import expand_disjunctions, has_disjunctions
+from cassio.table.result_cache import ANNResultCache
+from cassio.table.table_types import (
+    ColumnarRowsType,
+    ColumnSpecType,
+    RowType,
+    RowWithDistanceType,
+)
+from cassio.table.utils import (
+    agather_bounded,
+    gather_response_futures,
+    rows_to_columns,
+)
+from cassio.utils.vector.distance_metrics import (
+    as_float32_matrix,
+    distance_matrix_metrics,
+    distance_metrics,
+    metric_to_similarity_function,
+    similarity_to_distance,
+    vector_norms,
+)
+from cassio.utils.vector.mmr import maximal_marginal_relevance
+from cassio.utils.vector.quantization import (
+    QUANTIZATION_MODES,
+    dequantize_vectors,
+    quantize_vector,
+)
+from cassio.utils.vector.rank_fusion import (
+    DEFAULT_RRF_K,
+    reciprocal_rank_fusion,
+    weighted_score_fusion,
+)
 
 from .base_table import BaseTableMixin
+from .clustered import PARTITION_ID_TYPE, ClusteredMixin
+
+# smoothing factor for the running pass-ratio statistics of adaptive_ann_search
+ADAPTIVE_STATS_ALPHA = 0.2
+
+# exact partition search ranks in float32, then rescores in float64: the
+# float32 pass keeps a few more rows, and a slightly looser threshold
+EXACT_SEARCH_EXTRA_CANDIDATES = 4
+FLOAT32_DISTANCE_TOLERANCE = 1e-4
+
+# vector index similarity functions => corresponding client-side metric
+index_similarity_to_metric = {
+    "COSINE": "cos",
+    "DOT_PRODUCT": "dot",
+    "EUCLIDEAN": "l2",
+}
 
 
 class VectorMixin(BaseTableMixin):
+    supports_bucketing = False
+
     def __init__(
         self,
         *pargs: Any,
         vector_dimension: Union[int, Awaitable[int]],
         vector_similarity_function: Optional[str] = None,
         vector_source_model: Optional[str] = None,
+        ann_cache_max_entries: Optional[int] = None,
+        ann_cache_max_bytes: Optional[int] = None,
+        ann_cache_ttl_seconds: Optional[float] = None,
+        vector_quantization: Optional[str] = None,
+        exact_search_max_rows: int = 1000,
+        partition_cache_max_entries: Optional[int] = None,
+        partition_cache_max_bytes: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         if inspect.isawaitable(vector_dimension) and not kwargs.get(
@@ -36,18 +120,72 @@ class VectorMixin(BaseTableMixin):
             )
         if vector_source_model is not None:
             self.vector_index_options.append(("source_model", vector_source_model))
+        # optional quantized copy of the vectors, in a "vector_q" column
+        if (
+            vector_quantization is not None
+            and vector_quantization not in QUANTIZATION_MODES
+        ):
+            raise ValueError(f"Unknown vector quantization '{vector_quantization}'")
+        self.vector_quantization = vector_quantization
+        # optional caching of ANN results (invalidated by any write on the table)
+        self.ann_cache: Optional[ANNResultCache] = None
+        if ann_cache_max_entries is not None:
+            self.ann_cache = ANNResultCache(
+                max_entries=ann_cache_max_entries,
+                max_bytes=ann_cache_max_bytes,
+                ttl_seconds=ann_cache_ttl_seconds,
+            )
+        # exact (brute-force) search in small partitions of clustered tables,
+        # with optional caching of the partition vectors (also invalidated)
+        self.exact_search_max_rows = exact_search_max_rows
+        # (metric, threshold) => running fraction of ANN hits passing the threshold
+        self.adaptive_pass_ratios: Dict[Tuple[str, Optional[float]], float] = {}
+        self.partition_cache: Optional[ANNResultCache] = None
+        if partition_cache_max_entries is not None:
+            self.partition_cache = ANNResultCache(
+                max_entries=partition_cache_max_entries,
+                max_bytes=partition_cache_max_bytes,
+            )
         super().__init__(*pargs, **kwargs)
 
     def _schema_da(self) -> List[ColumnSpecType]:
-        return super()._schema_da() + [
-            ("vector", f"VECTOR<FLOAT,{self.vector_dimension}>")
-        ]
+        quantization_columns: List[ColumnSpecType] = (
+            [("vector_q", "BLOB")] if self.vector_quantization is not None else []
+        )
+        return (
+            super()._schema_da()
+            + [("vector", f"VECTOR<FLOAT,{self.vector_dimension}>")]
+            + quantization_columns
+        )
 
     async def _aschema_da(self) -> List[ColumnSpecType]:
         if inspect.isawaitable(self.vector_dimension):
             self.vector_dimension = await self.vector_dimension
         return self._schema_da()
 
+    def _normalize_kwargs(
+        self, args_dict: Dict[str, Any], is_write: bool
+    ) -> Dict[str, Any]:
+        new_args_dict = super()._normalize_kwargs(args_dict, is_write=is_write)
+        if (
+            is_write
+            and self.vector_quantization is not None
+            and new_args_dict.get("vector") is not None
+        ):
+            return {
+                **new_args_dict,
+                **{
+                    "vector_q": quantize_vector(
+                        new_args_dict["vector"], self.vector_quantization
+                    ),
+                },
+            }
+        return new_args_dict
+
+    def _normalize_row(self, raw_row: Any) -> Dict[str, Any]:
+        pre_normalized = super()._normalize_row(raw_row)
+        return {k: v for k, v in pre_normalized.items() if k != "vector_q"}
+
     @staticmethod
     def _get_create_vector_index_cql(
         vector_index_options: List[Tuple[str, Any]],
@@ -72,23 +210,28 @@ class VectorMixin(BaseTableMixin):
         create_index_cql = self._get_create_vector_index_cql(self.vector_index_options)
         await self.aexecute_cql(create_index_cql, op_type=CQLOpType.SCHEMA)
 
+    @staticmethod
+    def _check_ann_vector(vector: List[float]) -> None:
+        if all(x == 0 for x in vector):
+            # TODO: lift/relax this constraint when non-cosine metrics are there.
+            raise ValueError("Cannot use identically-zero vectors in cos/ANN search.")
+
     def _get_ann_search_cql(
-        self, vector: List[float], n: int, **kwargs: Any
+        self,
+        vector: List[float],
+        n: int,
+        columns: Optional[List[str]] = None,
+        **kwargs: Any,
     ) -> Tuple[str, Tuple[Any, ...]]:
-        n_kwargs = self._normalize_kwargs(kwargs, is_write=False)
-        # TODO: work on a columns: Optional[List[str]] = None
-        # (but with nuanced handling of the column-magic we have here)
-        columns = None
+        n_kwargs = self._normalize_query_kwargs(kwargs)
+        # columns, if given, are raw (i.e. schema) column names: the
+        # resulting rows are not suitable for _normalize_row.
         if columns is None:
             columns_desc = "*"
         else:
-            # TODO: handle translations here?
-            # columns_desc = ", ".join(columns)
-            raise NotImplementedError("Column selection is not implemented.")
+            columns_desc = ", ".join(columns)
         #
-        if all(x == 0 for x in vector):
-            # TODO: lift/relax this constraint when non-cosine metrics are there.
-            raise ValueError("Cannot use identically-zero vectors in cos/ANN search.")
+        self._check_ann_vector(vector)
         #
         vector_column = "vector"
         vector_cql_vals = (vector,)
@@ -129,16 +272,185 @@ class VectorMixin(BaseTableMixin):
 
         return select_ann_cql, select_ann_cql_vals
 
+    def _get_ann_cache_key(
+        self, vector: List[float], n: int, **kwargs: Any
+    ) -> Optional[Hashable]:
+        if self.ann_cache is None:
+            return None
+        n_kwargs = self._normalize_query_kwargs(kwargs)
+        return self.ann_cache.make_key(vector, n, n_kwargs)
+
+    def _get_cached_ann_rows(
+        self, cache_key: Optional[Hashable]
+    ) -> Optional[Iterable[RowType]]:
+        if self.ann_cache is None or cache_key is None:
+            return None
+        cached_rows = self.ann_cache.get(cache_key)
+        if cached_rows is None:
+            return None
+        return (dict(row) for row in cached_rows)
+
+    def _cache_ann_rows(
+        self,
+        cache_key: Optional[Hashable],
+        generation: int,
+        rows: Iterable[RowType],
+    ) -> Iterable[RowType]:
+        if self.ann_cache is None or cache_key is None:
+            return rows
+        row_list = list(rows)
+        self.ann_cache.put(cache_key, row_list, generation)
+        return (dict(row) for row in row_list)
+
+    def _invalidate_caches(self, *pargs: Any) -> None:
+        if self.ann_cache is not None:
+            self.ann_cache.invalidate()
+        if self.partition_cache is not None:
+            self.partition_cache.invalidate()
+
+    def execute_cql(
+        self,
+        cql_semitemplate: str,
+        op_type: CQLOpType,
+        args: Tuple[Any, ...] = tuple(),
+    ) -> Iterable[RowType]:
+        if op_type != CQLOpType.READ:
+            # invalidate both before and after the write
+            self._invalidate_caches()
+            try:
+                return super().execute_cql(cql_semitemplate, op_type=op_type, args=args)
+            finally:
+                self._invalidate_caches()
+        return super().execute_cql(cql_semitemplate, op_type=op_type, args=args)
+
+    def execute_cql_async(
+        self,
+        cql_semitemplate: str,
+        op_type: CQLOpType,
+        args: Tuple[Any, ...] = tuple(),
+    ) -> ResponseFuture:
+        response_future = super().execute_cql_async(
+            cql_semitemplate, op_type=op_type, args=args
+        )
+        has_caches = self.ann_cache is not None or self.partition_cache is not None
+        if op_type != CQLOpType.READ and has_caches:
+            # invalidate both when the write is issued and when it completes
+            self._invalidate_caches()
+            response_future.add_callbacks(
+                self._invalidate_caches, self._invalidate_caches
+            )
+        return response_future
+
+    async def aexecute_cql(
+        self,
+        cql_semitemplate: str,
+        op_type: CQLOpType,
+        args: Tuple[Any, ...] = tuple(),
+    ) -> Iterable[RowType]:
+        if op_type != CQLOpType.READ:
+            self._invalidate_caches()
+            try:
+                return await super().aexecute_cql(
+                    cql_semitemplate, op_type=op_type, args=args
+                )
+            finally:
+                self._invalidate_caches()
+        return await super().aexecute_cql(cql_semitemplate, op_type=op_type, args=args)
+
+    def execute_mixed_cql_concurrently(
+        self,
+        statements: List[Tuple[str, Tuple[Any, ...]]],
+        op_type: CQLOpType,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Iterable[RowType]]:
+        if op_type != CQLOpType.READ:
+            self._invalidate_caches()
+            try:
+                return super().execute_mixed_cql_concurrently(
+                    statements, op_type, concurrency=concurrency
+                )
+            finally:
+                self._invalidate_caches()
+        return super().execute_mixed_cql_concurrently(
+            statements, op_type, concurrency=concurrency
+        )
+
+    async def aexecute_mixed_cql_concurrently(
+        self,
+        statements: List[Tuple[str, Tuple[Any, ...]]],
+        op_type: CQLOpType,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Iterable[RowType]]:
+        if op_type != CQLOpType.READ:
+            self._invalidate_caches()
+            try:
+                return await super().aexecute_mixed_cql_concurrently(
+                    statements, op_type, concurrency=concurrency
+                )
+            finally:
+                self._invalidate_caches()
+        return await super().aexecute_mixed_cql_concurrently(
+            statements, op_type, concurrency=concurrency
+        )
+
+    def _get_disjunctive_ann_search_cqls(
+        self, vector: List[float], n: int, **kwargs: Any
+    ) -> List[Tuple[str, Tuple[Any, ...]]]:
+        return [
+            self._get_ann_search_cql(vector, n, **sub_kwargs)
+            for sub_kwargs in expand_disjunctions(kwargs)
+        ]
+
+    def _merge_disjunctive_ann_results(
+        self, result_sets: List[Iterable[RowType]], vector: List[float], n: int
+    ) -> List[RowType]:
+        # union by primary key, then the n best (as in the index similarity)
+        rows = [
+            self._normalize_row(raw_row)
+            for raw_row in self._merge_result_sets_by_primary_key(result_sets)
+        ]
+        metric = self._index_metric()
+        if rows == [] or metric not in distance_matrix_metrics:
+            return rows[:n]
+        distance_function, distance_reversed = distance_matrix_metrics[metric]
+        distances = distance_function(
+            [vector], [row["vector"] for row in rows], None, None
+        )[0]
+        selected = self._select_by_distance(
+            distances, distance_reversed, None, n, presorted=False
+        )
+        return [rows[row_i] for row_i in selected.tolist()]
+
     def ann_search(
         self, vector: List[float], n: int, **kwargs: Any
     ) -> Iterable[RowType]:
+        """
+        Get the `n` rows nearest to `vector`. Filters in `kwargs` can contain
+        `$in`/`$or` conditions (see `expand_disjunctions`): these are run as
+        concurrent sub-queries, whose results are merged (and not cached).
+        """
+        if has_disjunctions(kwargs):
+            result_sets = self.execute_mixed_cql_concurrently(
+                self._get_disjunctive_ann_search_cqls(vector, n, **kwargs),
+                op_type=CQLOpType.READ,
+            )
+            return self._merge_disjunctive_ann_results(result_sets, vector, n)
+        cache_key = self._get_ann_cache_key(vector, n, **kwargs)
+        cached_rows = self._get_cached_ann_rows(cache_key)
+        if cached_rows is not None:
+            return cached_rows
+        generation = self.ann_cache.generation if self.ann_cache is not None else 0
         select_ann_cql, select_ann_cql_vals = self._get_ann_search_cql(
             vector, n, **kwargs
         )
         result_set = self.execute_cql(
             select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
         )
-        return (self._normalize_row(result) for result in result_set)
+        return self._cache_ann_rows(
+            cache_key,
+            generation,
+            (self._normalize_row(result) for result in result_set),
+        )
 
     def ann_search_async(
         self, vector: List[float], n: int, **kwargs: Any
@@ -148,13 +460,159 @@ class VectorMixin(BaseTableMixin):
     async def aann_search(
         self, vector: List[float], n: int, **kwargs: Any
     ) -> Iterable[RowType]:
+        if has_disjunctions(kwargs):
+            result_sets = await self.aexecute_mixed_cql_concurrently(
+                self._get_disjunctive_ann_search_cqls(vector, n, **kwargs),
+                op_type=CQLOpType.READ,
+            )
+            return self._merge_disjunctive_ann_results(result_sets, vector, n)
+        cache_key = self._get_ann_cache_key(vector, n, **kwargs)
+        cached_rows = self._get_cached_ann_rows(cache_key)
+        if cached_rows is not None:
+            return cached_rows
+        generation = self.ann_cache.generation if self.ann_cache is not None else 0
         select_ann_cql, select_ann_cql_vals = self._get_ann_search_cql(
             vector, n, **kwargs
         )
         result_set = await self.aexecute_cql(
             select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
         )
-        return (self._normalize_row(result) for result in result_set)
+        return self._cache_ann_rows(
+            cache_key,
+            generation,
+            (self._normalize_row(result) for result in result_set),
+        )
+
+    def _get_ann_search_many_cql(
+        self, vectors: List[List[float]], n: int, **kwargs: Any
+    ) -> Tuple[str, List[Tuple[Any, ...]]]:
+        # all queries share the very same statement: only the query vector,
+        # i.e. the next-to-last bound value (just before the LIMIT), changes
+        select_ann_cql, first_cql_vals = self._get_ann_search_cql(
+            vectors[0], n, **kwargs
+        )
+        select_ann_cql_vals_list = [first_cql_vals]
+        for vector in vectors[1:]:
+            self._check_ann_vector(vector)
+            select_ann_cql_vals_list.append(
+                first_cql_vals[:-2] + (vector,) + first_cql_vals[-1:]
+            )
+        return select_ann_cql, select_ann_cql_vals_list
+
+    def _finalize_ann_search_many(
+        self, result_sets: List[Iterable[RowType]], columnar: bool
+    ) -> Union[List[List[RowType]], List[ColumnarRowsType]]:
+        rows_lists = [
+            [self._normalize_row(result) for result in result_set]
+            for result_set in result_sets
+        ]
+        if columnar:
+            return [rows_to_columns(rows) for rows in rows_lists]
+        else:
+            return rows_lists
+
+    @overload
+    def ann_search_many(
+        self,
+        vectors: List[List[float]],
+        n: int,
+        concurrency: int = ...,
+        columnar: Literal[False] = ...,
+        **kwargs: Any,
+    ) -> List[List[RowType]]:
+        ...
+
+    @overload
+    def ann_search_many(
+        self,
+        vectors: List[List[float]],
+        n: int,
+        concurrency: int = ...,
+        *,
+        columnar: Literal[True],
+        **kwargs: Any,
+    ) -> List[ColumnarRowsType]:
+        ...
+
+    def ann_search_many(
+        self,
+        vectors: List[List[float]],
+        n: int,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        columnar: bool = False,
+        **kwargs: Any,
+    ) -> Union[List[List[RowType]], List[ColumnarRowsType]]:
+        """
+        Run one ANN search per query vector (all with the same `n` and filters),
+        with at most `concurrency` queries in flight at once.
+        Return a list of results, one per input vector and in the same order.
+        Each result is a list of rows or, if `columnar`, a dict
+        {column_name: [values, ...]}.
+        """
+        if not vectors:
+            return []
+        select_ann_cql, select_ann_cql_vals_list = self._get_ann_search_many_cql(
+            vectors, n, **kwargs
+        )
+        result_sets = self.execute_cql_concurrently(
+            select_ann_cql,
+            args_list=select_ann_cql_vals_list,
+            op_type=CQLOpType.READ,
+            concurrency=concurrency,
+        )
+        return self._finalize_ann_search_many(result_sets, columnar=columnar)
+
+    @overload
+    async def aann_search_many(
+        self,
+        vectors: List[List[float]],
+        n: int,
+        concurrency: int = ...,
+        columnar: Literal[False] = ...,
+        **kwargs: Any,
+    ) -> List[List[RowType]]:
+        ...
+
+    @overload
+    async def aann_search_many(
+        self,
+        vectors: List[List[float]],
+        n: int,
+        concurrency: int = ...,
+        *,
+        columnar: Literal[True],
+        **kwargs: Any,
+    ) -> List[ColumnarRowsType]:
+        ...
+
+    async def aann_search_many(
+        self,
+        vectors: List[List[float]],
+        n: int,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        columnar: bool = False,
+        **kwargs: Any,
+    ) -> Union[List[List[RowType]], List[ColumnarRowsType]]:
+        if not vectors:
+            return []
+        select_ann_cql, select_ann_cql_vals_list = self._get_ann_search_many_cql(
+            vectors, n, **kwargs
+        )
+        result_sets = await self.aexecute_cql_concurrently(
+            select_ann_cql,
+            args_list=select_ann_cql_vals_list,
+            op_type=CQLOpType.READ,
+            concurrency=concurrency,
+        )
+        return self._finalize_ann_search_many(result_sets, columnar=columnar)
+
+    def _index_metric(self) -> str:
+        # the client-side metric equivalent to the vector index similarity
+        # (Cassandra defaults to cosine when no similarity function is given)
+        similarity_function = dict(self.vector_index_options).get(
+            "similarity_function", "COSINE"
+        )
+        return index_similarity_to_metric.get(similarity_function.upper(), "")
 
     @staticmethod
     def _get_rows_with_distance(
@@ -162,57 +620,134 @@ class VectorMixin(BaseTableMixin):
         vector: List[float],
         metric: str,
         metric_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+        presorted: bool = False,
     ) -> Iterable[RowWithDistanceType]:
-        if rows == []:
+        """
+        Score the rows against the query vector, drop those not passing
+        the threshold (if any) and return the best `top_k` (or all),
+        sorted nearest-first and each enriched with a "distance" entry.
+
+        If `presorted`, the rows are assumed to come already ordered by
+        decreasing closeness in the very same metric (e.g. as returned by
+        an ANN query on an index with the matching similarity), so no
+        further sorting is done.
+        """
+        row_list = list(rows)
+        if row_list == [] or top_k == 0:
             return []
         else:
-            # sort, cut, validate and prepare for returning
-            # evaluate metric
+            # evaluate metric, vectorized: in float64 (not with the float32
+            # matrix kernels), as the returned distances face the threshold
             distance_function, distance_reversed = distance_metrics[metric]
-            row_vectors = [row["vector"] for row in rows]
-            # enrich with their metric score
-            rows_with_metric = list(
-                zip(
-                    distance_function(row_vectors, vector),
-                    rows,
-                )
+            distances = np.asarray(
+                distance_function([row["vector"] for row in row_list], vector),
+                dtype=np.float64,
+            )
+            return VectorMixin._select_rows_by_distance(
+                row_list,
+                distances,
+                distance_reversed,
+                metric_threshold,
+                top_k=top_k,
+                presorted=presorted,
             )
-            # sort rows by metric score. First handle metric/threshold
-            if metric_threshold is not None:
-                _used_thr = metric_threshold
-                if distance_reversed:
-
-                    def _thresholder(mtx: float, thr: float) -> bool:
-                        return mtx >= thr
-
-                else:
-
-                    def _thresholder(mtx: float, thr: float) -> bool:
-                        return mtx <= thr
 
+    @staticmethod
+    def _select_by_distance(
+        distances: NDArray[np.floating[Any]],
+        distance_reversed: bool,
+        metric_threshold: Optional[float],
+        top_k: Optional[int],
+        presorted: bool,
+    ) -> np.ndarray[Any, np.dtype[np.intp]]:
+        # indices of the best top_k (or all) passing the threshold, nearest-first
+        if metric_threshold is not None:
+            if distance_reversed:
+                passing = np.flatnonzero(distances >= metric_threshold)
             else:
-                # this to satisfy the type checker
-                _used_thr = 0.0
+                passing = np.flatnonzero(distances <= metric_threshold)
+        else:
+            passing = np.arange(len(distances))
+        # (sorting keys are such that ascending means nearest-first)
+        sort_keys = -distances[passing] if distance_reversed else distances[passing]
+        if presorted:
+            return passing[:top_k]
+        if top_k is not None and top_k < len(passing):
+            # partial selection, then sort only the top_k
+            top_positions = np.argpartition(sort_keys, top_k - 1)[:top_k]
+            passing = passing[top_positions]
+            sort_keys = sort_keys[top_positions]
+        return passing[np.argsort(sort_keys, kind="stable")]
+
+    @staticmethod
+    def _select_rows_by_distance(
+        row_list: List[RowType],
+        distances: NDArray[np.floating[Any]],
+        distance_reversed: bool,
+        metric_threshold: Optional[float],
+        top_k: Optional[int],
+        presorted: bool,
+    ) -> Iterable[RowWithDistanceType]:
+        selected = VectorMixin._select_by_distance(
+            distances, distance_reversed, metric_threshold, top_k, presorted
+        )
+        # return a list of hits with their distance (as JSON)
+        selected_distances = distances[selected].tolist()
+        enriched_hits = (
+            {
+                **row_list[row_i],
+                **{"distance": distance},
+            }
+            for row_i, distance in zip(selected.tolist(), selected_distances)
+        )
+        return enriched_hits
 
-                # no hits are discarded
-                def _thresholder(mtx: float, thr: float) -> bool:
-                    return True
+    @staticmethod
+    def _get_rows_with_server_distance(
+        rows: Iterable[RowType],
+        metric: str,
+        metric_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+        presorted: bool = False,
+    ) -> Iterable[RowWithDistanceType]:
+        """
+        Same as _get_rows_with_distance, but for rows carrying a
+        server-computed "similarity" (instead of their "vector"),
+        which is converted back into the `metric` distance.
+        """
+        raw_row_list = list(rows)
+        if raw_row_list == [] or top_k == 0:
+            return []
+        similarities = np.array(
+            [row["similarity"] for row in raw_row_list], dtype=np.float32
+        )
+        row_list = [
+            {k: v for k, v in row.items() if k != "similarity"} for row in raw_row_list
+        ]
+        _, distance_reversed = distance_matrix_metrics[metric]
+        return VectorMixin._select_rows_by_distance(
+            row_list,
+            similarity_to_distance(metric, similarities),
+            distance_reversed,
+            metric_threshold,
+            top_k=top_k,
+            presorted=presorted,
+        )
 
-            #
-            sorted_passing_rows = sorted(
-                (pair for pair in rows_with_metric if _thresholder(pair[0], _used_thr)),
-                key=itemgetter(0),
-                reverse=distance_reversed,
-            )
-            # return a list of hits with their distance (as JSON)
-            enriched_hits = (
-                {
-                    **hit,
-                    **{"distance": distance},
-                }
-                for distance, hit in sorted_passing_rows
-            )
-            return enriched_hits
+    def _get_server_similarity_ann_search_cql(
+        self, vector: List[float], n: int, metric: str, **kwargs: Any
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        # all columns but the vector (and its quantized copy), plus the score
+        columns = [
+            col
+            for col, _ in self._schema_collist()
+            if col not in {"vector", "vector_q"}
+        ] + [f"{metric_to_similarity_function[metric]}(vector, %s) AS similarity"]
+        select_ann_cql, select_ann_cql_vals = self._get_ann_search_cql(
+            vector, n, columns=columns, **kwargs
+        )
+        return select_ann_cql, (vector,) + select_ann_cql_vals
 
     def metric_ann_search(
         self,
@@ -220,10 +755,47 @@ class VectorMixin(BaseTableMixin):
         n: int,
         metric: str,
         metric_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+        keep_ann_order: bool = False,
+        server_similarity: bool = False,
         **kwargs: Any,
     ) -> Iterable[RowWithDistanceType]:
+        """
+        ANN-search `n` rows, then score them client-side with `metric`.
+        With `top_k`, only the `top_k` best passing rows are returned
+        (useful when over-fetching for the sake of thresholding).
+        With `keep_ann_order`, if `metric` matches the index similarity,
+        the ANN ordering from the server is kept without re-sorting.
+
+        With `server_similarity` (for metrics "cos", "dot" and "l2"), the
+        score is computed by the database with the CQL similarity functions
+        and the vector column is not read at all: the returned rows then
+        lack the "vector" entry.
+        """
+        if server_similarity and metric in metric_to_similarity_function:
+            (
+                select_ann_cql,
+                select_ann_cql_vals,
+            ) = self._get_server_similarity_ann_search_cql(vector, n, metric, **kwargs)
+            result_set = self.execute_cql(
+                select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
+            )
+            return self._get_rows_with_server_distance(
+                (self._normalize_row(result) for result in result_set),
+                metric,
+                metric_threshold,
+                top_k=top_k,
+                presorted=keep_ann_order and metric == self._index_metric(),
+            )
         rows = list(self.ann_search(vector, n, **kwargs))
-        return self._get_rows_with_distance(rows, vector, metric, metric_threshold)
+        return self._get_rows_with_distance(
+            rows,
+            vector,
+            metric,
+            metric_threshold,
+            top_k=top_k,
+            presorted=keep_ann_order and metric == self._index_metric(),
+        )
 
     def metric_ann_search_async(
         self, vector: List[float], n: int, **kwargs: Any
@@ -236,7 +808,925 @@ class VectorMixin(BaseTableMixin):
         n: int,
         metric: str,
         metric_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+        keep_ann_order: bool = False,
+        server_similarity: bool = False,
         **kwargs: Any,
     ) -> Iterable[RowWithDistanceType]:
+        if server_similarity and metric in metric_to_similarity_function:
+            (
+                select_ann_cql,
+                select_ann_cql_vals,
+            ) = self._get_server_similarity_ann_search_cql(vector, n, metric, **kwargs)
+            result_set = await self.aexecute_cql(
+                select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
+            )
+            return self._get_rows_with_server_distance(
+                (self._normalize_row(result) for result in result_set),
+                metric,
+                metric_threshold,
+                top_k=top_k,
+                presorted=keep_ann_order and metric == self._index_metric(),
+            )
         rows = list(await self.aann_search(vector, n, **kwargs))
-        return self._get_rows_with_distance(rows, vector, metric, metric_threshold)
+        return self._get_rows_with_distance(
+            rows,
+            vector,
+            metric,
+            metric_threshold,
+            top_k=top_k,
+            presorted=keep_ann_order and metric == self._index_metric(),
+        )
+
+    @staticmethod
+    def _get_mmr_rows(
+        rows: Iterable[RowType],
+        vector: List[float],
+        k: int,
+        lambda_mult: float,
+        metric: str,
+    ) -> List[RowWithDistanceType]:
+        row_list = [row for row in rows if row.get("vector") is not None]
+        if row_list == []:
+            return []
+        candidate_matrix = np.array([row["vector"] for row in row_list], np.float32)
+        selected = maximal_marginal_relevance(
+            vector,
+            candidate_matrix,
+            k=k,
+            lambda_mult=lambda_mult,
+            metric=metric,
+        )
+        # enrich the selected hits with their distance to the query vector
+        distance_function, _ = distance_matrix_metrics[metric]
+        distances = distance_function([vector], candidate_matrix[selected], None, None)[
+            0
+        ].tolist()
+        return [
+            {
+                **row_list[row_i],
+                **{"distance": distance},
+            }
+            for row_i, distance in zip(selected, distances)
+        ]
+
+    def mmr_search(
+        self,
+        vector: List[float],
+        k: int,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        metric: str = "cos",
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        """
+        Maximal Marginal Relevance search: over-fetch `fetch_k` rows by ANN,
+        then pick `k` of them balancing similarity to the query vector
+        (weight `lambda_mult`) and diversity (weight `1 - lambda_mult`).
+        Rows are returned in selection order, each with a "distance" entry.
+        """
+        rows = self.ann_search(vector, fetch_k, **kwargs)
+        return self._get_mmr_rows(rows, vector, k, lambda_mult, metric)
+
+    async def ammr_search(
+        self,
+        vector: List[float],
+        k: int,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        metric: str = "cos",
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        rows = await self.aann_search(vector, fetch_k, **kwargs)
+        return self._get_mmr_rows(rows, vector, k, lambda_mult, metric)
+
+    def _get_compact_search_cql(
+        self, vector: List[float], fetch_k: int, **kwargs: Any
+    ) -> Tuple[str, Tuple[Any, ...], List[str]]:
+        if self.vector_quantization is None:
+            raise ValueError("Compact search requires a vector_quantization setting.")
+        key_columns = [col for col, _ in self._schema_primary_key()]
+        select_ann_cql, select_ann_cql_vals = self._get_ann_search_cql(
+            vector, fetch_k, columns=key_columns + ["vector_q"], **kwargs
+        )
+        return select_ann_cql, select_ann_cql_vals, key_columns
+
+    def _get_compact_candidate_keys(
+        self,
+        raw_rows: Iterable[Any],
+        vector: List[float],
+        n: int,
+        metric: str,
+        key_columns: List[str],
+    ) -> List[Tuple[Any, ...]]:
+        # rescore candidates on their quantized codes, return the best keys
+        assert self.vector_quantization is not None
+        raw_row_dicts = [
+            raw_row if isinstance(raw_row, dict) else raw_row._asdict()
+            for raw_row in raw_rows
+        ]
+        raw_row_dicts = [row for row in raw_row_dicts if row["vector_q"] is not None]
+        if raw_row_dicts == [] or n <= 0:
+            return []
+        decoded = dequantize_vectors(
+            [row["vector_q"] for row in raw_row_dicts],
+            self.vector_quantization,
+            len(vector),
+        )
+        distance_function, distance_reversed = distance_matrix_metrics[metric]
+        distances = distance_function([vector], decoded, None, None)[0]
+        sort_keys = -distances if distance_reversed else distances
+        best = np.argsort(sort_keys, kind="stable")[:n]
+        return [
+            tuple(raw_row_dicts[row_i][col] for col in key_columns)
+            for row_i in best.tolist()
+        ]
+
+    @staticmethod
+    def _get_select_by_key_cql(key_columns: List[str]) -> str:
+        return SELECT_CQL_TEMPLATE.format(
+            columns_desc="*",
+            where_clause="WHERE " + " AND ".join(f"{col} = %s" for col in key_columns),
+            limit_clause="",
+        )
+
+    def _finalize_compact_search(
+        self,
+        result_sets: List[Iterable[RowType]],
+        vector: List[float],
+        metric: str,
+        metric_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> List[RowWithDistanceType]:
+        rows = [
+            self._normalize_row(result)
+            for result_set in result_sets
+            for result in result_set
+        ]
+        # final ranking and distances are on the full-precision vectors
+        return list(
+            self._get_rows_with_distance(
+                rows, vector, metric, metric_threshold=metric_threshold, top_k=top_k
+            )
+        )
+
+    def compact_search(
+        self,
+        vector: List[float],
+        n: int,
+        fetch_k: Optional[int] = None,
+        metric: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        """
+        Two-phase search for tables with `vector_quantization`:
+        ANN-search `fetch_k` candidates (default: 4 * n) reading only their
+        primary key and quantized code, rescore them client-side on the
+        codes, then read the full rows for the best `n` only.
+        Rows are returned nearest-first, with a "distance" entry computed
+        on the full-precision vectors using `metric` (default: the one
+        matching the vector index).
+        """
+        _metric = metric or self._index_metric()
+        _fetch_k = fetch_k if fetch_k is not None else 4 * n
+        select_ann_cql, select_ann_cql_vals, key_columns = self._get_compact_search_cql(
+            vector, _fetch_k, **kwargs
+        )
+        candidate_rows = self.execute_cql(
+            select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
+        )
+        best_keys = self._get_compact_candidate_keys(
+            candidate_rows, vector, n, _metric, key_columns
+        )
+        if best_keys == []:
+            return []
+        result_sets = self.execute_cql_concurrently(
+            self._get_select_by_key_cql(key_columns),
+            args_list=best_keys,
+            op_type=CQLOpType.READ,
+            concurrency=concurrency,
+        )
+        return self._finalize_compact_search(result_sets, vector, _metric)
+
+    async def acompact_search(
+        self,
+        vector: List[float],
+        n: int,
+        fetch_k: Optional[int] = None,
+        metric: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        _metric = metric or self._index_metric()
+        _fetch_k = fetch_k if fetch_k is not None else 4 * n
+        select_ann_cql, select_ann_cql_vals, key_columns = self._get_compact_search_cql(
+            vector, _fetch_k, **kwargs
+        )
+        candidate_rows = await self.aexecute_cql(
+            select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
+        )
+        best_keys = self._get_compact_candidate_keys(
+            candidate_rows, vector, n, _metric, key_columns
+        )
+        if best_keys == []:
+            return []
+        result_sets = await self.aexecute_cql_concurrently(
+            self._get_select_by_key_cql(key_columns),
+            args_list=best_keys,
+            op_type=CQLOpType.READ,
+            concurrency=concurrency,
+        )
+        return self._finalize_compact_search(result_sets, vector, _metric)
+
+    def _get_hybrid_lexical_cql(
+        self, text: Union[str, List[str]], fetch_k: int, **kwargs: Any
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        columns_desc, where_clause, select_cql_vals = self._parse_select_core_params(
+            body_search=text, **kwargs
+        )
+        select_cql = SELECT_CQL_TEMPLATE.format(
+            columns_desc=columns_desc,
+            where_clause=where_clause,
+            limit_clause="LIMIT %s",
+        )
+        return select_cql, select_cql_vals + (fetch_k,)
+
+    @staticmethod
+    def _get_term_overlap(query_terms: List[str], body: Optional[str]) -> float:
+        # client-side lexical relevance: fraction of query terms in the body
+        if not query_terms or body is None:
+            return 0.0
+        body_terms = set(re.findall(r"\w+", body.lower()))
+        return sum(term in body_terms for term in query_terms) / len(query_terms)
+
+    @staticmethod
+    def _get_row_key(row: RowType) -> Hashable:
+        # identifies a (normalized) row, whether clustered or not
+        return (row.get("partition_id"), row["row_id"])
+
+    def _fuse_hybrid_results(
+        self,
+        ann_result_set: Iterable[RowType],
+        lexical_result_set: Iterable[RowType],
+        vector: List[float],
+        text: Union[str, List[str]],
+        k: int,
+        weights: Sequence[float],
+        fusion: str,
+        rrf_k: int,
+    ) -> List[RowType]:
+        ann_rows = [self._normalize_row(result) for result in ann_result_set]
+        lexical_rows = [self._normalize_row(result) for result in lexical_result_set]
+        _row_key = self._get_row_key
+        rows_by_key = {_row_key(row): row for row in lexical_rows + ann_rows}
+        query_terms = re.findall(
+            r"\w+", (text if isinstance(text, str) else " ".join(text)).lower()
+        )
+        lexical_scores: Dict[Hashable, float] = {
+            row_key: self._get_term_overlap(query_terms, row.get("body_blob"))
+            for row_key, row in rows_by_key.items()
+        }
+        #
+        scores: Dict[Hashable, float]
+        if fusion == "rrf":
+            lexical_keys = [_row_key(row) for row in lexical_rows]
+            lexical_ranking = sorted(
+                lexical_keys, key=lambda row_key: -lexical_scores[row_key]
+            )
+            scores = reciprocal_rank_fusion(
+                [[_row_key(row) for row in ann_rows], lexical_ranking],
+                weights=weights,
+                k=rrf_k,
+            )
+        elif fusion == "weighted":
+            vector_keys = [
+                row_key
+                for row_key, row in rows_by_key.items()
+                if row.get("vector") is not None
+            ]
+            vector_scores: Dict[Hashable, float] = {}
+            if vector_keys:
+                distance_function, distance_reversed = distance_matrix_metrics[
+                    self._index_metric()
+                ]
+                distances = distance_function(
+                    [vector],
+                    [rows_by_key[row_key]["vector"] for row_key in vector_keys],
+                    None,
+                    None,
+                )[0]
+                sign = 1.0 if distance_reversed else -1.0
+                vector_scores = dict(zip(vector_keys, (sign * distances).tolist()))
+            scores = weighted_score_fusion(
+                [vector_scores, lexical_scores], weights=weights
+            )
+        else:
+            raise ValueError(f"Unknown fusion method '{fusion}'")
+        best_keys = sorted(scores.keys(), key=lambda row_key: -scores[row_key])[:k]
+        return [
+            {
+                **rows_by_key[row_key],
+                **{"score": scores[row_key]},
+            }
+            for row_key in best_keys
+        ]
+
+    def hybrid_search(
+        self,
+        vector: List[float],
+        text: Union[str, List[str]],
+        k: int,
+        weights: Sequence[float] = (1.0, 1.0),
+        fusion: str = "rrf",
+        fetch_k: Optional[int] = None,
+        rrf_k: int = DEFAULT_RRF_K,
+        **kwargs: Any,
+    ) -> List[RowType]:
+        """
+        Run an ANN query and a lexical query (`body_search=text`, requiring
+        an index analyzer) concurrently, each for `fetch_k` rows (default:
+        2 * k), and merge the two lists into the best `k` rows.
+        Further keyword arguments filter both queries alike.
+
+        `fusion` can be "rrf" (reciprocal rank fusion) or "weighted"
+        (sum of min-max normalized scores: the vector similarity for the
+        index metric and the fraction of query terms found in the body).
+        `weights` are for the (vector, lexical) parts in this order.
+        Rows are returned best-first, each with a "score" entry.
+        """
+        _fetch_k = fetch_k if fetch_k is not None else 2 * k
+        select_ann_cql, select_ann_cql_vals = self._get_ann_search_cql(
+            vector, _fetch_k, **kwargs
+        )
+        lexical_cql, lexical_cql_vals = self._get_hybrid_lexical_cql(
+            text, _fetch_k, **kwargs
+        )
+        ann_future = self.execute_cql_async(
+            select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
+        )
+        lexical_future = self.execute_cql_async(
+            lexical_cql, args=lexical_cql_vals, op_type=CQLOpType.READ
+        )
+        return self._fuse_hybrid_results(
+            ann_future.result(),
+            lexical_future.result(),
+            vector,
+            text,
+            k,
+            weights,
+            fusion,
+            rrf_k,
+        )
+
+    async def ahybrid_search(
+        self,
+        vector: List[float],
+        text: Union[str, List[str]],
+        k: int,
+        weights: Sequence[float] = (1.0, 1.0),
+        fusion: str = "rrf",
+        fetch_k: Optional[int] = None,
+        rrf_k: int = DEFAULT_RRF_K,
+        **kwargs: Any,
+    ) -> List[RowType]:
+        _fetch_k = fetch_k if fetch_k is not None else 2 * k
+        select_ann_cql, select_ann_cql_vals = self._get_ann_search_cql(
+            vector, _fetch_k, **kwargs
+        )
+        lexical_cql, lexical_cql_vals = self._get_hybrid_lexical_cql(
+            text, _fetch_k, **kwargs
+        )
+        ann_result_set, lexical_result_set = await asyncio.gather(
+            self.aexecute_cql(
+                select_ann_cql, args=select_ann_cql_vals, op_type=CQLOpType.READ
+            ),
+            self.aexecute_cql(
+                lexical_cql, args=lexical_cql_vals, op_type=CQLOpType.READ
+            ),
+        )
+        return self._fuse_hybrid_results(
+            ann_result_set,
+            lexical_result_set,
+            vector,
+            text,
+            k,
+            weights,
+            fusion,
+            rrf_k,
+        )
+
+    def _get_ann_search_partitions_cql(
+        self,
+        vector: List[float],
+        n: int,
+        partition_ids: List[PARTITION_ID_TYPE],
+        **kwargs: Any,
+    ) -> Tuple[str, List[Tuple[Any, ...]]]:
+        if not isinstance(self, ClusteredMixin):
+            raise ValueError("Searching across partitions requires a clustered table.")
+        # the statement is the same for all partitions, only the values change
+        cqls_and_vals = [
+            self._get_ann_search_cql(vector, n, partition_id=partition_id, **kwargs)
+            for partition_id in partition_ids
+        ]
+        return cqls_and_vals[0][0], [cql_vals for _, cql_vals in cqls_and_vals]
+
+    def _merge_partition_results(
+        self,
+        result_sets: List[Optional[Iterable[RowType]]],
+        vector: List[float],
+        n: int,
+        metric: str,
+    ) -> List[RowWithDistanceType]:
+        _, distance_reversed = distance_matrix_metrics[metric]
+        ranked_lists = [
+            self._get_rows_with_distance(
+                (self._normalize_row(result) for result in result_set),
+                vector,
+                metric,
+            )
+            for result_set in result_sets
+            if result_set is not None
+        ]
+        merged = heapq.merge(
+            *ranked_lists,
+            key=lambda row: -row["distance"] if distance_reversed else row["distance"],
+        )
+        return list(itertools.islice(merged, n))
+
+    def ann_search_partitions(
+        self,
+        vector: List[float],
+        n: int,
+        partition_ids: List[PARTITION_ID_TYPE],
+        metric: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout_seconds: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        """
+        For clustered tables: ANN-search `n` rows in each of the partitions,
+        with at most `concurrency` queries in flight, and merge the results
+        into the global best `n`, each with a "distance" entry for `metric`
+        (default: the one matching the vector index).
+
+        With `timeout_seconds`, return as soon as this latency budget is
+        exhausted, using only the partitions whose results have arrived.
+        """
+        if not partition_ids:
+            return []
+        _metric = metric or self._index_metric()
+        select_ann_cql, select_ann_cql_vals_list = self._get_ann_search_partitions_cql(
+            vector, n, partition_ids, **kwargs
+        )
+        result_sets = gather_response_futures(
+            [
+                functools.partial(
+                    self.execute_cql_async,
+                    select_ann_cql,
+                    op_type=CQLOpType.READ,
+                    args=select_ann_cql_vals,
+                )
+                for select_ann_cql_vals in select_ann_cql_vals_list
+            ],
+            concurrency=concurrency,
+            timeout_seconds=timeout_seconds,
+        )
+        return self._merge_partition_results(result_sets, vector, n, _metric)
+
+    async def aann_search_partitions(
+        self,
+        vector: List[float],
+        n: int,
+        partition_ids: List[PARTITION_ID_TYPE],
+        metric: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout_seconds: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        if not partition_ids:
+            return []
+        _metric = metric or self._index_metric()
+        select_ann_cql, select_ann_cql_vals_list = self._get_ann_search_partitions_cql(
+            vector, n, partition_ids, **kwargs
+        )
+        result_sets = await agather_bounded(
+            [
+                functools.partial(
+                    self.aexecute_cql,
+                    select_ann_cql,
+                    op_type=CQLOpType.READ,
+                    args=select_ann_cql_vals,
+                )
+                for select_ann_cql_vals in select_ann_cql_vals_list
+            ],
+            concurrency=concurrency,
+            timeout_seconds=timeout_seconds,
+        )
+        return self._merge_partition_results(result_sets, vector, n, _metric)
+
+    def _get_partition_scan_cql(
+        self,
+        partition_id: Optional[PARTITION_ID_TYPE],
+        exact: Union[bool, str],
+        **kwargs: Any,
+    ) -> Tuple[str, Tuple[Any, ...], List[str]]:
+        if not isinstance(self, ClusteredMixin):
+            raise ValueError("Partition search requires a clustered table.")
+        key_columns = [col for col, _ in self._schema_primary_key()]
+        # in "auto" mode, reading one row past the limit tells a large partition
+        limit = None if exact is True else self.exact_search_max_rows + 1
+        select_cql, select_cql_vals = self._get_get_partition_cql(
+            partition_id, limit, columns=key_columns + ["vector"], **kwargs
+        )
+        return select_cql, select_cql_vals, key_columns
+
+    def _get_partition_scan_cache_key(
+        self, partition_id: Optional[PARTITION_ID_TYPE], **kwargs: Any
+    ) -> Optional[Hashable]:
+        if self.partition_cache is None:
+            return None
+        n_kwargs = self._normalize_query_kwargs(
+            {**{"partition_id": partition_id}, **kwargs}
+        )
+        return self.partition_cache.make_scan_key(n_kwargs)
+
+    def _get_cached_partition_scan(
+        self, cache_key: Optional[Hashable], exact: Union[bool, str]
+    ) -> Optional[RowType]:
+        if self.partition_cache is None or cache_key is None:
+            return None
+        cached = self.partition_cache.get(cache_key)
+        if cached is None:
+            return None
+        # a "too large" verdict of "auto" mode does not hold for exact=True
+        if exact is True and cached[0]["matrix"] is None:
+            return None
+        return cached[0]
+
+    def _build_partition_scan(
+        self,
+        raw_rows: Iterable[Any],
+        key_columns: List[str],
+        exact: Union[bool, str],
+        cache_key: Optional[Hashable],
+        generation: int,
+    ) -> RowType:
+        # the partition vectors as a matrix (None if too many for "auto" mode)
+        raw_row_dicts = [
+            raw_row if isinstance(raw_row, dict) else raw_row._asdict()
+            for raw_row in raw_rows
+        ]
+        raw_row_dicts = [row for row in raw_row_dicts if row["vector"] is not None]
+        scan: RowType
+        if exact is not True and len(raw_row_dicts) > self.exact_search_max_rows:
+            scan = {"keys": None, "matrix": None, "norms": None}
+        else:
+            matrix = as_float32_matrix([row["vector"] for row in raw_row_dicts])
+            scan = {
+                "keys": [
+                    tuple(row[col] for col in key_columns) for row in raw_row_dicts
+                ],
+                "matrix": matrix,
+                "norms": vector_norms(matrix),
+            }
+        if self.partition_cache is not None and cache_key is not None:
+            self.partition_cache.put(cache_key, [scan], generation)
+        return scan
+
+    def _get_exact_best_keys(
+        self,
+        scan: RowType,
+        vector: List[float],
+        n: int,
+        metric: str,
+        metric_threshold: Optional[float],
+    ) -> List[Tuple[Any, ...]]:
+        if len(scan["keys"]) == 0 or n <= 0:
+            return []
+        distance_function, distance_reversed = distance_matrix_metrics[metric]
+        distances = distance_function([vector], scan["matrix"], scan["norms"], None)[0]
+        loose_threshold: Optional[float] = None
+        if metric_threshold is not None:
+            tolerance = FLOAT32_DISTANCE_TOLERANCE * max(1.0, abs(metric_threshold))
+            loose_threshold = (
+                metric_threshold - tolerance
+                if distance_reversed
+                else metric_threshold + tolerance
+            )
+        selected = self._select_by_distance(
+            distances,
+            distance_reversed,
+            loose_threshold,
+            top_k=n + EXACT_SEARCH_EXTRA_CANDIDATES,
+            presorted=False,
+        )
+        return [scan["keys"][row_i] for row_i in selected.tolist()]
+
+    def partition_search(
+        self,
+        vector: List[float],
+        n: int,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        metric: Optional[str] = None,
+        metric_threshold: Optional[float] = None,
+        exact: Union[bool, str] = "auto",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        """
+        For clustered tables: vector search within a partition, returning
+        the best `n` rows, nearest-first, each with a "distance" entry for
+        `metric` (default: the one matching the vector index).
+
+        With `exact=True`, the partition vectors (and keys) are read and
+        the search is exact, brute-force; then only the `n` winning rows are
+        read in full. With `exact=False`, this is a regular ANN search.
+        With `exact="auto"`, the exact route is taken if the partition has
+        at most `exact_search_max_rows` rows, else ANN is used.
+
+        With `partition_cache_max_entries` set on the table, the partition
+        vectors (and the auto-mode size decision) are cached until any write;
+        a cached full scan also serves "auto" searches on large partitions.
+        """
+        _metric = metric or self._index_metric()
+        if exact is not False:
+            cache_key = self._get_partition_scan_cache_key(partition_id, **kwargs)
+            scan = self._get_cached_partition_scan(cache_key, exact)
+            if scan is None:
+                generation = (
+                    self.partition_cache.generation
+                    if self.partition_cache is not None
+                    else 0
+                )
+                select_cql, select_cql_vals, key_columns = self._get_partition_scan_cql(
+                    partition_id, exact, **kwargs
+                )
+                raw_rows = self.execute_cql(
+                    select_cql, args=select_cql_vals, op_type=CQLOpType.READ
+                )
+                scan = self._build_partition_scan(
+                    raw_rows, key_columns, exact, cache_key, generation
+                )
+            if scan["matrix"] is not None:
+                best_keys = self._get_exact_best_keys(
+                    scan, vector, n, _metric, metric_threshold
+                )
+                if best_keys == []:
+                    return []
+                key_columns = [col for col, _ in self._schema_primary_key()]
+                result_sets = self.execute_cql_concurrently(
+                    self._get_select_by_key_cql(key_columns),
+                    args_list=best_keys,
+                    op_type=CQLOpType.READ,
+                    concurrency=concurrency,
+                )
+                return self._finalize_compact_search(
+                    result_sets, vector, _metric, metric_threshold, top_k=n
+                )
+        return list(
+            self.metric_ann_search(
+                vector,
+                n,
+                _metric,
+                metric_threshold,
+                partition_id=partition_id,
+                **kwargs,
+            )
+        )
+
+    async def apartition_search(
+        self,
+        vector: List[float],
+        n: int,
+        partition_id: Optional[PARTITION_ID_TYPE] = None,
+        metric: Optional[str] = None,
+        metric_threshold: Optional[float] = None,
+        exact: Union[bool, str] = "auto",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        _metric = metric or self._index_metric()
+        if exact is not False:
+            cache_key = self._get_partition_scan_cache_key(partition_id, **kwargs)
+            scan = self._get_cached_partition_scan(cache_key, exact)
+            if scan is None:
+                generation = (
+                    self.partition_cache.generation
+                    if self.partition_cache is not None
+                    else 0
+                )
+                select_cql, select_cql_vals, key_columns = self._get_partition_scan_cql(
+                    partition_id, exact, **kwargs
+                )
+                raw_rows = await self.aexecute_cql(
+                    select_cql, args=select_cql_vals, op_type=CQLOpType.READ
+                )
+                scan = self._build_partition_scan(
+                    raw_rows, key_columns, exact, cache_key, generation
+                )
+            if scan["matrix"] is not None:
+                best_keys = self._get_exact_best_keys(
+                    scan, vector, n, _metric, metric_threshold
+                )
+                if best_keys == []:
+                    return []
+                key_columns = [col for col, _ in self._schema_primary_key()]
+                result_sets = await self.aexecute_cql_concurrently(
+                    self._get_select_by_key_cql(key_columns),
+                    args_list=best_keys,
+                    op_type=CQLOpType.READ,
+                    concurrency=concurrency,
+                )
+                return self._finalize_compact_search(
+                    result_sets, vector, _metric, metric_threshold, top_k=n
+                )
+        return list(
+            await self.ametric_ann_search(
+                vector,
+                n,
+                _metric,
+                metric_threshold,
+                partition_id=partition_id,
+                **kwargs,
+            )
+        )
+
+    def _get_adaptive_initial_n(
+        self,
+        stats_key: Tuple[str, Optional[float]],
+        k: int,
+        initial_n: Optional[int],
+        max_n: int,
+    ) -> int:
+        if initial_n is not None:
+            return min(initial_n, max_n)
+        pass_ratio = self.adaptive_pass_ratios.get(stats_key, 1.0)
+        if pass_ratio >= 1.0:
+            return min(k, max_n)
+        # expected size for k passing rows, i.e. k / pass_ratio, with some slack
+        expected_n = math.ceil(1.2 * k / max(pass_ratio, k / max_n))
+        return max(min(expected_n, max_n), min(k, max_n))
+
+    def _update_adaptive_stats(
+        self, stats_key: Tuple[str, Optional[float]], num_passing: int, num_rows: int
+    ) -> None:
+        if num_rows > 0:
+            previous = self.adaptive_pass_ratios.get(stats_key)
+            ratio = num_passing / num_rows
+            self.adaptive_pass_ratios[stats_key] = (
+                ratio
+                if previous is None
+                else ADAPTIVE_STATS_ALPHA * ratio
+                + (1 - ADAPTIVE_STATS_ALPHA) * previous
+            )
+
+    def _adaptive_step(
+        self,
+        rows: List[RowType],
+        vector: List[float],
+        n: int,
+        k: int,
+        metric: str,
+        metric_threshold: Optional[float],
+        max_n: int,
+        growth_factor: float,
+        stats_key: Tuple[str, Optional[float]],
+    ) -> Tuple[Optional[List[RowWithDistanceType]], int]:
+        # return (final results or None to continue, next n)
+        passing = list(
+            self._get_rows_with_distance(rows, vector, metric, metric_threshold)
+        )
+        self._update_adaptive_stats(stats_key, len(passing), len(rows))
+        # done: enough results, or no more rows at all, or at the cap
+        if len(passing) >= k or len(rows) < n or n >= max_n:
+            return passing[:k], n
+        return None, min(max(math.ceil(n * growth_factor), n + 1), max_n)
+
+    def adaptive_ann_search(
+        self,
+        vector: List[float],
+        k: int,
+        metric: Optional[str] = None,
+        metric_threshold: Optional[float] = None,
+        initial_n: Optional[int] = None,
+        max_n: int = 1000,
+        growth_factor: float = 2.0,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        """
+        Get up to `k` rows passing the `metric_threshold` (if any), nearest
+        first, each with a "distance" for `metric` (default: the one matching
+        the vector index), by repeated ANN queries with a growing `n`
+        (by `growth_factor` each time, up to `max_n`) until `k` rows pass.
+
+        The starting `n` (unless `initial_n` is given) comes from running
+        per-table statistics of the fraction of ANN hits passing the same
+        threshold, so that most queries need a single round trip.
+        """
+        _metric = metric or self._index_metric()
+        stats_key = (_metric, metric_threshold)
+        n = self._get_adaptive_initial_n(stats_key, k, initial_n, max_n)
+        while True:
+            rows = list(self.ann_search(vector, n, **kwargs))
+            results, n = self._adaptive_step(
+                rows,
+                vector,
+                n,
+                k,
+                _metric,
+                metric_threshold,
+                max_n,
+                growth_factor,
+                stats_key,
+            )
+            if results is not None:
+                return results
+
+    async def aadaptive_ann_search(
+        self,
+        vector: List[float],
+        k: int,
+        metric: Optional[str] = None,
+        metric_threshold: Optional[float] = None,
+        initial_n: Optional[int] = None,
+        max_n: int = 1000,
+        growth_factor: float = 2.0,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        _metric = metric or self._index_metric()
+        stats_key = (_metric, metric_threshold)
+        n = self._get_adaptive_initial_n(stats_key, k, initial_n, max_n)
+        while True:
+            rows = list(await self.aann_search(vector, n, **kwargs))
+            results, n = self._adaptive_step(
+                rows,
+                vector,
+                n,
+                k,
+                _metric,
+                metric_threshold,
+                max_n,
+                growth_factor,
+                stats_key,
+            )
+            if results is not None:
+                return results
+
+    def ingest(
+        self,
+        items: Iterable[IngestionItemType],
+        embed_fn: EmbeddingFunctionType,
+        batch_size: int = 32,
+        max_in_flight: int = 16,
+        start_from: int = 0,
+        row_id_fn: Callable[[str], Any] = default_row_id,
+        progress_callback: Optional[Callable[[IngestionReport], None]] = None,
+    ) -> IngestionReport:
+        """
+        Embed and write a stream of `items` (texts, or dicts of `put` arguments
+        with the text as "body_blob"), calling `embed_fn` on batches of
+        `batch_size` texts while the writes of the previous batches (at most
+        `max_in_flight` at a time) are still running.
+
+        Rows lacking a row_id get `row_id_fn(text)` (by default a hash of the
+        text, so that re-runs are idempotent). On failure an IngestionError
+        is raised, whose `report.resume_from` can be passed as `start_from`
+        to resume with the same items.
+        """
+        return ingest(
+            self,
+            items,
+            embed_fn,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            start_from=start_from,
+            row_id_fn=row_id_fn,
+            progress_callback=progress_callback,
+        )
+
+    async def aingest(
+        self,
+        items: Iterable[IngestionItemType],
+        embed_fn: EmbeddingFunctionType,
+        batch_size: int = 32,
+        max_in_flight: int = 16,
+        start_from: int = 0,
+        row_id_fn: Callable[[str], Any] = default_row_id,
+        progress_callback: Optional[Callable[[IngestionReport], None]] = None,
+    ) -> IngestionReport:
+        """
+        Asynchronous counterpart of `ingest`: `embed_fn` can be a coroutine
+        function (a plain function is run in a worker thread).
+        """
+        return await aingest(
+            self,
+            items,
+            embed_fn,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            start_from=start_from,
+            row_id_fn=row_id_fn,
+            progress_callback=progress_callback,
+        )
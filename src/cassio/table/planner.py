@@ -0,0 +1,166 @@
+"""
+A lightweight, statistics-driven planner for metadata-filtered reads.
+
+From a sample of rows it estimates the selectivity of each metadata
+condition (key = value); low-selectivity conditions, which make SAI
+queries slow, can then be moved from the server to the client.
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cassio.table.metadata_codec import coerce_metadata_value
+from cassio.table.table_types import RowType
+
+# a condition matching at least this fraction of rows is "low-selectivity"
+LOW_SELECTIVITY_THRESHOLD = 0.5
+# over-fetching factor on top of the estimated fraction of passing rows
+FETCH_SAFETY_FACTOR = 1.5
+# the most distinct values per key tracked in the statistics
+MAX_VALUES_PER_KEY = 1000
+# plans needing to read more rows than this fall back to a plain SAI query
+DEFAULT_MAX_FETCH = 1000
+
+SAI_STRATEGY = "sai"
+PARTITION_STRATEGY = "partition"
+SPLIT_STRATEGY = "split"
+
+
+class MetadataStatistics:
+    """Counts of metadata (key, value) pairs over a sample of rows."""
+
+    def __init__(self) -> None:
+        self.sample_size = 0
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, rows: Iterable[RowType]) -> None:
+        # rows are normalized rows, with a "metadata" dict
+        with self._lock:
+            for row in rows:
+                self.sample_size += 1
+                for key, value in row.get("metadata", {}).items():
+                    value_counts = self._counts.setdefault(key, {})
+                    str_value = coerce_metadata_value(value)
+                    if str_value in value_counts:
+                        value_counts[str_value] += 1
+                    elif len(value_counts) < MAX_VALUES_PER_KEY:
+                        value_counts[str_value] = 1
+
+    def selectivity(self, key: str, value: Any) -> Optional[float]:
+        """Estimated fraction of rows with metadata `key` = `value`."""
+        if self.sample_size == 0:
+            return None
+        count = self._counts.get(key, {}).get(coerce_metadata_value(value), 0)
+        # unseen values are assumed rarer than anything seen
+        return max(count, 0.5) / self.sample_size
+
+
+class QueryPlan:
+    """
+    How to run a find_entries: `server_metadata` goes to the query,
+    `client_metadata` is checked on the rows read, fetching up to
+    `fetch_n` rows (None: just the requested number).
+    """
+
+    def __init__(
+        self,
+        strategy: str,
+        server_metadata: Dict[str, Any],
+        client_metadata: Dict[str, Any],
+        selectivities: Dict[str, Optional[float]],
+        fetch_n: Optional[int] = None,
+    ) -> None:
+        self.strategy = strategy
+        self.server_metadata = server_metadata
+        self.client_metadata = client_metadata
+        self.selectivities = selectivities
+        self.fetch_n = fetch_n
+
+    def matches(self, raw_row: RowType) -> bool:
+        row_md_s = raw_row.get("metadata_s") or {}
+        return all(
+            row_md_s.get(k) == coerce_metadata_value(v)
+            for k, v in self.client_metadata.items()
+        )
+
+    def explain(self) -> str:
+        def _describe(md_dict: Dict[str, Any]) -> List[str]:
+            lines = []
+            for k, v in sorted(md_dict.items()):
+                selectivity = self.selectivities.get(k)
+                estimate = "n/a" if selectivity is None else f"{selectivity:.4f}"
+                lines.append(f"    metadata[{k!r}] = {v!r} (selectivity {estimate})")
+            return lines or ["    (none)"]
+
+        return "\n".join(
+            [f"strategy: {self.strategy}", "server-side metadata conditions:"]
+            + _describe(self.server_metadata)
+            + ["client-side metadata conditions:"]
+            + _describe(self.client_metadata)
+            + [f"rows fetched: {'n' if self.fetch_n is None else self.fetch_n}"]
+        )
+
+
+def plan_metadata_query(
+    statistics: Optional[MetadataStatistics],
+    n: int,
+    plannable_metadata: Dict[str, Any],
+    other_metadata: Dict[str, Any],
+    partition_restricted: bool,
+    max_fetch: int,
+) -> QueryPlan:
+    """
+    Choose between:
+        - "sai": all conditions in the query;
+        - "partition": (for a query restricted to a partition) when the
+          conditions are not selective, read the partition and filter rows
+          client-side;
+        - "split": keep the selective conditions in the query, check the
+          low-selectivity ones client-side.
+    Only `plannable_metadata` (plain equalities on the metadata_s column)
+    can be moved client-side; `other_metadata` always stays in the query.
+    """
+    selectivities: Dict[str, Optional[float]] = {
+        k: statistics.selectivity(k, v) if statistics is not None else None
+        for k, v in plannable_metadata.items()
+    }
+    sai_plan = QueryPlan(
+        SAI_STRATEGY,
+        {**plannable_metadata, **other_metadata},
+        {},
+        selectivities,
+    )
+    if plannable_metadata == {} or any(s is None for s in selectivities.values()):
+        return sai_plan
+    known: Dict[str, float] = {k: s for k, s in selectivities.items() if s is not None}
+    #
+    client_keys: List[str]
+    if partition_restricted and math.prod(known.values()) >= LOW_SELECTIVITY_THRESHOLD:
+        strategy = PARTITION_STRATEGY
+        client_keys = list(known)
+    else:
+        strategy = SPLIT_STRATEGY
+        client_keys = [k for k, s in known.items() if s >= LOW_SELECTIVITY_THRESHOLD]
+        if len(client_keys) == len(known):
+            # keep at least the most selective condition on the server
+            most_selective: Tuple[float, str] = min((s, k) for k, s in known.items())
+            client_keys.remove(most_selective[1])
+        if client_keys == []:
+            return sai_plan
+    #
+    client_fraction = math.prod(known[k] for k in client_keys)
+    fetch_n = math.ceil(n * FETCH_SAFETY_FACTOR / client_fraction)
+    if fetch_n > max_fetch:
+        return sai_plan
+    return QueryPlan(
+        strategy,
+        {
+            **{k: v for k, v in plannable_metadata.items() if k not in client_keys},
+            **other_metadata,
+        },
+        {k: v for k, v in plannable_metadata.items() if k in client_keys},
+        selectivities,
+        fetch_n=fetch_n,
+    )
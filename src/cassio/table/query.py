@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import itertools
 from enum import Enum
-from typing import Any, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# disjunctive query operators: {"$in": [v1, v2, ...]} as a value,
+# "$or": [{...}, {...}, ...] as a key among the metadata conditions
+IN_OPERATOR = "$in"
+OR_OPERATOR = "$or"
+# a disjunctive query expanding into more sub-queries than this is rejected
+MAX_DISJUNCTS = 64
 
 
 class PredicateOperator(Enum):
@@ -29,3 +37,86 @@ class Predicate:
             self._operator.value,
             self._value,
         )
+
+
+def _alternatives(value: Any) -> Optional[List[Any]]:
+    if isinstance(value, dict) and len(value) == 1:
+        ((operator, operands),) = value.items()
+        if operator in {IN_OPERATOR, OR_OPERATOR}:
+            return list(operands)
+    return None
+
+
+def _merge_parts(parts: Tuple[Dict[str, Any], ...]) -> Dict[str, Any]:
+    return {k: v for part in parts for k, v in part.items()}
+
+
+def _expand_metadata(md_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
+    choices: List[List[Dict[str, Any]]] = []
+    for k, v in md_dict.items():
+        if k == OR_OPERATOR:
+            choices.append([alt for sub_md in v for alt in _expand_metadata(sub_md)])
+        else:
+            alternatives = _alternatives(v)
+            if alternatives is not None:
+                choices.append([{k: alt} for alt in alternatives])
+            else:
+                choices.append([{k: v}])
+    return [_merge_parts(parts) for parts in itertools.product(*choices)]
+
+
+def has_disjunctions(args_dict: Dict[str, Any]) -> bool:
+    md_dict = args_dict.get("metadata")
+    if isinstance(md_dict, dict):
+        if OR_OPERATOR in md_dict:
+            return True
+        if any(_alternatives(v) is not None for v in md_dict.values()):
+            return True
+    return any(
+        _alternatives(v) is not None for k, v in args_dict.items() if k != "metadata"
+    )
+
+
+def expand_disjunctions(args_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Turn query kwargs with `$in`/`$or` conditions into the list of plain
+    (conjunctive) kwargs whose results, together, answer the query.
+
+    Example:
+        {
+            "metadata": {"$or": [{"a": "1"}, {"b": "2"}], "c": {"$in": [3, 4]}},
+            "body_search": {"$or": ["x", ["y", "z"]]},
+        }
+    becomes the eight combinations such as
+        {"metadata": {"a": "1", "c": 3}, "body_search": "x"}
+        {"metadata": {"b": "2", "c": 4}, "body_search": ["y", "z"]}
+    """
+    choices: List[List[Dict[str, Any]]] = []
+    for k, v in args_dict.items():
+        if k == "metadata" and isinstance(v, dict):
+            choices.append([{k: md_dict} for md_dict in _expand_metadata(v)])
+        else:
+            alternatives = _alternatives(v)
+            if alternatives is not None:
+                choices.append([{k: alt} for alt in alternatives])
+            else:
+                choices.append([{k: v}])
+    expanded = [_merge_parts(parts) for parts in itertools.product(*choices)]
+    if len(expanded) > MAX_DISJUNCTS:
+        raise ValueError(
+            f"The query expands to {len(expanded)} sub-queries "
+            f"(at most {MAX_DISJUNCTS} allowed)."
+        )
+    return expanded
+
+
+def check_no_disjunctions(args_dict: Dict[str, Any]) -> None:
+    """
+    For the query methods that do not expand `$in`/`$or` conditions:
+    these would otherwise end up in the CQL as (stringified) plain values.
+    """
+    if has_disjunctions(args_dict):
+        raise ValueError(
+            "$in/$or conditions are only supported by find_entries, "
+            "find_and_delete_entries, explain and ann_search."
+        )
@@ -0,0 +1,128 @@
+"""
+In-process LRU/TTL cache for ANN search results.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from cassio.table.query import Predicate
+from cassio.table.table_types import RowType
+
+# (expiry time, estimated size in bytes, rows)
+CacheEntryType = Tuple[Optional[float], int, List[RowType]]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn (normalized) query kwargs into a hashable, order-independent form."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    elif isinstance(value, Predicate):
+        return ("__predicate__",) + tuple(_freeze(v) for v in value.render())
+    else:
+        return value  # type: ignore[no-any-return]
+
+
+def _estimate_bytes(value: Any) -> int:
+    """A rough (recursive) estimate of the memory taken by a row value."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_bytes(k) + _estimate_bytes(v) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_estimate_bytes(v) for v in value)
+    else:
+        return sys.getsizeof(value)
+
+
+class ANNResultCache:
+    """
+    An LRU cache of ANN search results, with optional expiry (TTL) and
+    eviction by number of entries and by (estimated) total size in bytes.
+
+    Writes invalidate the whole cache: to avoid storing results computed
+    from a query that raced with a write, `put` requires the `generation`
+    read before running the query and discards stale results.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+        self._entries: OrderedDict[Hashable, CacheEntryType] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        vector: List[float], n: int, normalized_kwargs: Dict[str, Any]
+    ) -> Hashable:
+        vector_bytes = np.asarray(vector, dtype=np.float64).tobytes()
+        return (vector_bytes, n, _freeze(normalized_kwargs))
+
+    @staticmethod
+    def make_scan_key(normalized_kwargs: Dict[str, Any]) -> Hashable:
+        return ("__scan__", _freeze(normalized_kwargs))
+
+    def get(self, key: Hashable) -> Optional[List[RowType]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, nbytes, rows = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return rows
+                else:
+                    del self._entries[key]
+                    self.total_bytes -= nbytes
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, rows: List[RowType], generation: int) -> None:
+        nbytes = sum(_estimate_bytes(row) for row in rows)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        if self.ttl_seconds is not None:
+            expires_at: Optional[float] = time.monotonic() + self.ttl_seconds
+        else:
+            expires_at = None
+        with self._lock:
+            if generation != self.generation:
+                # a write happened in the meantime: results may be stale
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (expires_at, nbytes, rows)
+            self.total_bytes += nbytes
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_nbytes, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_nbytes
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple, Union
 ColumnSpecType = Tuple[str, str]
 RowType = Dict[str, Any]
 RowWithDistanceType = Dict[str, Any]
+ColumnarRowsType = Dict[str, List[Any]]
 SessionType = Any
 
 
@@ -1,8 +1,24 @@
 import asyncio
-from typing import Any, Callable, Dict, Iterable
+import math
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
 
 from cassandra.cluster import ResponseFuture, Session
 
+T = TypeVar("T")
+
 
 async def call_wrapped_async(
     func: Callable[..., ResponseFuture], *args: Any, **kwargs: Any
@@ -25,6 +41,122 @@ async def execute_cql(session: Session, cql: Any, args: Any = None) -> ResponseF
     return await call_wrapped_async(session.execute_async, cql, args)
 
 
+def gather_response_futures(
+    launchers: Sequence[Callable[[], ResponseFuture]],
+    concurrency: int,
+    timeout_seconds: Optional[float] = None,
+    timeouts: Optional[Sequence[Optional[float]]] = None,
+) -> List[Optional[Any]]:
+    """
+    Call the launchers (each starting a query and returning its ResponseFuture)
+    keeping at most `concurrency` queries in flight, and collect the results
+    in the order of `launchers`.
+
+    A result is None if it did not arrive in time: either the overall budget
+    `timeout_seconds` ran out (queries not yet started are then never
+    started), or the query exceeded its own entry in `timeouts` (counted
+    from its start). The first error from a query is raised.
+    """
+    results: List[Optional[Any]] = [None] * len(launchers)
+    condition = threading.Condition()
+    # index => error (None if successful), for all completed queries
+    completed: Dict[int, Optional[BaseException]] = {}
+    response_futures: Dict[int, ResponseFuture] = {}
+    deadlines: Dict[int, float] = {}
+    in_flight: Set[int] = set()
+    global_deadline = (
+        None if timeout_seconds is None else time.monotonic() + timeout_seconds
+    )
+
+    def _on_success(_: Any, index: int) -> None:
+        with condition:
+            completed[index] = None
+            condition.notify()
+
+    def _on_error(exc: BaseException, index: int) -> None:
+        with condition:
+            completed[index] = exc
+            condition.notify()
+
+    next_index = 0
+    while next_index < len(launchers) or in_flight:
+        while next_index < len(launchers) and len(in_flight) < concurrency:
+            index = next_index
+            next_index += 1
+            item_timeout = timeouts[index] if timeouts is not None else None
+            if item_timeout is not None:
+                deadlines[index] = time.monotonic() + item_timeout
+            response_futures[index] = launchers[index]()
+            in_flight.add(index)
+            response_futures[index].add_callbacks(
+                _on_success,
+                _on_error,
+                callback_args=(index,),
+                errback_args=(index,),
+            )
+        #
+        with condition:
+            finished = [index for index in in_flight if index in completed]
+            if not finished:
+                wake_ups = [
+                    deadlines[index] for index in in_flight if index in deadlines
+                ]
+                if global_deadline is not None:
+                    wake_ups.append(global_deadline)
+                condition.wait(
+                    max(min(wake_ups) - time.monotonic(), 0) if wake_ups else None
+                )
+                finished = [index for index in in_flight if index in completed]
+        for index in finished:
+            in_flight.discard(index)
+            error = completed[index]
+            if error is not None:
+                raise error
+            results[index] = response_futures[index].result()
+        # give up on overdue queries
+        now = time.monotonic()
+        in_flight -= {
+            index for index in in_flight if deadlines.get(index, math.inf) <= now
+        }
+        if global_deadline is not None and now >= global_deadline:
+            break
+    return results
+
+
+async def agather_bounded(
+    coroutine_factories: Sequence[Callable[[], Awaitable[T]]],
+    concurrency: int,
+    timeout_seconds: Optional[float] = None,
+    timeouts: Optional[Sequence[Optional[float]]] = None,
+) -> List[Optional[T]]:
+    """
+    Asynchronous counterpart of gather_response_futures, running the
+    coroutines created by the factories.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run_one(index: int) -> Optional[T]:
+        async with semaphore:
+            item_timeout = timeouts[index] if timeouts is not None else None
+            try:
+                return await asyncio.wait_for(
+                    coroutine_factories[index](), item_timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+
+    tasks = [
+        asyncio.ensure_future(_run_one(index))
+        for index in range(len(coroutine_factories))
+    ]
+    if tasks == []:
+        return []
+    done, pending = await asyncio.wait(tasks, timeout=timeout_seconds)
+    for task in pending:
+        task.cancel()
+    return [task.result() if task in done else None for task in tasks]
+
+
 def handle_multicolumn_unpacking(
     args_dict: Dict[str, Any],
     key_name: str,
@@ -99,3 +231,20 @@ def handle_multicolumn_packing(
             }
     else:
         return unpacked_row
+
+
+def rows_to_columns(rows: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Turn a sequence of rows (dicts) into a columnar form, i.e. a dict
+    {column_name: [value_0, value_1, ...]}. Missing values are set to None.
+
+    Example:
+        rows = [{"a": 1, "b": "x"}, {"a": 2}]
+    results in
+        {"a": [1, 2], "b": ["x", None]}
+    """
+    row_list = list(rows)
+    column_names: Dict[str, None] = {}
+    for row in row_list:
+        column_names.update(dict.fromkeys(row.keys()))
+    return {col: [row.get(col) for row in row_list] for col in column_names}
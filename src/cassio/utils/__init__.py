@@ -1,3 +1,6 @@
-from cassio.utils.vector.distance_metrics import distance_metrics
+from cassio.utils.vector.distance_metrics import (
+    distance_matrix_metrics,
+    distance_metrics,
+)
 
-__all__ = ["distance_metrics"]
+__all__ = ["distance_metrics", "distance_matrix_metrics"]
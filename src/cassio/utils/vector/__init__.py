@@ -1 +1,2 @@
+from cassio.utils.vector.distance_metrics import distance_matrix_metrics  # noqa: F401
 from cassio.utils.vector.distance_metrics import distance_metrics  # noqa: F401
@@ -1,8 +1,142 @@
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from numpy.typing import NDArray
 
 VectorType = List[float]
+MatrixLikeType = Union[List[VectorType], NDArray[np.floating]]
+VectorLikeType = Union[VectorType, NDArray[np.floating]]
+FloatMatrixType = NDArray[np.float32]
+
+
+def as_float32_matrix(
+    vectors: Union[MatrixLikeType, VectorLikeType]
+) -> FloatMatrixType:
+    """
+    Coerce a list of vectors (or a single vector) into a 2D float32 array.
+    Inputs that already are C-contiguous float32 arrays are not copied.
+    An empty list becomes a (0, 0) matrix.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1) if matrix.size > 0 else matrix.reshape(0, 0)
+    return np.ascontiguousarray(matrix)
+
+
+def vector_norms(vectors: MatrixLikeType) -> FloatMatrixType:
+    """
+    L2 norms of each row of a (N, D) matrix, as a float32 (N,) array.
+    Meant to be computed once and cached alongside a candidate matrix,
+    then passed to the `*_matrix` kernels as `candidate_norms`.
+    """
+    norms: FloatMatrixType = np.linalg.norm(as_float32_matrix(vectors), axis=1)
+    return norms
+
+
+def _output_matrix(
+    n_queries: int, n_candidates: int, out: Optional[FloatMatrixType]
+) -> FloatMatrixType:
+    if out is None:
+        return np.empty((n_queries, n_candidates), dtype=np.float32)
+    if out.shape != (n_queries, n_candidates):
+        raise ValueError(
+            f"Preallocated output has shape {out.shape}, "
+            f"expected {(n_queries, n_candidates)}"
+        )
+    return out
+
+
+# Matrix-vs-matrix distance kernels. Each takes Q query vectors and N candidate
+# vectors and returns a (Q, N) float32 array whose [q, c] entry is
+#     distance(candidate_c, query_q).
+# Candidate norms, if already known (e.g. cached with the candidate matrix),
+# can be passed to the kernels that use them; `out` can be a preallocated
+# (Q, N) float32 array to write the results into.
+def distance_dot_product_matrix(
+    query_vectors: MatrixLikeType,
+    candidate_vectors: MatrixLikeType,
+    candidate_norms: Optional[FloatMatrixType] = None,
+    out: Optional[FloatMatrixType] = None,
+) -> FloatMatrixType:
+    queries = as_float32_matrix(query_vectors)
+    candidates = as_float32_matrix(candidate_vectors)
+    result = _output_matrix(queries.shape[0], candidates.shape[0], out)
+    np.matmul(queries, candidates.T, out=result)
+    return result
+
+
+def distance_cos_difference_matrix(
+    query_vectors: MatrixLikeType,
+    candidate_vectors: MatrixLikeType,
+    candidate_norms: Optional[FloatMatrixType] = None,
+    out: Optional[FloatMatrixType] = None,
+) -> FloatMatrixType:
+    queries = as_float32_matrix(query_vectors)
+    candidates = as_float32_matrix(candidate_vectors)
+    c_norms = (
+        candidate_norms if candidate_norms is not None else vector_norms(candidates)
+    )
+    q_norms = vector_norms(queries)
+    result = _output_matrix(queries.shape[0], candidates.shape[0], out)
+    np.matmul(queries, candidates.T, out=result)
+    result /= np.outer(q_norms, c_norms)
+    return result
+
+
+def distance_l2_matrix(
+    query_vectors: MatrixLikeType,
+    candidate_vectors: MatrixLikeType,
+    candidate_norms: Optional[FloatMatrixType] = None,
+    out: Optional[FloatMatrixType] = None,
+) -> FloatMatrixType:
+    # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, clipped against negative roundoff
+    queries = as_float32_matrix(query_vectors)
+    candidates = as_float32_matrix(candidate_vectors)
+    c_norms = (
+        candidate_norms if candidate_norms is not None else vector_norms(candidates)
+    )
+    q_norms = vector_norms(queries)
+    result = _output_matrix(queries.shape[0], candidates.shape[0], out)
+    np.matmul(queries, candidates.T, out=result)
+    result *= -2
+    result += np.square(q_norms)[:, np.newaxis]
+    result += np.square(c_norms)[np.newaxis, :]
+    np.maximum(result, 0, out=result)
+    np.sqrt(result, out=result)
+    return result
+
+
+def _distance_ord_matrix(
+    query_vectors: MatrixLikeType,
+    candidate_vectors: MatrixLikeType,
+    ord: float,
+    out: Optional[FloatMatrixType],
+) -> FloatMatrixType:
+    # one query at a time, to keep memory at O(N*D) instead of O(Q*N*D)
+    queries = as_float32_matrix(query_vectors)
+    candidates = as_float32_matrix(candidate_vectors)
+    result = _output_matrix(queries.shape[0], candidates.shape[0], out)
+    for q_i, query in enumerate(queries):
+        result[q_i] = np.linalg.norm(candidates - query, axis=1, ord=ord)
+    return result
+
+
+def distance_l1_matrix(
+    query_vectors: MatrixLikeType,
+    candidate_vectors: MatrixLikeType,
+    candidate_norms: Optional[FloatMatrixType] = None,
+    out: Optional[FloatMatrixType] = None,
+) -> FloatMatrixType:
+    return _distance_ord_matrix(query_vectors, candidate_vectors, 1, out)
+
+
+def distance_max_matrix(
+    query_vectors: MatrixLikeType,
+    candidate_vectors: MatrixLikeType,
+    candidate_norms: Optional[FloatMatrixType] = None,
+    out: Optional[FloatMatrixType] = None,
+) -> FloatMatrixType:
+    return _distance_ord_matrix(query_vectors, candidate_vectors, np.inf, out)
 
 
 # distance definitions. These all work batched in the first argument.
@@ -16,7 +150,8 @@ def distance_dot_product(
     At the moment only the dot product is supported
     (which for unitary vectors is the cosine difference).
 
-    Not particularly optimized.
+    Not particularly optimized: for batched work,
+    prefer `distance_dot_product_matrix`.
     """
     v1s = np.array(embedding_vectors, dtype=float)
     v2 = np.array(reference_embedding_vector, dtype=float)
@@ -98,3 +233,79 @@ distance_metrics: Dict[
         False,
     ),
 }
+
+MatrixDistanceFunctionType = Callable[
+    [
+        MatrixLikeType,
+        MatrixLikeType,
+        Optional[FloatMatrixType],
+        Optional[FloatMatrixType],
+    ],
+    FloatMatrixType,
+]
+
+# Same keys and same 'reverse' semantics as `distance_metrics`, for the
+# (query_vectors, candidate_vectors, candidate_norms, out) matrix kernels.
+distance_matrix_metrics: Dict[str, Tuple[MatrixDistanceFunctionType, bool]] = {
+    "cos": (
+        distance_cos_difference_matrix,
+        True,
+    ),
+    "dot": (
+        distance_dot_product_matrix,
+        True,
+    ),
+    "l1": (
+        distance_l1_matrix,
+        False,
+    ),
+    "l2": (
+        distance_l2_matrix,
+        False,
+    ),
+    "max": (
+        distance_max_matrix,
+        False,
+    ),
+}
+
+# client-side metrics also available as CQL similarity functions
+metric_to_similarity_function = {
+    "cos": "similarity_cosine",
+    "dot": "similarity_dot_product",
+    "l2": "similarity_euclidean",
+}
+
+
+def similarity_to_distance(
+    metric: str, similarities: FloatMatrixType
+) -> FloatMatrixType:
+    """
+    Convert scores from the CQL similarity functions, all rescaled to [0, 1],
+    back into the corresponding client-side metric values.
+    """
+    distances: FloatMatrixType
+    if metric in {"cos", "dot"}:
+        # similarity = (1 + x) / 2
+        distances = 2 * similarities - 1
+    elif metric == "l2":
+        # similarity = 1 / (1 + d^2)
+        distances = np.sqrt(np.maximum(1 / similarities - 1, 0)).astype(np.float32)
+    else:
+        raise ValueError(f"No server-side similarity for metric '{metric}'")
+    return distances
+
+
+def distance_to_similarity(metric: str, distances: FloatMatrixType) -> FloatMatrixType:
+    """
+    Inverse of similarity_to_distance: rescale client-side metric values
+    to the [0, 1] scores of the corresponding CQL similarity functions.
+    """
+    similarities: FloatMatrixType
+    if metric in {"cos", "dot"}:
+        similarities = ((1 + distances) / 2).astype(np.float32)
+    elif metric == "l2":
+        similarities = (1 / (1 + np.square(distances))).astype(np.float32)
+    else:
+        raise ValueError(f"No server-side similarity for metric '{metric}'")
+    return similarities
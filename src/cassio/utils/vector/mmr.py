@@ -0,0 +1,63 @@
+from typing import List
+
+import numpy as np
+
+from cassio.utils.vector.distance_metrics import (
+    MatrixLikeType,
+    VectorLikeType,
+    as_float32_matrix,
+    distance_matrix_metrics,
+    vector_norms,
+)
+
+
+def maximal_marginal_relevance(
+    query_vector: VectorLikeType,
+    candidate_vectors: MatrixLikeType,
+    k: int,
+    lambda_mult: float = 0.5,
+    metric: str = "cos",
+) -> List[int]:
+    """
+    Select up to `k` of the candidates with the Maximal Marginal Relevance
+    criterion, trading relevance to the query (weight `lambda_mult`) for
+    diversity among the selected ones (weight `1 - lambda_mult`).
+
+    Return the indices of the selected candidates, in selection order.
+
+    All work is done in float32 over the whole candidate matrix: the
+    candidate-to-candidate scores are computed one selected row at a time,
+    which keeps memory at O(N) rather than O(N^2).
+    """
+    query = as_float32_matrix(query_vector)
+    candidates = as_float32_matrix(candidate_vectors)
+    num_candidates = candidates.shape[0]
+    if k <= 0 or num_candidates == 0:
+        return []
+    distance_function, distance_reversed = distance_matrix_metrics[metric]
+    # "similarity" below means: higher is closer (distances are negated)
+    sign = 1.0 if distance_reversed else -1.0
+    candidate_norms = vector_norms(candidates)
+    query_similarities = (
+        sign * distance_function(query, candidates, candidate_norms, None)[0]
+    )
+    # max similarity of each candidate to any of the selected ones
+    redundancy = np.full(num_candidates, -np.inf, dtype=np.float32)
+    available = np.ones(num_candidates, dtype=bool)
+    selected: List[int] = []
+    while len(selected) < min(k, num_candidates):
+        if selected:
+            scores = lambda_mult * query_similarities - (1 - lambda_mult) * redundancy
+        else:
+            scores = query_similarities.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(
+            redundancy,
+            sign
+            * distance_function(candidates[best], candidates, candidate_norms, None)[0],
+            out=redundancy,
+        )
+    return selected
@@ -0,0 +1,74 @@
+"""
+Compact quantized encodings of vectors, stored as blobs:
+
+- "int8": a float32 scale followed by one signed byte per component
+  (about 4x smaller than float32);
+- "binary": one bit (the sign) per component, packed (32x smaller).
+
+Decoding yields a float32 matrix usable with the distance kernels. Binary
+codes only keep the direction of the vectors, so they are meaningful
+for "cos" and "dot" rescoring rather than for "l2"/"l1"/"max".
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from cassio.utils.vector.distance_metrics import (
+    FloatMatrixType,
+    MatrixLikeType,
+    VectorLikeType,
+    as_float32_matrix,
+)
+
+QUANTIZATION_MODES = {"int8", "binary"}
+
+_SCALE_DTYPE = np.dtype("<f4")
+
+
+def _check_mode(mode: str) -> None:
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"Unknown quantization mode '{mode}' "
+            f"(must be one of: {', '.join(sorted(QUANTIZATION_MODES))})"
+        )
+
+
+def quantize_vectors(vectors: MatrixLikeType, mode: str) -> List[bytes]:
+    """Encode each row of `vectors` into a quantized code."""
+    _check_mode(mode)
+    matrix = as_float32_matrix(vectors)
+    if mode == "int8":
+        scales = np.abs(matrix).max(axis=1, initial=0.0) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return [
+            scale.astype(_SCALE_DTYPE).tobytes() + code.tobytes()
+            for scale, code in zip(scales, codes)
+        ]
+    else:
+        packed = np.packbits(matrix > 0, axis=1)
+        return [code.tobytes() for code in packed]
+
+
+def quantize_vector(vector: VectorLikeType, mode: str) -> bytes:
+    return quantize_vectors(as_float32_matrix(vector), mode)[0]
+
+
+def dequantize_vectors(
+    codes: Sequence[bytes], mode: str, dimension: int
+) -> FloatMatrixType:
+    """Decode quantized codes into an approximate (N, dimension) float32 matrix."""
+    _check_mode(mode)
+    if len(codes) == 0:
+        return np.zeros((0, dimension), dtype=np.float32)
+    raw = np.frombuffer(b"".join(codes), dtype=np.uint8).reshape(len(codes), -1)
+    if mode == "int8":
+        scales = raw[:, : _SCALE_DTYPE.itemsize].copy().view(_SCALE_DTYPE)
+        values = raw[:, _SCALE_DTYPE.itemsize :].view(np.int8)
+        decoded: FloatMatrixType = values.astype(np.float32) * scales.astype(np.float32)
+        return decoded
+    else:
+        bits = np.unpackbits(raw, axis=1, count=dimension)
+        signs: FloatMatrixType = bits.astype(np.float32) * 2.0 - 1.0
+        return signs
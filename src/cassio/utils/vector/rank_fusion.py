@@ -0,0 +1,54 @@
+"""
+Merging of several rankings (or scorings) of the same kind of items
+into a single score per item, higher meaning better.
+"""
+
+from typing import Dict, Hashable, Optional, Sequence
+
+DEFAULT_RRF_K = 60
+
+
+def _get_weights(num_lists: int, weights: Optional[Sequence[float]]) -> Sequence[float]:
+    if weights is None:
+        return [1.0] * num_lists
+    if len(weights) != num_lists:
+        raise ValueError("There must be exactly one weight per ranking.")
+    return weights
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = DEFAULT_RRF_K,
+) -> Dict[Hashable, float]:
+    """
+    Reciprocal Rank Fusion: each item scores sum(weight / (k + rank)) over
+    the rankings it appears in (rank starting at 1, best first).
+    """
+    _weights = _get_weights(len(rankings), weights)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, _weights):
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+    return scores
+
+
+def weighted_score_fusion(
+    score_maps: Sequence[Dict[Hashable, float]],
+    weights: Optional[Sequence[float]] = None,
+) -> Dict[Hashable, float]:
+    """
+    Weighted sum of scores, each scoring being first min-max normalized
+    to [0, 1] (items missing from a scoring count as zero for it).
+    """
+    _weights = _get_weights(len(score_maps), weights)
+    scores: Dict[Hashable, float] = {}
+    for score_map, weight in zip(score_maps, _weights):
+        if not score_map:
+            continue
+        min_score = min(score_map.values())
+        score_range = max(score_map.values()) - min_score
+        for item, score in score_map.items():
+            normalized = (score - min_score) / score_range if score_range > 0 else 1.0
+            scores[item] = scores.get(item, 0.0) + weight * normalized
+    return scores
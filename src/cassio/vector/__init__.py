@@ -1,3 +1,5 @@
+from cassio.vector.federated import FederatedVectorSearch
+from cassio.vector.local_replica import LocalVectorReplica
 from cassio.vector.vector_table import VectorTable
 
-__all__ = ["VectorTable"]
+__all__ = ["FederatedVectorSearch", "LocalVectorReplica", "VectorTable"]
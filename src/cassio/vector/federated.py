@@ -0,0 +1,162 @@
+"""
+ANN search over several vector tables at once, merged into a single ranking.
+"""
+
+import functools
+import heapq
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cassio.table.base_table import DEFAULT_CONCURRENCY
+from cassio.table.cql import CQLOpType
+from cassio.table.mixins.vector import VectorMixin
+from cassio.table.table_types import RowType, RowWithDistanceType
+from cassio.table.utils import agather_bounded, gather_response_futures
+from cassio.utils.vector.distance_metrics import (
+    distance_to_similarity,
+    metric_to_similarity_function,
+)
+
+
+class FederatedVectorSearch:
+    """
+    Run the same ANN search on several vector tables (possibly living in
+    different keyspaces, or even clusters), concurrently, and merge the
+    hits by a common score.
+
+    Each hit is scored with `metric` (one of "cos", "dot", "l2"), computed
+    by the database if `server_similarity`, else recomputed client-side
+    from the vectors. Scores are rescaled to [0, 1] as the CQL similarity
+    functions do (so that all metrics read "higher is better"), then
+    multiplied by the table `weights`. Rows are returned with "distance",
+    "score" and "source_table" (the table fully-qualified name) entries.
+
+    `timeouts_seconds` gives a per-table time limit: tables not answering
+    in time are left out of the results.
+    """
+
+    def __init__(
+        self,
+        tables: List[VectorMixin],
+        weights: Optional[Sequence[float]] = None,
+        timeouts_seconds: Optional[Sequence[Optional[float]]] = None,
+        metric: str = "cos",
+        server_similarity: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        if metric not in metric_to_similarity_function:
+            raise ValueError(f"Unsupported metric '{metric}' for federated search")
+        if weights is not None and len(weights) != len(tables):
+            raise ValueError("There must be exactly one weight per table.")
+        if timeouts_seconds is not None and len(timeouts_seconds) != len(tables):
+            raise ValueError("There must be exactly one timeout per table.")
+        self.tables = tables
+        self.weights = list(weights) if weights is not None else [1.0] * len(tables)
+        self.timeouts_seconds = timeouts_seconds
+        self.metric = metric
+        self.server_similarity = server_similarity
+        self.concurrency = concurrency
+
+    def _get_table_cqls(
+        self, vector: List[float], n: int, **kwargs: Any
+    ) -> List[Tuple[str, Tuple[Any, ...]]]:
+        if self.server_similarity:
+            return [
+                table._get_server_similarity_ann_search_cql(
+                    vector, n, self.metric, **kwargs
+                )
+                for table in self.tables
+            ]
+        else:
+            return [
+                table._get_ann_search_cql(vector, n, **kwargs) for table in self.tables
+            ]
+
+    def _score_table_rows(
+        self,
+        table_i: int,
+        result_set: Iterable[RowType],
+        vector: List[float],
+    ) -> List[RowWithDistanceType]:
+        table = self.tables[table_i]
+        rows = (table._normalize_row(result) for result in result_set)
+        scored_rows: List[RowWithDistanceType] = list(
+            table._get_rows_with_server_distance(rows, self.metric)
+            if self.server_similarity
+            else table._get_rows_with_distance(rows, vector, self.metric)
+        )
+        if scored_rows == []:
+            return []
+        scores = self.weights[table_i] * distance_to_similarity(
+            self.metric,
+            np.array([row["distance"] for row in scored_rows], dtype=np.float32),
+        )
+        source_table = f"{table.keyspace}.{table.table}"
+        return [
+            {
+                **row,
+                **{"score": score, "source_table": source_table},
+            }
+            for row, score in zip(scored_rows, scores.tolist())
+        ]
+
+    def _merge_results(
+        self,
+        result_sets: List[Optional[Iterable[RowType]]],
+        vector: List[float],
+        n: int,
+    ) -> List[RowWithDistanceType]:
+        all_rows = [
+            row
+            for table_i, result_set in enumerate(result_sets)
+            if result_set is not None
+            for row in self._score_table_rows(table_i, result_set, vector)
+        ]
+        return heapq.nlargest(n, all_rows, key=lambda row: row["score"])
+
+    def search(
+        self, vector: List[float], n: int, **kwargs: Any
+    ) -> List[RowWithDistanceType]:
+        """
+        Get the best `n` rows overall, best-first, asking `n` rows to each
+        table. Further keyword arguments (filters) apply to all tables.
+        """
+        table_cqls = self._get_table_cqls(vector, n, **kwargs)
+        result_sets = gather_response_futures(
+            [
+                functools.partial(
+                    table.execute_cql_async,
+                    select_ann_cql,
+                    op_type=CQLOpType.READ,
+                    args=select_ann_cql_vals,
+                )
+                for table, (select_ann_cql, select_ann_cql_vals) in zip(
+                    self.tables, table_cqls
+                )
+            ],
+            concurrency=self.concurrency,
+            timeouts=self.timeouts_seconds,
+        )
+        return self._merge_results(result_sets, vector, n)
+
+    async def asearch(
+        self, vector: List[float], n: int, **kwargs: Any
+    ) -> List[RowWithDistanceType]:
+        table_cqls = self._get_table_cqls(vector, n, **kwargs)
+        result_sets = await agather_bounded(
+            [
+                functools.partial(
+                    table.aexecute_cql,
+                    select_ann_cql,
+                    op_type=CQLOpType.READ,
+                    args=select_ann_cql_vals,
+                )
+                for table, (select_ann_cql, select_ann_cql_vals) in zip(
+                    self.tables, table_cqls
+                )
+            ],
+            concurrency=self.concurrency,
+            timeouts=self.timeouts_seconds,
+        )
+        return self._merge_results(result_sets, vector, n)
@@ -0,0 +1,401 @@
+"""
+An in-process, read-only replica of a vector table, answering
+ANN-search-compatible queries with exact (brute-force) vectorized search.
+
+Suitable for tables small enough to fit in memory (up to a few million rows)
+when some staleness (down to the refresh interval) is acceptable.
+"""
+
+import logging
+import math
+import operator
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, cast
+
+import numpy as np
+
+from cassio.table.cql import SELECT_CQL_TEMPLATE, CQLOpType
+from cassio.table.mixins.metadata import MetadataMixin
+from cassio.table.mixins.vector import VectorMixin
+from cassio.table.query import Predicate
+from cassio.table.table_types import RowType, RowWithDistanceType
+from cassio.utils.vector.distance_metrics import (
+    FloatMatrixType,
+    distance_matrix_metrics,
+    vector_norms,
+)
+
+logger = logging.getLogger(__name__)
+
+_predicate_operators: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+# starting capacity (in rows) of the matrix being loaded, doubled when full
+INITIAL_MATRIX_ROWS = 1024
+
+
+def _as_number(value: Any) -> float:
+    # metadata values are read back as strings (or floats): NaN if not numeric
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class _MatrixBuilder:
+    """
+    A float32 (N, D) matrix filled one row at a time, in memory or in a
+    memory-mapped temporary file, growing geometrically as rows arrive.
+    """
+
+    def __init__(self, mmap_dir: Optional[str]) -> None:
+        self.mmap_dir = mmap_dir
+        self.num_rows = 0
+        self._tmp_path: Optional[str] = None
+        self._buffer: Optional[FloatMatrixType] = None
+
+    def append(self, vector: Any) -> None:
+        if self._buffer is None:
+            self._resize(INITIAL_MATRIX_ROWS, len(vector))
+        elif self.num_rows == self._buffer.shape[0]:
+            self._resize(2 * self.num_rows, self._buffer.shape[1])
+        assert self._buffer is not None
+        self._buffer[self.num_rows] = vector
+        self.num_rows += 1
+
+    def _resize(self, num_rows: int, dimension: int) -> None:
+        if self.mmap_dir is None:
+            if self._buffer is None:
+                self._buffer = np.empty((num_rows, dimension), dtype=np.float32)
+            else:
+                # in place (a realloc), no second copy of the matrix around
+                self._buffer.resize((num_rows, dimension), refcheck=False)
+            return
+        if self._tmp_path is None:
+            fd, self._tmp_path = tempfile.mkstemp(dir=self.mmap_dir)
+            os.close(fd)
+        elif self._buffer is not None:
+            cast(np.memmap, self._buffer).flush()
+            self._buffer = None
+        with open(self._tmp_path, "r+b") as tmp_file:
+            tmp_file.truncate(num_rows * dimension * np.dtype(np.float32).itemsize)
+        self._buffer = np.memmap(
+            self._tmp_path, dtype=np.float32, mode="r+", shape=(num_rows, dimension)
+        )
+
+    def discard(self) -> None:
+        self._buffer = None
+        if self._tmp_path is not None:
+            os.remove(self._tmp_path)
+            self._tmp_path = None
+
+    def finalize(self, mmap_path: Optional[str]) -> FloatMatrixType:
+        if self._buffer is None:
+            return np.empty((0, 0), dtype=np.float32)
+        self._resize(self.num_rows, self._buffer.shape[1])
+        if self._tmp_path is not None and mmap_path is not None:
+            # move the file over the previous one: readers of the
+            # previous snapshot keep their (unlinked) mapping
+            os.replace(self._tmp_path, mmap_path)
+        return self._buffer
+
+
+class _ReplicaSnapshot:
+    """An immutable picture of the table contents, swapped in at each refresh."""
+
+    def __init__(
+        self,
+        columns: Dict[str, List[Any]],
+        matrix: FloatMatrixType,
+        metadata_keys: Iterable[str],
+    ) -> None:
+        self.num_rows = int(matrix.shape[0])
+        self.matrix = matrix
+        self.norms = (
+            vector_norms(matrix) if self.num_rows > 0 else np.zeros(0, dtype=np.float32)
+        )
+        # one object array per top-level field and per metadata key,
+        # for vectorized filtering (the rows are rebuilt from these):
+        self.columns: Dict[str, np.ndarray[Any, np.dtype[Any]]] = {
+            field: self._object_array(values) for field, values in columns.items()
+        }
+        self.metadata_columns: Dict[str, np.ndarray[Any, np.dtype[Any]]] = {}
+        metadata = self.columns.get("metadata")
+        if metadata is not None:
+            self.metadata_columns = {
+                md_key: self._object_array(
+                    (md or {}).get(md_key) for md in metadata.tolist()
+                )
+                for md_key in metadata_keys
+            }
+        # numeric views of the metadata columns, built at first use
+        self._numeric_metadata_columns: Dict[
+            str, np.ndarray[Any, np.dtype[np.float64]]
+        ] = {}
+
+    def row(self, row_i: int) -> RowType:
+        return {field: column[row_i] for field, column in self.columns.items()}
+
+    def numeric_metadata_column(
+        self, md_key: str
+    ) -> Optional[np.ndarray[Any, np.dtype[np.float64]]]:
+        md_column = self.metadata_columns.get(md_key)
+        if md_column is None:
+            return None
+        if md_key not in self._numeric_metadata_columns:
+            self._numeric_metadata_columns[md_key] = np.fromiter(
+                (_as_number(value) for value in md_column),
+                dtype=np.float64,
+                count=len(md_column),
+            )
+        return self._numeric_metadata_columns[md_key]
+
+    @staticmethod
+    def _object_array(values: Iterable[Any]) -> np.ndarray[Any, np.dtype[Any]]:
+        value_list = list(values)
+        array = np.empty(len(value_list), dtype=object)
+        array[:] = value_list
+        return array
+
+
+class LocalVectorReplica:
+    """
+    Load a whole vector table (e.g. VectorCassandraTable or
+    MetadataVectorCassandraTable) with a paged full scan into a float32
+    matrix (memory-mapped to a file if `mmap_path` is given) plus per-field
+    metadata arrays, and answer `ann_search` / `metric_ann_search` locally.
+
+    Filtering supports the same keyword arguments as the table searches
+    (e.g. `metadata={...}`, `partition_id=...`, with Predicate values
+    where applicable), evaluated against the local copy. As on the table,
+    Predicates on metadata compare numbers.
+
+    Refreshing reloads the table and atomically swaps the new snapshot in:
+    queries never block on a refresh. A background thread can do this
+    periodically (`refresh_interval_seconds`).
+    """
+
+    def __init__(
+        self,
+        table: VectorMixin,
+        mmap_path: Optional[str] = None,
+        refresh_interval_seconds: Optional[float] = None,
+    ) -> None:
+        self.table = table
+        self.mmap_path = mmap_path
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._snapshot = self._load_snapshot()
+        if refresh_interval_seconds is not None:
+            self.start_background_refresh(refresh_interval_seconds)
+
+    def __len__(self) -> int:
+        return self._snapshot.num_rows
+
+    def _scan_table(self) -> Iterable[RowType]:
+        # a full-table read: the driver pages through the result set
+        select_cql = SELECT_CQL_TEMPLATE.format(
+            columns_desc="*",
+            where_clause="",
+            limit_clause="",
+        )
+        result_set = self.table.execute_cql(select_cql, op_type=CQLOpType.READ)
+        return (self.table._normalize_row(raw_row) for raw_row in result_set)
+
+    def _load_snapshot(self) -> _ReplicaSnapshot:
+        # rows are streamed in: each vector goes straight into the float32
+        # matrix, the other fields to per-column lists
+        matrix_builder = _MatrixBuilder(
+            None
+            if self.mmap_path is None
+            else os.path.dirname(os.path.abspath(self.mmap_path))
+        )
+        columns: Dict[str, List[Any]] = {}
+        metadata_keys: Dict[str, None] = {}
+        try:
+            for row in self._scan_table():
+                vector = row.pop("vector", None)
+                if vector is None:
+                    # rows without a vector cannot be found by ANN anyway
+                    continue
+                for field in row:
+                    if field not in columns:
+                        columns[field] = [None] * matrix_builder.num_rows
+                for field, values in columns.items():
+                    values.append(row.get(field))
+                matrix_builder.append(vector)
+                metadata_keys.update(dict.fromkeys(row.get("metadata", {}).keys()))
+            matrix = matrix_builder.finalize(self.mmap_path)
+        except BaseException:
+            matrix_builder.discard()
+            raise
+        logger.debug(f"Loaded {matrix.shape[0]} rows into local replica")
+        return _ReplicaSnapshot(columns, matrix, metadata_keys.keys())
+
+    def refresh(self) -> None:
+        """Reload the whole table and swap the new contents in."""
+        with self._refresh_lock:
+            self._snapshot = self._load_snapshot()
+
+    def _refresh_loop(self, interval_seconds: float) -> None:
+        while not self._stop_event.wait(interval_seconds):
+            try:
+                self.refresh()
+            except Exception as exc:
+                # keep serving the previous snapshot, retry at next round
+                logger.warning(f"Local replica refresh failed: {exc}")
+
+    def start_background_refresh(self, interval_seconds: float) -> None:
+        self.stop_background_refresh()
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, args=(interval_seconds,), daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        if self._refresh_thread is not None:
+            self._stop_event.set()
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+    @staticmethod
+    def _match(
+        column: np.ndarray[Any, np.dtype[Any]], value: Any
+    ) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        if isinstance(value, Predicate):
+            op_name, op_value = value.render()
+            compare = _predicate_operators[op_name]
+            return np.fromiter(
+                (x is not None and compare(x, op_value) for x in column),
+                dtype=np.bool_,
+                count=len(column),
+            )
+        return np.asarray(column == value, dtype=bool)
+
+    @staticmethod
+    def _match_numeric(
+        numeric_column: np.ndarray[Any, np.dtype[np.float64]], predicate: Predicate
+    ) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        op_name, op_value = predicate.render()
+        operand = _as_number(op_value)
+        if math.isnan(operand):
+            raise ValueError(
+                f"Conditions on metadata need a numeric operand (got {op_value!r})."
+            )
+        # (non-numeric values, as NaN, never match)
+        return np.asarray(
+            _predicate_operators[op_name](numeric_column, operand), dtype=bool
+        )
+
+    def _filter_mask(
+        self, snapshot: _ReplicaSnapshot, **kwargs: Any
+    ) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        mask = np.ones(snapshot.num_rows, dtype=bool)
+        for key, value in kwargs.items():
+            if key == "metadata":
+                if not isinstance(self.table, MetadataMixin):
+                    raise ValueError("Metadata filtering requires a metadata table.")
+                for md_key, md_value in value.items():
+                    md_column = snapshot.metadata_columns.get(md_key)
+                    if md_column is None:
+                        return np.zeros(snapshot.num_rows, dtype=bool)
+                    if isinstance(md_value, Predicate):
+                        # numeric comparisons, as on the table (metadata_n)
+                        numeric_column = snapshot.numeric_metadata_column(md_key)
+                        assert numeric_column is not None
+                        mask &= self._match_numeric(numeric_column, md_value)
+                        continue
+                    md_mask = self._match(md_column, md_value)
+                    # indexed metadata values are read back as strings
+                    md_mask |= self._match(
+                        md_column, self.table._coerce_string(md_value)
+                    )
+                    mask &= md_mask
+            elif key == "body_search":
+                raise ValueError("Body search is not supported on local replicas.")
+            else:
+                column = snapshot.columns.get(key)
+                if column is None:
+                    raise ValueError(f"Unknown field '{key}' for filtering.")
+                mask &= self._match(column, value)
+        return mask
+
+    def _search(
+        self,
+        vector: List[float],
+        n: int,
+        metric: str,
+        metric_threshold: Optional[float],
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        snapshot = self._snapshot
+        candidates = np.flatnonzero(self._filter_mask(snapshot, **kwargs))
+        if len(candidates) == 0 or n <= 0:
+            return []
+        distance_function, distance_reversed = distance_matrix_metrics[metric]
+        distances = distance_function(
+            [vector], snapshot.matrix[candidates], snapshot.norms[candidates], None
+        )[0]
+        # sort keys: ascending is nearest-first
+        sort_keys = -distances if distance_reversed else distances
+        if metric_threshold is not None:
+            passing = np.flatnonzero(
+                distances >= metric_threshold
+                if distance_reversed
+                else distances <= metric_threshold
+            )
+        else:
+            passing = np.arange(len(candidates))
+        if n < len(passing):
+            passing = passing[np.argpartition(sort_keys[passing], n - 1)[:n]]
+        selected = passing[np.argsort(sort_keys[passing], kind="stable")]
+        return [
+            {
+                **snapshot.row(row_i),
+                **{
+                    "vector": snapshot.matrix[row_i].tolist(),
+                    "distance": distance,
+                },
+            }
+            for row_i, distance in zip(
+                candidates[selected].tolist(), distances[selected].tolist()
+            )
+        ]
+
+    def ann_search(self, vector: List[float], n: int, **kwargs: Any) -> List[RowType]:
+        """
+        Exact counterpart of the table `ann_search`, ranking by the
+        similarity function of the table vector index.
+        """
+        metric = self.table._index_metric() or "cos"
+        return [
+            {k: v for k, v in row.items() if k != "distance"}
+            for row in self._search(vector, n, metric, None, **kwargs)
+        ]
+
+    def metric_ann_search(
+        self,
+        vector: List[float],
+        n: int,
+        metric: str,
+        metric_threshold: Optional[float] = None,
+        **kwargs: Any,
+    ) -> List[RowWithDistanceType]:
+        """
+        Exact counterpart of the table `metric_ann_search`: the best `n`
+        matching rows (among those passing the threshold, if any).
+        """
+        return self._search(vector, n, metric, metric_threshold, **kwargs)
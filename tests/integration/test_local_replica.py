@@ -0,0 +1,61 @@
+"""
+Local vector replica integration test
+"""
+import math
+
+from cassandra.cluster import Session
+
+from cassio.table.tables import MetadataVectorCassandraTable
+from cassio.vector import LocalVectorReplica
+
+N = 8
+
+
+def test_local_replica(db_session: Session, db_keyspace: str) -> None:
+    table_name = "m_v_ct_replica"
+    db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+    #
+    t = MetadataVectorCassandraTable(
+        session=db_session,
+        keyspace=db_keyspace,
+        table=table_name,
+        vector_dimension=2,
+        primary_key_type="TEXT",
+    )
+    for n_theta in range(N):
+        theta = n_theta * math.pi * 2 / N
+        t.put(
+            row_id=f"theta_{n_theta}",
+            body_blob=f"theta = {theta:.4f}",
+            vector=[math.cos(theta), math.sin(theta)],
+            metadata={"parity": n_theta % 2},
+        )
+
+    replica = LocalVectorReplica(t)
+    assert len(replica) == N
+
+    query_theta = 1 * math.pi * 2 / (2 * N)
+    ref_vector = [math.cos(query_theta), math.sin(query_theta)]
+    local_results = replica.ann_search(ref_vector, n=4)
+    remote_results = list(t.ann_search(ref_vector, n=4))
+    assert [r["row_id"] for r in local_results[:2]] == [
+        r["row_id"] for r in remote_results[:2]
+    ]
+    assert {r["row_id"] for r in local_results[2:4]} == {"theta_2", "theta_7"}
+
+    odd_results = replica.ann_search(ref_vector, n=2, metadata={"parity": 1})
+    assert {r["row_id"] for r in odd_results} == {"theta_1", "theta_7"}
+
+    l2_results = replica.metric_ann_search(
+        ref_vector, n=4, metric="l2", metric_threshold=0.5
+    )
+    assert {r["row_id"] for r in l2_results} == {"theta_0", "theta_1"}
+
+    # the replica only sees new rows after a refresh
+    t.put(row_id="extra", body_blob="extra", vector=ref_vector)
+    assert len(replica) == N
+    replica.refresh()
+    assert len(replica) == N + 1
+    assert replica.ann_search(ref_vector, n=1)[0]["row_id"] == "extra"
+
+    t.clear()
@@ -0,0 +1,63 @@
+"""
+Semantic cache integration test
+"""
+
+import pytest
+from cassandra.cluster import Session
+
+from cassio.cache import SemanticCache
+
+
+@pytest.mark.usefixtures("db_session", "db_keyspace")
+class TestSemanticCache:
+    def test_semantic_cache(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "semantic_cache"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        #
+        cache = SemanticCache(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            vector_dimension=2,
+            similarity_threshold=0.99,
+        )
+        cache.put([1.0, 0.0], "east")
+        cache.put([0.0, 1.0], "north")
+
+        # exact match
+        assert cache.lookup([1.0, 0.0]) == "east"
+        # approximate match, passing the threshold
+        assert cache.lookup([1.0, 0.01]) == "east"
+        hit = cache.lookup_row([0.01, 1.0])
+        assert hit is not None
+        assert hit["body_blob"] == "north"
+        assert hit["distance"] > 0.99
+        # too far
+        assert cache.lookup([1.0, 1.0]) is None
+        assert cache.lookup([1.0, 1.0], threshold=0.7) in {"east", "north"}
+
+        cache.delete([1.0, 0.0])
+        assert cache.lookup([1.0, 0.0]) is None
+
+        cache.clear()
+        assert cache.lookup([0.0, 1.0]) is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_async(
+        self, db_session: Session, db_keyspace: str
+    ) -> None:
+        table_name = "semantic_cache_async"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        #
+        cache = SemanticCache(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            vector_dimension=2,
+            similarity_threshold=0.99,
+            ttl_seconds=3600,
+        )
+        await cache.aput([1.0, 0.0], "east")
+        assert await cache.alookup([1.0, 0.01]) == "east"
+        assert await cache.alookup([-1.0, 0.0]) is None
+        await cache.aclear()
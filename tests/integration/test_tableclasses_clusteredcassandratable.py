@@ -5,6 +5,8 @@ Table classes integration test - ClusteredCassandraTable
 import pytest
 from cassandra.cluster import Session
 
+from cassio.table.bucketing import CountBucketing
+from cassio.table.query import Predicate
 from cassio.table.tables import ClusteredCassandraTable
 from cassio.table.utils import execute_cql
 
@@ -91,6 +93,101 @@ class TestClusteredCassandraTable:
         #
         t_desc.clear()
 
+    def test_delete_range(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "c_ct_range"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        t = ClusteredCassandraTable(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            partition_id="my_part",
+        )
+        for i in range(6):
+            t.put(row_id=f"row{i}", body_blob="blob")
+        t.put(row_id="row0", partition_id="other_p", body_blob="blob")
+        t.delete_range(row_id=Predicate("<", "row3"))
+        assert [row["row_id"] for row in t.get_partition()] == ["row3", "row4", "row5"]
+        assert t.get(row_id="row0", partition_id="other_p") is not None
+        #
+        t.clear()
+
+    def test_partition_pages(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "c_ct_pages"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        t = ClusteredCassandraTable(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            partition_id="my_part",
+            ordering_in_partition="DESC",
+        )
+        for i in range(7):
+            t.put(row_id=f"row{i}", body_blob="blob")
+        row_ids = []
+        page = t.get_partition_page(n=3)
+        row_ids += [row["row_id"] for row in page.rows]
+        while page.next_cursor is not None:
+            page = t.get_partition_page(n=3, after=page.next_cursor)
+            row_ids += [row["row_id"] for row in page.rows]
+        assert row_ids == [f"row{i}" for i in range(6, -1, -1)]
+        back_page = t.get_partition_page(n=2, before="row2")
+        assert [row["row_id"] for row in back_page.rows] == ["row4", "row3"]
+        assert back_page.next_cursor == "row4"
+        #
+        t.clear()
+
+    def test_bucketed_partition(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "c_ct_bucketed"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name}_buckets;")
+        t = ClusteredCassandraTable(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            partition_id="my_part",
+            ordering_in_partition="DESC",
+            bucketing=CountBucketing(rows_per_bucket=3),
+        )
+        for i in range(8):
+            t.put(row_id=f"row{i}", body_blob=f"blob{i}")
+        assert [row["row_id"] for row in t.get_partition(n=4)] == [
+            "row7",
+            "row6",
+            "row5",
+            "row4",
+        ]
+        assert t.get(row_id="row1") == {
+            "partition_id": "my_part",
+            "row_id": "row1",
+            "body_blob": "blob1",
+        }
+        t.delete(row_id="row6")
+        assert t.get(row_id="row6") is None
+        t.delete_partition()
+        assert list(t.get_partition()) == []
+        #
+        t.clear()
+
+    def test_get_partitions(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "c_ct_multi"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        t = ClusteredCassandraTable(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+        )
+        for p_i in range(3):
+            for r_i in range(3):
+                t.put(partition_id=f"p{p_i}", row_id=f"r{r_i}{p_i}", body_blob="b")
+        by_partition = t.get_partitions(["p0", "p2", "p9"], n_per_partition=2)
+        assert isinstance(by_partition, dict)
+        assert [row["row_id"] for row in by_partition["p2"]] == ["r02", "r12"]
+        assert by_partition["p9"] == []
+        merged = t.get_partitions(["p0", "p1"], 2, merge="by_clustering")
+        assert [row["row_id"] for row in merged] == ["r00", "r01", "r10", "r11"]
+        #
+        t.clear()
+
     def test_crud_async(self, db_session: Session, db_keyspace: str) -> None:
         table_name = "c_ct"
         db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
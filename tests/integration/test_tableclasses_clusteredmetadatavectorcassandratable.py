@@ -260,6 +260,45 @@ class TestClusteredMetadataVectorCassandraTable:
             "Z_theta_13",
         }
 
+        # ANN across partitions, merged: partitions 0 and 999 mirror each other
+        xp_results = t.ann_search_partitions(zref_vector, 4, partition_ids=[0, 999])
+        assert {r["row_id"] for r in xp_results} == {
+            "theta_0",
+            "theta_1",
+            "Z_theta_0",
+            "Z_theta_1",
+        }
+        assert all(
+            xp_results[i]["distance"] >= xp_results[i + 1]["distance"] for i in range(3)
+        )
+        xp_results_md = t.ann_search_partitions(
+            zref_vector,
+            2,
+            partition_ids=[0, 999, 12345],
+            metadata={"odd": True},
+            concurrency=1,
+        )
+        assert {r["row_id"] for r in xp_results_md} <= {
+            "theta_1",
+            "theta_15",
+            "Z_theta_1",
+            "Z_theta_15",
+        }
+
+        # exact search within a (small) partition, vs. ANN
+        exact_results = t.partition_search(zref_vector, 4, partition_id=999)
+        assert {r["row_id"] for r in exact_results[:2]} == {"Z_theta_1", "Z_theta_0"}
+        assert {r["row_id"] for r in exact_results[2:4]} == {
+            "Z_theta_2",
+            "Z_theta_15",
+        }
+        exact_results_md = t.partition_search(
+            zref_vector, 2, partition_id=999, metadata={"odd": True}, exact=True
+        )
+        assert {r["row_id"] for r in exact_results_md} == {"Z_theta_1", "Z_theta_15"}
+        ann_results = t.partition_search(zref_vector, 2, partition_id=999, exact=False)
+        assert {r["row_id"] for r in ann_results} == {"Z_theta_1", "Z_theta_0"}
+
         t.clear()
 
     def test_colbertflow_multicolumn(
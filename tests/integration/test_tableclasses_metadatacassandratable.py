@@ -8,6 +8,7 @@ import pytest
 from cassandra.cluster import Session
 
 from cassio.table.cql import STANDARD_ANALYZER
+from cassio.table.query import Predicate
 from cassio.table.tables import MetadataCassandraTable
 from cassio.table.utils import execute_cql
 
@@ -449,6 +450,60 @@ class TestMetadataCassandraTable:
         )
         assert num_found_items_c == 0
 
+    def test_metadata_numeric(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "m_ct_numeric"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        #
+        t = MetadataCassandraTable(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            primary_key_type="TEXT",
+            metadata_numeric=True,
+        )
+        for i in range(10):
+            t.put(row_id=f"r{i}", metadata={"price": i, "parity": i % 2})
+        assert t.get(row_id="r3") == {
+            "row_id": "r3",
+            "body_blob": None,
+            "metadata": {"price": 3.0, "parity": 1.0},
+        }
+        cheap = t.find_entries(n=20, metadata={"price": Predicate("<", 4)})
+        assert {row["row_id"] for row in cheap} == {"r0", "r1", "r2", "r3"}
+        cheap_odd = t.find_entries(
+            n=20,
+            metadata={"parity": 1, "price": Predicate(">=", 3.5)},
+        )
+        assert {row["row_id"] for row in cheap_odd} == {"r5", "r7", "r9"}
+
+    def test_promoted_metadata(self, db_session: Session, db_keyspace: str) -> None:
+        table_name = "m_ct_promoted"
+        db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+        #
+        t = MetadataCassandraTable(
+            session=db_session,
+            keyspace=db_keyspace,
+            table=table_name,
+            primary_key_type="TEXT",
+            promoted_metadata={"tenant": "TEXT", "rank": "INT"},
+        )
+        for i in range(6):
+            t.put(
+                row_id=f"r{i}",
+                metadata={"tenant": f"t{i % 2}", "rank": i, "tag": "x"},
+            )
+        assert t.get(row_id="r3") == {
+            "row_id": "r3",
+            "body_blob": None,
+            "metadata": {"tenant": "t1", "rank": 3, "tag": "x"},
+        }
+        t1_rows = t.find_entries(n=10, metadata={"tenant": "t1", "tag": "x"})
+        assert {row["row_id"] for row in t1_rows} == {"r1", "r3", "r5"}
+        t0_low = t.find_entries(
+            n=10, metadata={"tenant": "t0", "rank": Predicate("<", 3)}
+        )
+        assert {row["row_id"] for row in t0_low} == {"r0", "r2"}
+
     @pytest.mark.skipif(
         os.getenv("TEST_DB_MODE", "LOCAL_CASSANDRA") != "ASTRA_DB",
         reason="requires a test Astra DB instance",
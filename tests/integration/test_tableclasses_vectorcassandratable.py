@@ -48,6 +48,21 @@ def test_crud(db_session: Session, db_keyspace: str) -> None:
     assert {r["row_id"] for r in ann_results[:2]} == {"theta_1", "theta_0"}
     assert {r["row_id"] for r in ann_results[2:4]} == {"theta_2", "theta_7"}
 
+    # multiple ANN queries at once
+    ref_vector_b = [-math.cos(query_theta), -math.sin(query_theta)]
+    many_results = t.ann_search_many([ref_vector, ref_vector_b], n=2)
+    assert len(many_results) == 2
+    assert {r["row_id"] for r in many_results[0]} == {"theta_1", "theta_0"}
+    assert {r["row_id"] for r in many_results[1]} == {"theta_4", "theta_5"}
+    many_results_c = t.ann_search_many([ref_vector], n=2, columnar=True)
+    assert set(many_results_c[0]["row_id"]) == {"theta_1", "theta_0"}
+
+    # MMR: with full relevance weight, same as plain ANN
+    mmr_results = t.mmr_search(ref_vector, k=2, fetch_k=4, lambda_mult=1.0)
+    assert {r["row_id"] for r in mmr_results} == {"theta_1", "theta_0"}
+    mmr_results_d = t.mmr_search(ref_vector, k=2, fetch_k=4, lambda_mult=0.1)
+    assert len(mmr_results_d) == 2
+
     with pytest.raises(ValueError):
         t.get(body_search="theta")
 
@@ -92,6 +107,14 @@ def test_index_analyzers(db_session: Session, db_keyspace: str) -> None:
     ann_results = list(t.ann_search(ref_vector, n=4, body_search=["theta_2", "foo"]))
     assert ann_results == []
 
+    # hybrid: the lexical match is promoted among the ANN results
+    hybrid_results = t.hybrid_search(ref_vector, "theta_4", k=3, fetch_k=2)
+    assert "theta_4" in {r["row_id"] for r in hybrid_results}
+    hybrid_results_w = t.hybrid_search(
+        ref_vector, "theta_4", k=3, fetch_k=2, fusion="weighted"
+    )
+    assert len(hybrid_results_w) == 3
+
     t.clear()
 
 
@@ -155,4 +178,55 @@ def test_similarity_option(db_session: Session, db_keyspace: str) -> None:
     assert len(best_match_c) == 2
     assert best_match_c[0]["row_id"] == "cos"
 
+    # top-k cut and server ordering kept for the index-matching metric
+    best_match_k = list(t.metric_ann_search(query_vector, n=2, metric="l2", top_k=1))
+    assert [r["row_id"] for r in best_match_k] == ["euc"]
+    best_match_o = list(
+        t.metric_ann_search(query_vector, n=2, metric="l2", keep_ann_order=True)
+    )
+    assert [r["row_id"] for r in best_match_o] == ["euc", "cos"]
+
+    # server-computed scores, vectors not read
+    best_match_s = list(
+        t.metric_ann_search(query_vector, n=2, metric="l2", server_similarity=True)
+    )
+    assert [r["row_id"] for r in best_match_s] == ["euc", "cos"]
+    assert "vector" not in best_match_s[0]
+    assert abs(best_match_s[0]["distance"] - best_match_e[0]["distance"]) < 0.001
+
+    t.clear()
+
+
+def test_vector_quantization(db_session: Session, db_keyspace: str) -> None:
+    table_name = "v_ct_quant"
+    db_session.execute(f"DROP TABLE IF EXISTS {db_keyspace}.{table_name};")
+    #
+    t = VectorCassandraTable(
+        session=db_session,
+        keyspace=db_keyspace,
+        table=table_name,
+        vector_dimension=2,
+        primary_key_type="TEXT",
+        vector_quantization="int8",
+    )
+
+    for n_theta in range(N):
+        theta = n_theta * math.pi * 2 / N
+        t.put(
+            row_id=f"theta_{n_theta}",
+            body_blob=f"theta = {theta:.4f}",
+            vector=[math.cos(theta), math.sin(theta)],
+        )
+
+    # quantized codes do not surface in the rows
+    theta_1 = t.get(row_id="theta_1")
+    assert theta_1 is not None
+    assert "vector_q" not in theta_1
+
+    query_theta = 1 * math.pi * 2 / (2 * N)
+    ref_vector = [math.cos(query_theta), math.sin(query_theta)]
+    compact_results = t.compact_search(ref_vector, n=2, fetch_k=6)
+    assert {r["row_id"] for r in compact_results} == {"theta_1", "theta_0"}
+    assert compact_results[0]["distance"] >= compact_results[1]["distance"]
+
     t.clear()
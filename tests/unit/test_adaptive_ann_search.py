@@ -0,0 +1,63 @@
+"""
+Iterative-deepening ANN search and its running statistics
+"""
+import math
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from cassio.table.cql import MockDBSession
+from cassio.table.tables import VectorCassandraTable
+
+# rows in ANN order for the query [1, 0]: angles 0, 5, 10, ... degrees
+ANN_ROWS: List[Dict[str, Any]] = [
+    {
+        "row_id": f"r{i}",
+        "vector": [math.cos(math.radians(5 * i)), math.sin(math.radians(5 * i))],
+    }
+    for i in range(36)
+]
+
+
+class TestAdaptiveANNSearch:
+    def test_adaptive_growth(self, mock_db_session: MockDBSession) -> None:
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+        )
+        requested_ns: List[int] = []
+
+        def _ann_search(vector: List[float], n: int, **kwargs: Any) -> Any:
+            requested_ns.append(n)
+            return ANN_ROWS[:n]
+
+        with patch.object(vt, "ann_search", side_effect=_ann_search):
+            # no threshold: one query, exactly k
+            results = vt.adaptive_ann_search([1.0, 0.0], 3)
+            assert [r["row_id"] for r in results] == ["r0", "r1", "r2"]
+            assert requested_ns == [3]
+            # cos > 0.9 means: angle below ~25.8 degrees, i.e. r0 to r5
+            requested_ns.clear()
+            results = vt.adaptive_ann_search([1.0, 0.0], 8, metric_threshold=0.9)
+            assert [r["row_id"] for r in results] == [f"r{i}" for i in range(6)]
+            # growing n stops at the cap
+            requested_ns.clear()
+            results = vt.adaptive_ann_search(
+                [1.0, 0.0], 8, metric_threshold=0.9, max_n=36
+            )
+            assert len(results) == 6
+            assert requested_ns[0] > 8
+            assert requested_ns[-1] == 36
+            # the learned pass ratio makes later queries start bigger
+            assert vt.adaptive_pass_ratios[("cos", 0.9)] < 1.0
+            requested_ns.clear()
+            results = vt.adaptive_ann_search([1.0, 0.0], 2, metric_threshold=0.9)
+            assert len(results) == 2
+            assert requested_ns[0] > 2
+            assert len(requested_ns) == 1
+            # an explicit initial_n wins
+            requested_ns.clear()
+            vt.adaptive_ann_search([1.0, 0.0], 2, initial_n=2)
+            assert requested_ns == [2]
@@ -0,0 +1,67 @@
+"""
+ANN result caching and its invalidation on writes
+"""
+
+import time
+
+from cassio.table.cql import MockDBSession
+from cassio.table.result_cache import ANNResultCache
+from cassio.table.tables import MetadataVectorCassandraTable
+
+
+class TestANNResultCache:
+    def test_lru_and_ttl(self) -> None:
+        cache = ANNResultCache(max_entries=2)
+        k1 = cache.make_key([1.0, 2.0], 3, {"metadata_s": {"a": "1", "b": "2"}})
+        k1b = cache.make_key([1.0, 2.0], 3, {"metadata_s": {"b": "2", "a": "1"}})
+        k2 = cache.make_key([1.0, 2.0], 4, {})
+        k3 = cache.make_key([1.0, 2.5], 3, {})
+        assert k1 == k1b
+        cache.put(k1, [{"row_id": "r1"}], cache.generation)
+        cache.put(k2, [{"row_id": "r2"}], cache.generation)
+        assert cache.get(k1) == [{"row_id": "r1"}]
+        cache.put(k3, [{"row_id": "r3"}], cache.generation)
+        # k2 was the least recently used
+        assert cache.get(k2) is None
+        assert len(cache) == 2
+        # stale generation: not stored
+        old_generation = cache.generation
+        cache.invalidate()
+        cache.put(k1, [{"row_id": "r1"}], old_generation)
+        assert cache.get(k1) is None
+        assert cache.total_bytes == 0
+        # expiry
+        ttl_cache = ANNResultCache(max_entries=2, ttl_seconds=0.01)
+        ttl_cache.put(k1, [{"row_id": "r1"}], ttl_cache.generation)
+        time.sleep(0.02)
+        assert ttl_cache.get(k1) is None
+        # size
+        tiny_cache = ANNResultCache(max_entries=2, max_bytes=10)
+        tiny_cache.put(k1, [{"row_id": "r1"}], tiny_cache.generation)
+        assert tiny_cache.get(k1) is None
+
+    def test_table_cache_invalidation(self, mock_db_session: MockDBSession) -> None:
+        mvt = MetadataVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            ann_cache_max_entries=10,
+        )
+        assert mvt.ann_cache is not None
+        num_statements = len(mock_db_session.statements)
+        list(mvt.ann_search([1, 2], 3, metadata={"a": "b"}))
+        list(mvt.ann_search([1, 2], 3, metadata={"a": "b"}))
+        list(mvt.metric_ann_search([1, 2], 3, metric="cos", metadata={"a": "b"}))
+        assert len(mock_db_session.statements) == num_statements + 1
+        assert mvt.ann_cache.hits == 2
+        # different filters: no hit
+        list(mvt.ann_search([1, 2], 3, metadata={"a": "c"}))
+        assert len(mock_db_session.statements) == num_statements + 2
+        # a write invalidates everything
+        mvt.put(row_id="r", vector=[3, 4])
+        assert len(mvt.ann_cache) == 0
+        list(mvt.ann_search([1, 2], 3, metadata={"a": "b"}))
+        assert len(mock_db_session.statements) == num_statements + 4
+        mvt.delete_async(row_id="r")
+        assert len(mvt.ann_cache) == 0
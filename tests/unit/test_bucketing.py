@@ -0,0 +1,342 @@
+"""
+Bucketed clustered tables: bucket assignment, registry and cross-bucket reads
+"""
+
+import logging
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table import (
+    ClusteredCassandraTable,
+    ClusteredElasticCassandraTable,
+    ClusteredMetadataCassandraTable,
+    ClusteredVectorCassandraTable,
+)
+from cassio.table.bucketing import CountBucketing, TimeBucketing
+from cassio.table.cql import MockDBSession, MockResponseFuture
+
+
+class FailingResponseFuture(MockResponseFuture):
+    def add_callbacks(  # type: ignore[override]
+        self,
+        callback: Callable[..., Any],
+        errback: Callable[..., Any],
+        errback_args: Tuple[Any, ...] = tuple(),
+        **kwargs: Any,
+    ) -> None:
+        errback(ValueError("boom"), *errback_args)
+
+
+class TestBucketing:
+    def test_strategies(self) -> None:
+        time_b = TimeBucketing(bucket_seconds=3600, clock=lambda: 7300.0)
+        # 1970-01-01 01:00:00 UTC, as TIMEUUID
+        ts = 0x01B21DD213814000 + 3600 * 10**7
+        t_uuid = uuid.UUID(
+            fields=(
+                ts & 0xFFFFFFFF,
+                (ts >> 32) & 0xFFFF,
+                (ts >> 48) & 0x0FFF | 0x1000,
+                0x80,
+                0,
+                1,
+            )
+        )
+        assert t_uuid.version == 1
+        assert time_b.bucket_for_row_id(t_uuid) == 1
+        assert time_b.bucket_for_row_id((t_uuid, "x")) == 1
+        assert time_b.bucket_for_row_id("r1") is None
+        assert time_b.bucket_for_write("p", "r1", None) == 2
+        #
+        count_b = CountBucketing(rows_per_bucket=2)
+        assert count_b.needs_latest_bucket("p")
+        assert [count_b.bucket_for_write("p", "r", 5) for _ in range(5)] == [
+            5,
+            5,
+            6,
+            6,
+            7,
+        ]
+        assert not count_b.needs_latest_bucket("p")
+        count_b.forget("p")
+        assert count_b.needs_latest_bucket("p")
+        with pytest.raises(ValueError):
+            CountBucketing(rows_per_bucket=0)
+
+    def test_writes_and_deletes(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            partition_id="p0",
+            bucketing=TimeBucketing(bucket_seconds=10, clock=lambda: 25.0),
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "CREATE TABLE IF NOT EXISTS k.tn ( partition_id TEXT, bucket BIGINT, "
+                    "row_id TEXT, body_blob TEXT, PRIMARY KEY ( ( partition_id, "
+                    "bucket ) , row_id ) ) WITH CLUSTERING ORDER BY (row_id ASC);",
+                    tuple(),
+                ),
+                (
+                    "CREATE TABLE IF NOT EXISTS k.tn_buckets (partition_id TEXT, "
+                    "bucket BIGINT, PRIMARY KEY ((partition_id), bucket)) "
+                    "WITH CLUSTERING ORDER BY (bucket DESC);",
+                    tuple(),
+                ),
+            ]
+        )
+        table.put(row_id="r1", body_blob="b1")
+        table.put(row_id="r2", body_blob="b2")
+        mock_db_session.assert_last_equal(
+            [
+                # looking for a previous version of the row (none: no buckets)
+                (
+                    "SELECT bucket FROM k.tn_buckets WHERE partition_id = ?;",
+                    ("p0",),
+                ),
+                (
+                    "INSERT INTO k.tn_buckets (partition_id, bucket) VALUES (?, ?);",
+                    ("p0", 2),
+                ),
+                (
+                    "INSERT INTO k.tn (body_blob, row_id, partition_id, bucket) "
+                    "VALUES (?, ?, ?, ?) ;",
+                    ("b1", "r1", "p0", 2),
+                ),
+                (
+                    "SELECT bucket FROM k.tn_buckets WHERE partition_id = ?;",
+                    ("p0",),
+                ),
+                # the registry row is upserted on every write
+                (
+                    "INSERT INTO k.tn_buckets (partition_id, bucket) VALUES (?, ?);",
+                    ("p0", 2),
+                ),
+                (
+                    "INSERT INTO k.tn (body_blob, row_id, partition_id, bucket) "
+                    "VALUES (?, ?, ?, ?) ;",
+                    ("b2", "r2", "p0", 2),
+                ),
+            ]
+        )
+        # non-time row_ids: all buckets are addressed
+        with patch.object(table, "_get_buckets", return_value=[2, 1]):
+            table.delete(row_id="r1")
+            table.delete_partition()
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "DELETE FROM k.tn WHERE partition_id = ? AND row_id = ? "
+                    "AND bucket IN ?",
+                    ("p0", "r1", (2, 1)),
+                ),
+                (
+                    "DELETE FROM k.tn WHERE partition_id = ? AND bucket IN ?",
+                    ("p0", (2, 1)),
+                ),
+                (
+                    "DELETE FROM k.tn_buckets WHERE partition_id = ?",
+                    ("p0",),
+                ),
+            ]
+        )
+        table.put(row_id="r3", body_blob="b3")
+        assert mock_db_session.last(2)[0][1] == ("p0", 2)
+
+    def test_partition_deleted_elsewhere(self, mock_db_session: MockDBSession) -> None:
+        # e.g. two processes: the writer knows nothing of the deletion
+        tables = [
+            ClusteredCassandraTable(
+                "tn",
+                session=mock_db_session,
+                keyspace="k",
+                partition_id="p0",
+                bucketing=CountBucketing(rows_per_bucket=10),
+                skip_provisioning=True,
+            )
+            for _ in range(2)
+        ]
+        writer, deleter = tables
+        writer.put(row_id="r1", body_blob="b1")
+        deleter.delete_partition()
+        writer.put(row_id="r2", body_blob="b2")
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT bucket FROM k.tn_buckets WHERE partition_id = ?;",
+                    ("p0",),
+                ),
+                (
+                    "INSERT INTO k.tn_buckets (partition_id, bucket) VALUES (?, ?);",
+                    ("p0", 0),
+                ),
+                (
+                    "INSERT INTO k.tn (body_blob, row_id, partition_id, bucket) "
+                    "VALUES (?, ?, ?, ?) ;",
+                    ("b2", "r2", "p0", 0),
+                ),
+            ]
+        )
+
+    def test_delete_partition_async(
+        self, mock_db_session: MockDBSession, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            partition_id="p0",
+            bucketing=CountBucketing(rows_per_bucket=10),
+            skip_provisioning=True,
+        )
+        futures = [MockResponseFuture([]), FailingResponseFuture([])]
+        with patch.object(table, "_get_buckets", return_value=[1, 0]):
+            with patch.object(table, "execute_cql_async", side_effect=futures):
+                with caplog.at_level(logging.WARNING):
+                    table.delete_partition_async().result()
+        assert "bucket registry of partition ('p0',) failed: boom" in caplog.text
+
+    def test_rewrites(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            partition_id="p0",
+            ordering_in_partition="DESC",
+            bucketing=CountBucketing(rows_per_bucket=2),
+            skip_provisioning=True,
+        )
+        # a minimal in-memory stand-in for the table and its bucket registry
+        registry: List[int] = []
+        stored: Dict[Tuple[int, str], Dict[str, Any]] = {}
+
+        def _execute_cql(cql: str, op_type: Any, args: Tuple[Any, ...]) -> Any:
+            if cql.startswith("INSERT INTO {table_fqname}_buckets"):
+                registry.append(args[1])
+                return []
+            if cql.startswith("SELECT bucket FROM"):
+                buckets = sorted(set(registry), reverse=True)
+                return [{"bucket": b} for b in buckets[: 1 if "LIMIT" in cql else None]]
+            if cql.startswith("INSERT INTO"):
+                columns = cql.split("(")[1].split(")")[0].split(", ")
+                row = dict(zip(columns, args))
+                stored[(row["bucket"], row["row_id"])] = row
+                return []
+            if cql.startswith("SELECT * FROM") and "row_id = %s" in cql:
+                _, row_id, buckets = args
+                return [
+                    row
+                    for (bucket, r_id), row in stored.items()
+                    if r_id == row_id and bucket in buckets
+                ]
+            if cql.startswith("SELECT * FROM"):
+                bucket = args[0]
+                return sorted(
+                    (row for (b, _), row in stored.items() if b == bucket),
+                    key=lambda row: row["row_id"],
+                    reverse=True,
+                )
+            raise AssertionError(cql)
+
+        with patch.object(table, "execute_cql", side_effect=_execute_cql):
+            for i in range(5):
+                table.put(row_id="a", body_blob=f"a{i}")
+            for row_id in ["b", "c", "d"]:
+                table.put(row_id=row_id, body_blob=row_id)
+            # all versions of "a" went to the same bucket
+            assert sorted(bucket for bucket, _ in stored) == [0, 0, 1, 1]
+            table.put(row_id="c", body_blob="c1")
+            assert [row["body_blob"] for row in table.get_partition()] == [
+                "d",
+                "c1",
+                "b",
+                "a4",
+            ]
+            # copies left by racing writers: the newest bucket wins
+            stored[(1, "a")] = {"partition_id": "p0", "bucket": 1, "row_id": "a"}
+            stored[(1, "a")]["body_blob"] = "a_new"
+            assert table.get(row_id="a") == {
+                "partition_id": "p0",
+                "row_id": "a",
+                "body_blob": "a_new",
+            }
+            assert [row["body_blob"] for row in table.get_partition()] == [
+                "d",
+                "c1",
+                "b",
+                "a_new",
+            ]
+
+    def test_get_partition_across_buckets(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            partition_id="p0",
+            ordering_in_partition="DESC",
+            bucketing=CountBucketing(rows_per_bucket=3),
+            skip_provisioning=True,
+        )
+        bucket_rows: Dict[int, List[str]] = {
+            3: ["r9", "r8"],
+            2: ["r7", "r6", "r5"],
+            1: ["r4", "r3", "r2"],
+        }
+        read_buckets: List[int] = []
+
+        def _execute_cql(cql: str, op_type: Any, args: Tuple[Any, ...]) -> Any:
+            if "_buckets" in cql:
+                return [{"bucket": bucket} for bucket in bucket_rows]
+            bucket, _, limit = args
+            read_buckets.append(bucket)
+            return [
+                {"partition_id": "p0", "bucket": bucket, "row_id": row_id}
+                for row_id in bucket_rows[bucket][:limit]
+            ]
+
+        with patch.object(table, "execute_cql", side_effect=_execute_cql):
+            rows = list(table.get_partition(n=4))
+            assert [row["row_id"] for row in rows] == ["r9", "r8", "r7", "r6"]
+            assert all("bucket" not in row for row in rows)
+            # the oldest bucket was not needed
+            assert read_buckets == [3, 2]
+            page = table.get_partition_page(n=5)
+            assert page.next_cursor == "r5"
+        with pytest.raises(ValueError):
+            ClusteredCassandraTable(
+                "tn",
+                session=mock_db_session,
+                keyspace="k",
+                primary_key_type=["TEXT", "TEXT", "TEXT"],
+                ordering_in_partition=["ASC", "DESC"],
+                bucketing=CountBucketing(rows_per_bucket=3),
+            )
+
+    def test_searchable_tables(self, mock_db_session: MockDBSession) -> None:
+        ClusteredElasticCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            keys=["a", "b"],
+            bucketing=CountBucketing(rows_per_bucket=3),
+        )
+        with pytest.raises(ValueError):
+            ClusteredMetadataCassandraTable(
+                "tn",
+                session=mock_db_session,
+                keyspace="k",
+                bucketing=CountBucketing(rows_per_bucket=3),
+            )
+        with pytest.raises(ValueError):
+            ClusteredVectorCassandraTable(
+                "tn",
+                session=mock_db_session,
+                keyspace="k",
+                vector_dimension=2,
+                bucketing=CountBucketing(rows_per_bucket=3),
+            )
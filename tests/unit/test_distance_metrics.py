@@ -0,0 +1,79 @@
+"""
+Matrix distance kernels vs. the single-reference distance functions
+"""
+
+import numpy as np
+import pytest
+
+from cassio.utils.vector.distance_metrics import (
+    distance_matrix_metrics,
+    distance_metrics,
+    distance_to_similarity,
+    similarity_to_distance,
+    vector_norms,
+)
+
+QUERIES = [[1.0, 2.0, -1.0], [0.5, -0.5, 3.0]]
+CANDIDATES = [[1.0, 0.0, 0.0], [2.0, 3.0, -1.5], [-1.0, 0.2, 0.4], [0.0, 0.0, 1.0]]
+
+
+class TestDistanceMetrics:
+    @pytest.mark.parametrize("metric", sorted(distance_metrics.keys()))
+    def test_matrix_kernels_match_legacy(self, metric: str) -> None:
+        legacy_function, legacy_reversed = distance_metrics[metric]
+        matrix_function, matrix_reversed = distance_matrix_metrics[metric]
+        assert legacy_reversed == matrix_reversed
+
+        result = matrix_function(QUERIES, CANDIDATES, None, None)
+        assert isinstance(result, np.ndarray)
+        assert result.dtype == np.float32
+        assert result.shape == (len(QUERIES), len(CANDIDATES))
+        for q_i, query in enumerate(QUERIES):
+            expected = legacy_function(CANDIDATES, query)
+            assert np.allclose(result[q_i], expected, atol=1.0e-5)
+
+    @pytest.mark.parametrize("metric", ["cos", "l2"])
+    def test_cached_norms_and_preallocated_output(self, metric: str) -> None:
+        matrix_function, _ = distance_matrix_metrics[metric]
+        norms = vector_norms(CANDIDATES)
+        out = np.zeros((len(QUERIES), len(CANDIDATES)), dtype=np.float32)
+        result = matrix_function(QUERIES, CANDIDATES, norms, out)
+        assert result is out
+        assert np.allclose(out, matrix_function(QUERIES, CANDIDATES, None, None))
+
+    def test_wrong_output_shape(self) -> None:
+        matrix_function, _ = distance_matrix_metrics["dot"]
+        with pytest.raises(ValueError):
+            matrix_function(
+                QUERIES, CANDIDATES, None, np.zeros((1, 1), dtype=np.float32)
+            )
+
+    def test_similarity_to_distance(self) -> None:
+        # the CQL similarity functions, as documented
+        query = np.array(QUERIES[0], dtype=np.float32)
+        query = query / np.linalg.norm(query)
+        candidates = np.array(CANDIDATES, dtype=np.float32)
+        candidates = candidates / np.linalg.norm(candidates, axis=1)[:, None]
+        dots = candidates @ query
+        squared_l2s = np.sum((candidates - query) ** 2, axis=1)
+        server_scores = {
+            "cos": (1 + dots) / 2,
+            "dot": (1 + dots) / 2,
+            "l2": 1 / (1 + squared_l2s),
+        }
+        for metric, scores in server_scores.items():
+            distance_function, _ = distance_matrix_metrics[metric]
+            assert np.allclose(
+                similarity_to_distance(metric, scores.astype(np.float32)),
+                distance_function(query, candidates, None, None)[0],
+                atol=1e-3,
+            )
+            assert np.allclose(
+                distance_to_similarity(
+                    metric, similarity_to_distance(metric, scores.astype(np.float32))
+                ),
+                scores,
+                atol=1e-3,
+            )
+        with pytest.raises(ValueError):
+            similarity_to_distance("l1", np.ones(1, dtype=np.float32))
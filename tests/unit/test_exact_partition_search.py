@@ -0,0 +1,181 @@
+"""
+Exact (brute-force) search in small partitions, with partition caching
+"""
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table.cql import MockDBSession
+from cassio.table.tables import ClusteredVectorCassandraTable, VectorCassandraTable
+from cassio.utils.vector.distance_metrics import distance_metrics
+
+VECTORS = {"a": [1.0, 0.0], "b": [0.0, 1.0], "c": [0.8, 0.6]}
+
+
+def _full_rows(
+    cql: str, op_type: Any, args_list: List[Tuple[Any, ...]], concurrency: int
+) -> List[List[Dict[str, Any]]]:
+    return [
+        [
+            {
+                "partition_id": partition_id,
+                "row_id": row_id,
+                "body_blob": row_id,
+                "vector": VECTORS[row_id],
+            }
+        ]
+        for partition_id, row_id in args_list
+    ]
+
+
+class TestExactPartitionSearch:
+    def test_exact_search_cql(self, mock_db_session: MockDBSession) -> None:
+        cvt = ClusteredVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type=["TEXT", "TEXT"],
+        )
+        assert cvt.partition_search([1.0, 0.0], 2, partition_id="P") == []
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT partition_id, row_id, vector FROM k.tn WHERE partition_id = ? LIMIT ?;",  # noqa: E501
+                    ("P", 1001),
+                ),
+            ]
+        )
+        cvt.partition_search([1.0, 0.0], 2, partition_id="P", exact=True)
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT partition_id, row_id, vector FROM k.tn WHERE partition_id = ? ;",  # noqa: E501
+                    ("P",),
+                ),
+            ]
+        )
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+        )
+        with pytest.raises(ValueError):
+            vt.partition_search([1.0, 0.0], 2)
+
+    def test_exact_search_and_cache(self, mock_db_session: MockDBSession) -> None:
+        cvt = ClusteredVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type=["TEXT", "TEXT"],
+            exact_search_max_rows=3,
+            partition_cache_max_entries=4,
+        )
+        scan_rows = [
+            {"partition_id": "P", "row_id": row_id, "vector": vector}
+            for row_id, vector in VECTORS.items()
+        ]
+        with patch.object(
+            cvt, "execute_cql", return_value=scan_rows
+        ) as scan_mock, patch.object(
+            cvt, "execute_cql_concurrently", side_effect=_full_rows
+        ):
+            results = cvt.partition_search([1.0, 0.1], 2, partition_id="P")
+            assert [r["row_id"] for r in results] == ["a", "c"]
+            assert results[0]["distance"] > results[1]["distance"]
+            # the partition vectors are now cached
+            results_t = cvt.partition_search(
+                [1.0, 0.1], 3, partition_id="P", metric_threshold=0.5
+            )
+            assert [r["row_id"] for r in results_t] == ["a", "c"]
+            assert scan_mock.call_count == 1
+        # writes invalidate the cache
+        assert cvt.partition_cache is not None
+        assert len(cvt.partition_cache) == 1
+        cvt.put(partition_id="P", row_id="d", vector=[1.0, 1.0])
+        assert len(cvt.partition_cache) == 0
+
+    def test_threshold_on_final_distances(self, mock_db_session: MockDBSession) -> None:
+        cvt = ClusteredVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type=["TEXT", "TEXT"],
+        )
+        scan_rows = [
+            {"partition_id": "P", "row_id": row_id, "vector": vector}
+            for row_id, vector in VECTORS.items()
+        ]
+        # (the float32 distance of "c" is a hair below this one)
+        query = [0.997, 0.981]
+        c_distance = float(distance_metrics["cos"][0]([VECTORS["c"]], query)[0])
+        with patch.object(cvt, "execute_cql", return_value=scan_rows), patch.object(
+            cvt, "execute_cql_concurrently", side_effect=_full_rows
+        ):
+            results = cvt.partition_search(
+                query, 2, partition_id="P", exact=True, metric_threshold=c_distance
+            )
+            assert [r["row_id"] for r in results] == ["c"]
+            assert results[0]["distance"] == c_distance
+            results = cvt.partition_search(query, 1, partition_id="P", exact=True)
+            assert [r["row_id"] for r in results] == ["c"]
+
+    def test_auto_fallback_to_ann(self, mock_db_session: MockDBSession) -> None:
+        cvt = ClusteredVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type=["TEXT", "TEXT"],
+            exact_search_max_rows=2,
+        )
+        scan_rows = [
+            {"partition_id": "P", "row_id": row_id, "vector": vector}
+            for row_id, vector in VECTORS.items()
+        ]
+        with patch.object(cvt, "execute_cql", return_value=scan_rows), patch.object(
+            cvt, "metric_ann_search", return_value=[]
+        ) as ann_mock:
+            assert cvt.partition_search([1.0, 0.1], 2, partition_id="P") == []
+            assert ann_mock.call_count == 1
+
+    def test_exact_after_auto_fallback(self, mock_db_session: MockDBSession) -> None:
+        cvt = ClusteredVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type=["TEXT", "TEXT"],
+            exact_search_max_rows=2,
+            partition_cache_max_entries=4,
+        )
+        scan_rows = [
+            {"partition_id": "P", "row_id": row_id, "vector": vector}
+            for row_id, vector in VECTORS.items()
+        ]
+        with patch.object(
+            cvt, "execute_cql", return_value=scan_rows
+        ) as scan_mock, patch.object(
+            cvt, "execute_cql_concurrently", side_effect=_full_rows
+        ), patch.object(
+            cvt, "metric_ann_search", return_value=[]
+        ) as ann_mock:
+            # "auto" caches the partition as too large for exact search...
+            assert cvt.partition_search([1.0, 0.1], 2, partition_id="P") == []
+            assert ann_mock.call_count == 1
+            # ... which does not turn an exact=True search into ANN
+            results = cvt.partition_search([1.0, 0.1], 2, partition_id="P", exact=True)
+            assert [r["row_id"] for r in results] == ["a", "c"]
+            assert ann_mock.call_count == 1
+            assert scan_mock.call_count == 2
+            # the full scan, now cached, serves later searches in both modes
+            cvt.partition_search([1.0, 0.1], 2, partition_id="P", exact=True)
+            cvt.partition_search([1.0, 0.1], 2, partition_id="P")
+            assert scan_mock.call_count == 2
+            assert ann_mock.call_count == 1
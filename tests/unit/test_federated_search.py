@@ -0,0 +1,58 @@
+"""
+Federated ANN search, merging of results from several tables
+"""
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table.cql import MockDBSession, MockResponseFuture
+from cassio.table.tables import VectorCassandraTable
+from cassio.vector import FederatedVectorSearch
+
+
+def _table(session: MockDBSession, name: str) -> VectorCassandraTable:
+    return VectorCassandraTable(
+        session=session,
+        keyspace="k",
+        table=name,
+        vector_dimension=2,
+        primary_key_type="TEXT",
+    )
+
+
+def _future(rows: List[Any]) -> Any:
+    return lambda *pargs, **kwargs: MockResponseFuture(rows)
+
+
+class TestFederatedVectorSearch:
+    def test_federated_merge(self, mock_db_session: MockDBSession) -> None:
+        t1 = _table(mock_db_session, "t1")
+        t2 = _table(mock_db_session, "t2")
+        rows1 = [
+            {"row_id": "a", "body_blob": "", "vector": [1.0, 0.0]},
+            {"row_id": "b", "body_blob": "", "vector": [0.0, 1.0]},
+        ]
+        rows2 = [{"row_id": "c", "body_blob": "", "vector": [0.8, 0.6]}]
+        with patch.object(t1, "execute_cql_async", _future(rows1)), patch.object(
+            t2, "execute_cql_async", _future(rows2)
+        ):
+            results = FederatedVectorSearch([t1, t2]).search([1.0, 0.0], n=2)
+            assert [(r["row_id"], r["source_table"]) for r in results] == [
+                ("a", "k.t1"),
+                ("c", "k.t2"),
+            ]
+            assert results[0]["score"] == pytest.approx(1.0)
+            assert results[1]["score"] == pytest.approx(0.9)
+            # weights can reverse the ranking
+            results_w = FederatedVectorSearch([t1, t2], weights=[0.5, 1.0]).search(
+                [1.0, 0.0], n=3
+            )
+            assert [r["row_id"] for r in results_w] == ["c", "a", "b"]
+
+    def test_federated_invalid(self, mock_db_session: MockDBSession) -> None:
+        t1 = _table(mock_db_session, "t1")
+        with pytest.raises(ValueError):
+            FederatedVectorSearch([t1], metric="l1")
+        with pytest.raises(ValueError):
+            FederatedVectorSearch([t1], weights=[1.0, 2.0])
@@ -0,0 +1,106 @@
+"""
+Streaming, primary-key-only find_and_delete_entries
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Set
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table.cql import MockDBSession
+from cassio.table.tables import ClusteredMetadataCassandraTable
+
+KEY_ROWS: List[Dict[str, Any]] = [
+    {"partition_id": "p0", "row_id": f"r{i}"} for i in range(7)
+]
+
+
+def _make_table(mock_db_session: MockDBSession) -> ClusteredMetadataCassandraTable:
+    return ClusteredMetadataCassandraTable(
+        session=mock_db_session,
+        keyspace="k",
+        table="tn",
+        skip_provisioning=True,
+    )
+
+
+class TestFindAndDelete:
+    def test_find_primary_keys_cql(self, mock_db_session: MockDBSession) -> None:
+        cmt = _make_table(mock_db_session)
+        cql, vals = cmt._get_find_primary_keys_cql(
+            5, partition_id="p0", metadata={"a": "b"}
+        )
+        assert MockDBSession.normalize_cql_statement(cql) == (
+            MockDBSession.normalize_cql_statement(
+                "SELECT partition_id, row_id FROM {table_fqname} "
+                "WHERE metadata_s[%s] = %s AND partition_id = %s LIMIT %s;"
+            )
+        )
+        assert vals == ("a", "b", "p0", 5)
+        cql_nolimit, vals_nolimit = cmt._get_find_primary_keys_cql(None)
+        assert "LIMIT" not in cql_nolimit
+        assert vals_nolimit == tuple()
+
+    def test_find_and_delete_entries(self, mock_db_session: MockDBSession) -> None:
+        cmt = _make_table(mock_db_session)
+        num_statements = len(mock_db_session.statements)
+        with patch.object(cmt, "execute_cql", return_value=KEY_ROWS) as mock_read:
+            num_deleted = cmt.find_and_delete_entries(batch_size=3, metadata={"a": "b"})
+        assert mock_read.call_count == 1
+        assert num_deleted == 7
+        deletes = mock_db_session.last(7)
+        assert len(mock_db_session.statements) == num_statements + 7
+        assert deletes[0] == (
+            "delete from k.tn where partition_id = ? and row_id = ?",
+            ("p0", "r0"),
+        )
+        # disjunctions: one sub-query after the other
+        with patch.object(cmt, "execute_cql", return_value=KEY_ROWS[:2]) as mock_read:
+            num_deleted = cmt.find_and_delete_entries(
+                metadata={"a": {"$in": ["b", "c"]}}
+            )
+        assert mock_read.call_count == 2
+        assert num_deleted == 4
+
+    @pytest.mark.asyncio
+    async def test_afind_and_delete_entries(
+        self, mock_db_session: MockDBSession
+    ) -> None:
+        cmt = _make_table(mock_db_session)
+
+        async def _pages(*pargs: Any, **kwargs: Any) -> AsyncIterator[List[Any]]:
+            yield KEY_ROWS[:4]
+            yield KEY_ROWS[4:]
+
+        num_statements = len(mock_db_session.statements)
+        with patch.object(cmt, "aexecute_cql_pages", side_effect=_pages):
+            num_deleted = await cmt.afind_and_delete_entries(batch_size=2)
+        assert num_deleted == 7
+        assert len(mock_db_session.statements) == num_statements + 7
+
+    @pytest.mark.asyncio
+    async def test_afind_and_delete_entries_failing(
+        self, mock_db_session: MockDBSession
+    ) -> None:
+        cmt = _make_table(mock_db_session)
+        cancelled: Set[str] = set()
+
+        async def _pages(*pargs: Any, **kwargs: Any) -> AsyncIterator[List[Any]]:
+            yield KEY_ROWS
+
+        async def _adelete(partition_id: str, row_id: str) -> None:
+            if row_id == "r1":
+                raise RuntimeError("delete failed")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.add(row_id)
+                raise
+
+        with patch.object(cmt, "aexecute_cql_pages", side_effect=_pages), patch.object(
+            cmt, "adelete", side_effect=_adelete
+        ):
+            with pytest.raises(RuntimeError):
+                await cmt.afind_and_delete_entries(batch_size=3)
+        # the deletions in flight at the time of the error were cancelled
+        assert cancelled == {"r0", "r2"}
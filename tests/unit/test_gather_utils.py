@@ -0,0 +1,87 @@
+"""
+Bounded, time-budgeted gathering of concurrent queries
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+import pytest
+
+from cassio.table.cql import MockResponseFuture
+from cassio.table.utils import agather_bounded, gather_response_futures
+
+
+class DelayedResponseFuture(MockResponseFuture):
+    """Completes from another thread after a delay."""
+
+    def __init__(self, rows: List[Any], delay: float, error: bool = False):
+        super().__init__(rows)
+        self.delay = delay
+        self.error = error
+
+    def add_callbacks(
+        self,
+        callback: Callable[..., Any],
+        errback: Callable[..., Any],
+        callback_args: Any = tuple(),
+        callback_kwargs: Optional[Any] = None,
+        errback_args: Any = tuple(),
+        errback_kwargs: Optional[Any] = None,
+    ) -> None:
+        def _complete() -> None:
+            time.sleep(self.delay)
+            if self.error:
+                errback(ValueError("boom"), *errback_args)
+            else:
+                callback(self.rows, *callback_args)
+
+        threading.Thread(target=_complete, daemon=True).start()
+
+
+class TestGatherUtils:
+    def test_gather_response_futures(self) -> None:
+        def _launcher(value: int, delay: float) -> Callable[[], MockResponseFuture]:
+            return lambda: DelayedResponseFuture([value], delay)
+
+        launchers = [_launcher(i, 0.01 * (4 - i)) for i in range(4)]
+        results = gather_response_futures(launchers, concurrency=4)
+        assert results == [[0], [1], [2], [3]]
+        # with a per-query timeout, the slow one is dropped
+        slow_fast = [
+            lambda: DelayedResponseFuture(["slow"], 0.5),
+            lambda: DelayedResponseFuture(["fast"], 0.0),
+        ]
+        assert gather_response_futures(
+            slow_fast, concurrency=2, timeouts=[0.1, 0.1]
+        ) == [None, ["fast"]]
+        # with an overall budget and serial execution, the second never starts
+        started = time.monotonic()
+        assert gather_response_futures(
+            slow_fast, concurrency=1, timeout_seconds=0.1
+        ) == [None, None]
+        assert time.monotonic() - started < 0.4
+        with pytest.raises(ValueError):
+            gather_response_futures(
+                [lambda: DelayedResponseFuture([], 0.0, error=True)], concurrency=1
+            )
+
+    @pytest.mark.asyncio
+    async def test_agather_bounded(self) -> None:
+        async def _value(value: str, delay: float) -> str:
+            await asyncio.sleep(delay)
+            return value
+
+        results = await agather_bounded(
+            [lambda: _value("slow", 0.5), lambda: _value("fast", 0.0)],
+            concurrency=2,
+            timeouts=[0.1, None],
+        )
+        assert results == [None, "fast"]
+        results_b = await agather_bounded(
+            [lambda: _value("slow", 0.5), lambda: _value("fast", 0.0)],
+            concurrency=1,
+            timeout_seconds=0.1,
+        )
+        assert results_b == [None, None]
+        assert await agather_bounded([], concurrency=1) == []
@@ -0,0 +1,158 @@
+"""
+Concurrent multi-partition reads and the merging of their rows
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table import ClusteredCassandraTable
+from cassio.table.bucketing import CountBucketing
+from cassio.table.cql import MockDBSession
+
+PARTITION_ROWS = {
+    "p0": ["r7", "r4", "r1"],
+    "p1": ["r8", "r5"],
+    "p2": ["r9", "r6", "r3"],
+}
+
+
+def _fake_result_sets(
+    statements: List[Tuple[str, Tuple[Any, ...]]], **kwargs: Any
+) -> List[List[Any]]:
+    return [
+        [
+            {"partition_id": partition_id, "row_id": row_id, "body_blob": "b"}
+            for row_id in PARTITION_ROWS[partition_id][:limit]
+        ]
+        for _, (partition_id, limit) in statements
+    ]
+
+
+class TestGetPartitions:
+    def test_get_partitions_cql(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            skip_provisioning=True,
+        )
+        table.get_partitions(["p0", "p1"], n_per_partition=2)
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn WHERE partition_id = ? LIMIT ?;",
+                    ("p0", 2),
+                ),
+                (
+                    "SELECT * FROM k.tn WHERE partition_id = ? LIMIT ?;",
+                    ("p1", 2),
+                ),
+            ]
+        )
+        # a single prepared statement
+        assert len(table._prepared_statements) == 1
+
+    def test_get_partitions_merges(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            ordering_in_partition="DESC",
+            skip_provisioning=True,
+        )
+        p_ids = ["p0", "p1", "p2"]
+        with patch.object(
+            table, "execute_mixed_cql_concurrently", side_effect=_fake_result_sets
+        ):
+            by_partition = table.get_partitions(p_ids, n_per_partition=2)
+            assert isinstance(by_partition, dict)
+            assert {
+                p_id: [row["row_id"] for row in rows]
+                for p_id, rows in by_partition.items()
+            } == {"p0": ["r7", "r4"], "p1": ["r8", "r5"], "p2": ["r9", "r6"]}
+            interleaved = table.get_partitions(p_ids, 3, merge="interleave")
+            assert [row["row_id"] for row in interleaved] == [
+                "r7",
+                "r8",
+                "r9",
+                "r4",
+                "r5",
+                "r6",
+                "r1",
+                "r3",
+            ]
+            by_clustering = table.get_partitions(p_ids, 3, merge="by_clustering")
+            assert [row["row_id"] for row in by_clustering] == [
+                f"r{i}" for i in range(9, 0, -1) if i != 2
+            ]
+        with patch.object(
+            table, "aexecute_mixed_cql_concurrently", side_effect=_fake_result_sets
+        ):
+            a_by_clustering = asyncio.run(
+                table.aget_partitions(p_ids, 3, merge="by_clustering")
+            )
+            assert a_by_clustering == by_clustering
+        with pytest.raises(ValueError):
+            table.get_partitions(p_ids, merge="shuffle")
+
+    def test_get_partitions_bucketed(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            ordering_in_partition="DESC",
+            bucketing=CountBucketing(rows_per_bucket=2),
+            skip_provisioning=True,
+        )
+        bucket_rows: Dict[str, Dict[int, List[str]]] = {
+            "p0": {1: ["r7"], 0: ["r4", "r1"]},
+            "p1": {0: ["r8", "r5"]},
+            "p2": {2: ["r9"], 1: ["r6"], 0: ["r3"]},
+        }
+        rounds: List[List[Tuple[str, Tuple[Any, ...]]]] = []
+
+        def _fake_mixed(
+            statements: List[Tuple[str, Tuple[Any, ...]]], **kwargs: Any
+        ) -> List[List[Any]]:
+            rounds.append(statements)
+            if "_buckets" in statements[0][0]:
+                return [
+                    [{"bucket": bucket} for bucket in bucket_rows[partition_id]]
+                    for _, (partition_id,) in statements
+                ]
+            return [
+                [
+                    {"partition_id": partition_id, "bucket": bucket, "row_id": row_id}
+                    for row_id in bucket_rows[partition_id][bucket][:limit]
+                ]
+                for _, (bucket, partition_id, limit) in statements
+            ]
+
+        with patch.object(
+            table, "execute_mixed_cql_concurrently", side_effect=_fake_mixed
+        ), patch.object(table, "execute_cql") as single_mock:
+            by_partition = table.get_partitions(["p0", "p1", "p2"], n_per_partition=2)
+        assert by_partition == {
+            "p0": [{"partition_id": "p0", "row_id": r} for r in ["r7", "r4"]],
+            "p1": [{"partition_id": "p1", "row_id": r} for r in ["r8", "r5"]],
+            "p2": [{"partition_id": "p2", "row_id": r} for r in ["r9", "r6"]],
+        }
+        # registry, then two rounds of bucket reads (p1 is full after one)
+        assert [len(statements) for statements in rounds] == [3, 3, 2]
+        assert [args[:2] for _, args in rounds[2]] == [(0, "p0"), (1, "p2")]
+        assert single_mock.call_count == 0
+
+    def test_get_partitions_list_ids(self, mock_db_session: MockDBSession) -> None:
+        table = ClusteredCassandraTable(
+            "tn",
+            session=mock_db_session,
+            keyspace="k",
+            primary_key_type=["TEXT", "TEXT", "TEXT"],
+            num_partition_keys=2,
+            skip_provisioning=True,
+        )
+        by_partition = table.get_partitions([["a", "b"], ["a", "c"]])
+        assert by_partition == {("a", "b"): [], ("a", "c"): []}
@@ -22,3 +22,12 @@ class TestImports:
 
     def test_import_vector(self) -> None:
         from cassio.vector import VectorTable  # noqa: F401
+
+    def test_import_cache(self) -> None:
+        from cassio.cache import SemanticCache  # noqa: F401
+
+    def test_import_local_replica(self) -> None:
+        from cassio.vector import LocalVectorReplica  # noqa: F401
+
+    def test_import_federated(self) -> None:
+        from cassio.vector import FederatedVectorSearch  # noqa: F401
@@ -0,0 +1,108 @@
+"""
+Batched embedding-and-write ingestion pipeline
+"""
+import threading
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table.cql import MockDBSession
+from cassio.table.ingestion import IngestionError, default_row_id
+from cassio.table.tables import MetadataVectorCassandraTable
+
+TEXTS = [f"text {i}" for i in range(7)]
+
+
+def _embed(texts: List[str]) -> List[List[float]]:
+    return [[float(len(text)), float(text[-1])] for text in texts]
+
+
+def _make_table(mock_db_session: MockDBSession) -> MetadataVectorCassandraTable:
+    return MetadataVectorCassandraTable(
+        session=mock_db_session,
+        keyspace="k",
+        table="tn",
+        vector_dimension=2,
+        primary_key_type="TEXT",
+    )
+
+
+class TestIngestion:
+    def test_ingest(self, mock_db_session: MockDBSession) -> None:
+        mvt = _make_table(mock_db_session)
+        embedded_batches: List[List[str]] = []
+
+        def _recording_embed(texts: List[str]) -> List[List[float]]:
+            embedded_batches.append(texts)
+            return _embed(texts)
+
+        num_statements = len(mock_db_session.statements)
+        items = TEXTS[:-1] + [{"body_blob": TEXTS[-1], "metadata": {"a": "b"}}]
+        report = mvt.ingest(items, _recording_embed, batch_size=3, max_in_flight=2)
+        assert embedded_batches == [TEXTS[0:3], TEXTS[3:6], TEXTS[6:7]]
+        assert report.num_written == 7
+        assert report.num_batches == 3
+        assert report.resume_from == 7
+        inserts = mock_db_session.statements[num_statements:]
+        assert len(inserts) == 7
+        assert default_row_id(TEXTS[0]) in inserts[0][1]
+        assert [6.0, 0.0] in inserts[0][1]
+        assert {"a": "b"} in inserts[-1][1]
+
+    def test_ingest_resume(self, mock_db_session: MockDBSession) -> None:
+        mvt = _make_table(mock_db_session)
+
+        def _failing_embed(texts: List[str]) -> List[List[float]]:
+            if TEXTS[4] in texts:
+                raise RuntimeError("model unavailable")
+            return _embed(texts)
+
+        with pytest.raises(IngestionError) as exc_info:
+            mvt.ingest(TEXTS, _failing_embed, batch_size=2)
+        report = exc_info.value.report
+        assert report.num_written == 4
+        assert report.resume_from == 4
+        # resuming only embeds and writes the rest
+        num_statements = len(mock_db_session.statements)
+        resumed = mvt.ingest(TEXTS, _embed, batch_size=2, start_from=4)
+        assert resumed.num_written == 3
+        assert len(mock_db_session.statements) == num_statements + 3
+
+    def test_ingest_write_raising(self, mock_db_session: MockDBSession) -> None:
+        mvt = _make_table(mock_db_session)
+        errors: List[IngestionError] = []
+
+        def _run_ingest() -> None:
+            try:
+                mvt.ingest(TEXTS, _embed, batch_size=2, max_in_flight=2)
+            except IngestionError as exc:
+                errors.append(exc)
+
+        # put_async raising before returning a future must not leak its slot
+        with patch.object(mvt, "put_async", side_effect=TypeError("bad row")):
+            ingest_thread = threading.Thread(target=_run_ingest)
+            ingest_thread.start()
+            ingest_thread.join(timeout=5)
+        assert not ingest_thread.is_alive()
+        assert len(errors) == 1
+        assert errors[0].report.num_written == 0
+        # items cannot carry their own vector
+        with pytest.raises(IngestionError):
+            mvt.ingest([{"body_blob": "t", "vector": [1.0, 2.0]}], _embed)
+
+    @pytest.mark.asyncio
+    async def test_aingest(self, mock_db_session: MockDBSession) -> None:
+        mvt = _make_table(mock_db_session)
+
+        async def _async_embed(texts: List[str]) -> List[List[float]]:
+            return _embed(texts)
+
+        num_statements = len(mock_db_session.statements)
+        report = await mvt.aingest(TEXTS, _async_embed, batch_size=3, start_from=2)
+        assert report.num_written == 5
+        assert report.resume_from == 7
+        assert len(mock_db_session.statements) == num_statements + 5
+        # a plain embedding function runs in a worker thread
+        report = await mvt.aingest(TEXTS, _embed, batch_size=4)
+        assert report.num_written == 7
@@ -0,0 +1,169 @@
+"""
+Local (in-process) replica of a vector table: loading, filtering, thresholds
+"""
+import os
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from cassio.table.cql import MockDBSession
+from cassio.table.query import Predicate, PredicateOperator
+from cassio.table.tables import MetadataVectorCassandraTable
+from cassio.vector import LocalVectorReplica
+from cassio.vector import local_replica
+
+RAW_ROWS: List[Dict[str, Any]] = [
+    {
+        "row_id": "a",
+        "body_blob": "A",
+        "vector": [1.0, 0.0],
+        "attributes_blob": None,
+        "metadata_s": {"tag": "x", "n": "1.0"},
+    },
+    {
+        "row_id": "b",
+        "body_blob": "B",
+        "vector": [0.0, 1.0],
+        "attributes_blob": None,
+        "metadata_s": {"tag": "y", "n": "2.0"},
+    },
+    {
+        "row_id": "c",
+        "body_blob": "C",
+        "vector": [0.8, 0.6],
+        "attributes_blob": None,
+        "metadata_s": {"tag": "x", "n": "3.0"},
+    },
+    {
+        "row_id": "d",
+        "body_blob": "D",
+        "vector": None,
+        "attributes_blob": None,
+        "metadata_s": {"tag": "x"},
+    },
+]
+
+
+def _replica(
+    mock_db_session: MockDBSession,
+    raw_rows: List[Dict[str, Any]],
+    mmap_path: Optional[str] = None,
+) -> LocalVectorReplica:
+    table = MetadataVectorCassandraTable(
+        session=mock_db_session,
+        keyspace="k",
+        table="tn",
+        vector_dimension=2,
+        primary_key_type="TEXT",
+        skip_provisioning=True,
+    )
+    with patch.object(
+        table, "execute_cql", return_value=[dict(row) for row in raw_rows]
+    ):
+        return LocalVectorReplica(table, mmap_path=mmap_path)
+
+
+class TestLocalVectorReplica:
+    def test_empty_table(self, mock_db_session: MockDBSession) -> None:
+        replica = _replica(mock_db_session, [])
+        assert len(replica) == 0
+        assert replica._snapshot.norms.shape == (0,)
+        assert replica.ann_search([1.0, 0.0], 3) == []
+        assert replica.metric_ann_search([1.0, 0.0], 3, "cos", 0.5) == []
+
+    def test_filters(self, mock_db_session: MockDBSession) -> None:
+        replica = _replica(mock_db_session, RAW_ROWS)
+        # the row without vector is not loaded
+        assert len(replica) == 3
+        results = replica.ann_search([1.0, 0.0], 3, metadata={"tag": "x"})
+        assert [row["row_id"] for row in results] == ["a", "c"]
+        assert all("distance" not in row for row in results)
+        assert results[0]["metadata"] == {"tag": "x", "n": "1.0"}
+        # non-string values match the indexed, stringified, metadata
+        results_n = replica.ann_search([1.0, 0.0], 3, metadata={"n": 2})
+        assert [row["row_id"] for row in results_n] == ["b"]
+        results_p = replica.ann_search(
+            [1.0, 0.0], 3, metadata={"n": Predicate(PredicateOperator.GT, "1.0")}
+        )
+        assert [row["row_id"] for row in results_p] == ["c", "b"]
+        assert [
+            row["row_id"] for row in replica.ann_search([1.0, 0.0], 3, row_id="b")
+        ] == ["b"]
+        assert replica.ann_search([1.0, 0.0], 3, metadata={"missing": "z"}) == []
+        with pytest.raises(ValueError):
+            replica.ann_search([1.0, 0.0], 3, no_such_field="z")
+        with pytest.raises(ValueError):
+            replica.ann_search([1.0, 0.0], 3, body_search="A")
+
+    def test_threshold(self, mock_db_session: MockDBSession) -> None:
+        replica = _replica(mock_db_session, RAW_ROWS)
+        results = replica.metric_ann_search([1.0, 0.0], 3, "cos", 0.5)
+        assert [row["row_id"] for row in results] == ["a", "c"]
+        assert results[0]["distance"] == pytest.approx(1.0)
+        assert results[1]["distance"] == pytest.approx(0.8)
+        # the threshold applies before n
+        top = replica.metric_ann_search([1.0, 0.0], 1, "cos", 0.5)
+        assert [row["row_id"] for row in top] == ["a"]
+        assert replica.metric_ann_search([1.0, 0.0], 3, "cos", 1.5) == []
+        # distances (lower is nearer) keep the rows within the threshold
+        l2_results = replica.metric_ann_search([1.0, 0.0], 3, "l2", 0.7)
+        assert [row["row_id"] for row in l2_results] == ["a", "c"]
+
+    def test_numeric_predicates(self, mock_db_session: MockDBSession) -> None:
+        raw_rows = [
+            {
+                "row_id": row_id,
+                "body_blob": None,
+                "vector": [1.0, float(i)],
+                "attributes_blob": None,
+                "metadata_s": metadata_s,
+            }
+            for i, (row_id, metadata_s) in enumerate(
+                [
+                    ("r9", {"n": "9.0"}),
+                    ("r10", {"n": "10.0"}),
+                    ("rx", {"n": "x"}),
+                    ("r_", {"other": "1.0"}),
+                ]
+            )
+        ]
+        replica = _replica(mock_db_session, raw_rows)
+
+        def _found(predicate: Predicate) -> List[str]:
+            hits = replica.ann_search([1.0, 0.0], 5, metadata={"n": predicate})
+            return sorted(row["row_id"] for row in hits)
+
+        # compared as numbers (not as strings), with int and float operands
+        assert _found(Predicate(PredicateOperator.GT, 9)) == ["r10"]
+        assert _found(Predicate(PredicateOperator.LT, 9.5)) == ["r9"]
+        assert _found(Predicate(PredicateOperator.GTE, "9.0")) == ["r10", "r9"]
+        assert _found(Predicate(PredicateOperator.EQ, 10)) == ["r10"]
+        assert _found(Predicate(PredicateOperator.LTE, 8)) == []
+        with pytest.raises(ValueError):
+            _found(Predicate(PredicateOperator.GT, "x"))
+
+    def test_matrix_growth(self, mock_db_session: MockDBSession, tmp_path: Any) -> None:
+        raw_rows = [
+            {
+                "row_id": f"r{i}",
+                "body_blob": None,
+                "vector": [float(i), 1.0, -1.0],
+                "attributes_blob": None,
+                "metadata_s": {"parity": str(i % 2)},
+            }
+            for i in range(11)
+        ]
+        mmap_path = os.path.join(str(tmp_path), "replica.bin")
+        with patch.object(local_replica, "INITIAL_MATRIX_ROWS", 2):
+            in_memory = _replica(mock_db_session, raw_rows)
+            mapped = _replica(mock_db_session, raw_rows, mmap_path=mmap_path)
+        for replica in [in_memory, mapped]:
+            assert replica._snapshot.matrix.shape == (11, 3)
+            assert replica._snapshot.matrix[:, 0].tolist() == [
+                float(i) for i in range(11)
+            ]
+            hits = replica.ann_search([10.0, 1.0, -1.0], 2, metadata={"parity": "1"})
+            assert [row["row_id"] for row in hits] == ["r9", "r7"]
+            assert hits[0]["vector"] == [9.0, 1.0, -1.0]
+        assert os.path.getsize(mmap_path) == 11 * 3 * 4
@@ -0,0 +1,63 @@
+"""
+Metadata codec: value coercion, indexed/attributes split and reassembly
+"""
+import json
+import math
+from unittest.mock import patch
+
+from cassio.table.metadata_codec import (
+    HAS_ORJSON,
+    MetadataCodec,
+    coerce_metadata_value,
+    json_dumps_sorted,
+    json_loads,
+)
+from cassio.table.table_types import MetadataIndexingMode
+
+
+class TestMetadataCodec:
+    def test_coerce_metadata_value(self) -> None:
+        class MyInt(int):
+            pass
+
+        # same strings as the JSON encoding of the (float-cast) values
+        for int_value in [1, -3, 10**17]:
+            assert coerce_metadata_value(int_value) == json.dumps(float(int_value))
+        for value in [2.5, 1e16, 1e-7, True, False, None, math.inf]:
+            assert coerce_metadata_value(value) == json.dumps(value)
+        assert coerce_metadata_value("x") == "x"
+        assert coerce_metadata_value(MyInt(2)) == "2.0"
+        assert coerce_metadata_value(("a", 1)) == "('a', 1)"
+
+    def test_json_backend(self) -> None:
+        md = {"b": "2", "a": "è", "c": {"z": 1, "y": [1, 2]}}
+        serialized = json_dumps_sorted(md)
+        assert serialized.index('"a"') < serialized.index('"b"')
+        assert " " not in serialized
+        assert json_loads(serialized) == md
+        # non-string keys are handled as in the json module
+        assert json_loads(json_dumps_sorted({1: "x"})) == {"1": "x"}
+
+    def test_json_backends_agree(self) -> None:
+        blob_md = {"b": "2", "a": "è", "e": "😀 \u2028", "c": '\n"', "d": "x/y"}
+        std_serialized = json.dumps(blob_md, separators=(",", ":"), sort_keys=True)
+        # (with orjson, if installed, then with the json module)
+        for has_orjson in sorted({HAS_ORJSON, False}):
+            with patch("cassio.table.metadata_codec.HAS_ORJSON", has_orjson):
+                serialized = json_dumps_sorted(blob_md)
+                assert serialized == std_serialized
+                assert serialized.isascii()
+                assert json_loads(serialized) == blob_md
+
+    def test_split_and_merge(self) -> None:
+        codec = MetadataCodec((MetadataIndexingMode.DEFAULT_TO_SEARCHABLE, {"body"}))
+        indexed, blob = codec.split({"tag": "x", "n": 3, "body": 12})
+        assert indexed == {"tag": "x", "n": 3}
+        assert blob is not None
+        assert json.loads(blob) == {"body": "12.0"}
+        assert codec.merge(blob, {"tag": "x"}) == {"body": "12.0", "tag": "x"}
+        assert codec.merge(None, None) == {}
+        assert codec.split({"tag": "y"}) == ({"tag": "y"}, None)
+        # indexing decisions are cached per field name
+        assert codec.is_indexed("tag") and not codec.is_indexed("body")
+        assert set(codec._indexed_fields) == {"tag", "n", "body"}
@@ -3,6 +3,10 @@ Correct renormalization of multicolumn primary key into schema
 (by which we mean multiple partition- and/or multiple clustering-key)
 """
 
+from unittest.mock import patch
+
+import pytest
+
 from cassio.table import ClusteredCassandraTable, PlainCassandraTable
 from cassio.table.cql import MockDBSession
 from cassio.table.query import Predicate, PredicateOperator
@@ -204,6 +208,121 @@ class TestMulticolumnPrimaryKey:
             ]
         )
 
+    def test_delete_range(self, mock_db_session: MockDBSession) -> None:
+        clu12 = ClusteredCassandraTable(
+            "table",
+            primary_key_type=["PK", "COL1", "COL2"],
+            num_partition_keys=1,
+            session=mock_db_session,
+            keyspace="k",
+            skip_provisioning=True,
+        )
+        clu12.delete_range(partition_id="pk0", row_id=("ri0",))
+        clu12.delete_range(
+            partition_id="pk0", row_id=("ri0", Predicate(PredicateOperator.LT, "x"))
+        )
+        clu12.delete_range_async(
+            partition_id="pk0", row_id=(Predicate(PredicateOperator.GTE, "ri5"),)
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "DELETE FROM k.table WHERE partition_id = ? AND row_id_0 = ?;",
+                    ("pk0", "ri0"),
+                ),
+                (
+                    "DELETE FROM k.table WHERE partition_id = ? AND row_id_0 = ? AND row_id_1 < ?;",  # noqa: E501
+                    ("pk0", "ri0", "x"),
+                ),
+                (
+                    "DELETE FROM k.table WHERE partition_id = ? AND row_id_0 >= ?;",
+                    ("pk0", "ri5"),
+                ),
+            ]
+        )
+        with pytest.raises(ValueError):
+            clu12.delete_range(row_id=("ri0",))
+        with pytest.raises(ValueError):
+            clu12.delete_range(partition_id="pk0")
+        with pytest.raises(ValueError):
+            clu12.delete_range(
+                partition_id="pk0",
+                row_id=(Predicate(PredicateOperator.GTE, "a"), "b"),
+            )
+
+    def test_get_partition_cursors(self, mock_db_session: MockDBSession) -> None:
+        clu11 = ClusteredCassandraTable(
+            "table",
+            primary_key_type=["PK", "COL1"],
+            ordering_in_partition="desc",
+            session=mock_db_session,
+            keyspace="k",
+            skip_provisioning=True,
+        )
+        list(clu11.get_partition(partition_id="pk0", n=2, after="r5"))
+        list(clu11.get_partition(partition_id="pk0", n=2, before="r5"))
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.table WHERE partition_id = ? AND row_id < ? LIMIT ?;",  # noqa: E501
+                    ("pk0", "r5", 2),
+                ),
+                (
+                    "SELECT * FROM k.table WHERE partition_id = ? AND row_id > ? ORDER BY row_id ASC LIMIT ?;",  # noqa: E501
+                    ("pk0", "r5", 2),
+                ),
+            ]
+        )
+        clu12 = ClusteredCassandraTable(
+            "table",
+            primary_key_type=["PK", "COL1", "COL2"],
+            num_partition_keys=1,
+            session=mock_db_session,
+            keyspace="k",
+            skip_provisioning=True,
+        )
+        list(
+            clu12.get_partition(partition_id="pk0", n=3, after=("a", 1), before=("b",))
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.table WHERE partition_id = ? AND (row_id_0, row_id_1) > (?, ?) AND (row_id_0) < (?) LIMIT ?;",  # noqa: E501
+                    ("pk0", "a", 1, "b", 3),
+                ),
+            ]
+        )
+        # pages and their cursors
+        raw_rows = [
+            {"partition_id": "pk0", "row_id_0": "a", "row_id_1": i} for i in range(3)
+        ]
+        with patch.object(clu12, "execute_cql", return_value=raw_rows):
+            page = clu12.get_partition_page(partition_id="pk0", n=3)
+            assert [row["row_id"] for row in page.rows] == [
+                ("a", 0),
+                ("a", 1),
+                ("a", 2),
+            ]
+            assert page.next_cursor == ("a", 2)
+            assert clu12.get_partition_page(partition_id="pk0", n=4).next_cursor is None
+        # backward pages come in reverse clustering order from the DB
+        with patch.object(clu12, "execute_cql", return_value=raw_rows[::-1]):
+            page = clu12.get_partition_page(partition_id="pk0", n=3, before=("b",))
+            assert page.rows[0]["row_id"] == ("a", 0)
+            assert page.next_cursor == ("a", 0)
+        # mixed orderings cannot be paged with multi-column cursors
+        clu12m = ClusteredCassandraTable(
+            "table",
+            primary_key_type=["PK", "COL1", "COL2"],
+            num_partition_keys=1,
+            ordering_in_partition=["ASC", "DESC"],
+            session=mock_db_session,
+            keyspace="k",
+            skip_provisioning=True,
+        )
+        with pytest.raises(ValueError):
+            clu12m.get_partition(partition_id="pk0", n=3, after=("a", 1))
+
     def test_22_pkt_create_table_cql(self, mock_db_session: MockDBSession) -> None:
         ClusteredCassandraTable(
             "table",
@@ -0,0 +1,38 @@
+"""
+Quantized vector codes
+"""
+import numpy as np
+import pytest
+
+from cassio.utils.vector.quantization import (
+    dequantize_vectors,
+    quantize_vector,
+    quantize_vectors,
+)
+
+
+class TestQuantization:
+    def test_int8_roundtrip(self) -> None:
+        vectors = [
+            [0.5, -1.0, 0.25, 0.0],
+            [10.0, 20.0, -30.0, 40.0],
+            [0.0, 0.0, 0.0, 0.0],
+        ]
+        codes = quantize_vectors(vectors, "int8")
+        assert [len(code) for code in codes] == [8, 8, 8]
+        decoded = dequantize_vectors(codes, "int8", 4)
+        assert decoded.dtype == np.float32
+        assert np.allclose(decoded, np.array(vectors), atol=40.0 / 254 + 1e-6)
+        assert quantize_vector(vectors[1], "int8") == codes[1]
+
+    def test_binary_roundtrip(self) -> None:
+        vectors = [[0.5, -1.0, 0.25, 0.0, 3.0, -2.0, 1.0, 1.0, -0.1]]
+        codes = quantize_vectors(vectors, "binary")
+        assert len(codes[0]) == 2
+        decoded = dequantize_vectors(codes, "binary", 9)
+        assert decoded.tolist() == [[1, -1, 1, -1, 1, -1, 1, 1, -1]]
+
+    def test_empty_and_invalid(self) -> None:
+        assert dequantize_vectors([], "int8", 3).shape == (0, 3)
+        with pytest.raises(ValueError):
+            quantize_vectors([[1.0]], "int4")
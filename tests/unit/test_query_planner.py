@@ -0,0 +1,114 @@
+"""
+Statistics-driven planning of metadata-filtered reads
+"""
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from cassio.table.cql import MockDBSession
+from cassio.table.planner import (
+    PARTITION_STRATEGY,
+    SAI_STRATEGY,
+    SPLIT_STRATEGY,
+    MetadataStatistics,
+    plan_metadata_query,
+)
+from cassio.table.tables import ClusteredMetadataCassandraTable, MetadataCassandraTable
+
+# 100 rows: "lang" is almost always "en", "doc_type" is rarely "pdf"
+SAMPLE_ROWS: List[Dict[str, Any]] = [
+    {
+        "row_id": f"r{i}",
+        "body_blob": None,
+        "attributes_blob": None,
+        "metadata_s": {
+            "lang": "en" if i % 10 else "fr",
+            "doc_type": "pdf" if i % 25 == 0 else "html",
+        },
+    }
+    for i in range(100)
+]
+
+
+class TestQueryPlanner:
+    def test_statistics(self) -> None:
+        stats = MetadataStatistics()
+        stats.observe([{"metadata": {"a": 1}}, {"metadata": {"a": 1.0}}, {}])
+        assert stats.sample_size == 3
+        assert stats.selectivity("a", 1) == 2 / 3
+        assert stats.selectivity("a", 2) == 0.5 / 3
+        assert MetadataStatistics().selectivity("a", 1) is None
+
+    def test_plan_metadata_query(self) -> None:
+        stats = MetadataStatistics()
+        stats.observe({"metadata": row["metadata_s"]} for row in SAMPLE_ROWS)
+        md = {"lang": "en", "doc_type": "pdf"}
+        # no statistics: everything in the query
+        assert plan_metadata_query(None, 5, md, {}, False, 1000).strategy == (
+            SAI_STRATEGY
+        )
+        # the unselective condition is checked client-side
+        split_plan = plan_metadata_query(stats, 5, md, {}, False, 1000)
+        assert split_plan.strategy == SPLIT_STRATEGY
+        assert split_plan.server_metadata == {"doc_type": "pdf"}
+        assert split_plan.client_metadata == {"lang": "en"}
+        assert split_plan.fetch_n == 9
+        assert "selectivity 0.9000" in split_plan.explain()
+        # within a partition, unselective filters are not sent at all
+        partition_plan = plan_metadata_query(stats, 5, {"lang": "en"}, {}, True, 1000)
+        assert partition_plan.strategy == PARTITION_STRATEGY
+        assert partition_plan.server_metadata == {}
+        # selective conditions, or too many rows to read: plain SAI query
+        selective = plan_metadata_query(stats, 5, {"doc_type": "pdf"}, {}, False, 1000)
+        assert selective.strategy == SAI_STRATEGY
+        assert plan_metadata_query(stats, 5, md, {}, False, 8).strategy == (
+            SAI_STRATEGY
+        )
+
+    def test_planned_find_entries(self, mock_db_session: MockDBSession) -> None:
+        mt = MetadataCassandraTable(
+            session=mock_db_session, keyspace="k", table="tn", skip_provisioning=True
+        )
+        with patch.object(mt, "execute_cql", return_value=SAMPLE_ROWS):
+            mt.collect_metadata_statistics(sample_size=100)
+        assert "strategy: split" in mt.explain(
+            5, metadata={"lang": "en", "doc_type": "pdf"}
+        )
+        # planned query: only the selective condition, more rows
+        list(mt.find_entries(n=5, metadata={"lang": "en", "doc_type": "pdf"}))
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn WHERE metadata_s[?] = ? LIMIT ?;",
+                    ("doc_type", "pdf", 9),
+                ),
+            ]
+        )
+        # rows are filtered client-side
+        pdf_rows = [
+            row for row in SAMPLE_ROWS if row["metadata_s"]["doc_type"] == "pdf"
+        ]
+        with patch.object(mt, "execute_cql", return_value=pdf_rows):
+            found = list(
+                mt.find_entries(n=5, metadata={"lang": "en", "doc_type": "pdf"})
+            )
+        assert [row["row_id"] for row in found] == ["r25", "r75"]
+
+    def test_partition_plan(self, mock_db_session: MockDBSession) -> None:
+        cmt = ClusteredMetadataCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            partition_id="p0",
+            skip_provisioning=True,
+        )
+        with patch.object(cmt, "execute_cql", return_value=SAMPLE_ROWS):
+            cmt.collect_metadata_statistics()
+        list(cmt.find_entries(n=3, metadata={"lang": "en"}))
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn WHERE partition_id = ? LIMIT ?;",
+                    ("p0", 5),
+                ),
+            ]
+        )
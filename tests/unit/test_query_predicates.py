@@ -4,7 +4,12 @@ Query/predicates 'grammar' unit test
 
 import pytest
 
-from cassio.table.query import Predicate, PredicateOperator
+from cassio.table.query import (
+    Predicate,
+    PredicateOperator,
+    expand_disjunctions,
+    has_disjunctions,
+)
 
 
 class TestQueryPredicates:
@@ -18,3 +23,26 @@ class TestQueryPredicates:
     def test_predicate_wrong_operator(self) -> None:
         with pytest.raises(ValueError):
             Predicate("==", "boh")
+
+    def test_expand_disjunctions(self) -> None:
+        plain = {"metadata": {"a": "1"}, "body_search": ["x", "y"], "n": 3}
+        assert not has_disjunctions(plain)
+        assert expand_disjunctions(plain) == [plain]
+        query = {
+            "metadata": {"$or": [{"a": "1"}, {"b": {"$in": ["2", "3"]}}], "c": "4"},
+            "body_search": {"$or": ["x", ["y", "z"]]},
+        }
+        assert has_disjunctions(query)
+        expanded = expand_disjunctions(query)
+        assert len(expanded) == 6
+        assert {"metadata": {"a": "1", "c": "4"}, "body_search": "x"} in expanded
+        assert {
+            "metadata": {"b": "3", "c": "4"},
+            "body_search": ["y", "z"],
+        } in expanded
+        # an empty $in matches nothing
+        assert expand_disjunctions({"metadata": {"a": {"$in": []}}}) == []
+        with pytest.raises(ValueError):
+            expand_disjunctions(
+                {"metadata": {f"k{i}": {"$in": [1, 2]} for i in range(7)}}
+            )
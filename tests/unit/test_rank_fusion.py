@@ -0,0 +1,29 @@
+"""
+Rank fusion utilities
+"""
+import pytest
+
+from cassio.utils.vector.rank_fusion import (
+    reciprocal_rank_fusion,
+    weighted_score_fusion,
+)
+
+
+class TestRankFusion:
+    def test_reciprocal_rank_fusion(self) -> None:
+        scores = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=1)
+        assert scores == pytest.approx(
+            {"a": 1 / 2 + 1 / 3, "b": 1 / 3, "c": 1 / 4 + 1 / 2}
+        )
+        w_scores = reciprocal_rank_fusion([["a"], ["b"]], weights=[2.0, 1.0], k=0)
+        assert w_scores == {"a": 2.0, "b": 1.0}
+        with pytest.raises(ValueError):
+            reciprocal_rank_fusion([["a"], ["b"]], weights=[1.0])
+
+    def test_weighted_score_fusion(self) -> None:
+        scores = weighted_score_fusion(
+            [{"a": 0.9, "b": 0.5, "c": 0.1}, {"c": 3.0, "d": 1.0}],
+            weights=[1.0, 0.5],
+        )
+        assert scores == pytest.approx({"a": 1.0, "b": 0.5, "c": 0.5, "d": 0.0})
+        assert weighted_score_fusion([{}, {"x": 2.0}]) == {"x": 1.0}
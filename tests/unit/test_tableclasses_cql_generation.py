@@ -2,8 +2,11 @@
 CQL for mixin-based table classes tests
 """
 import json
+from unittest.mock import patch
 
-from cassio.table.cql import MockDBSession
+import pytest
+
+from cassio.table.cql import STANDARD_ANALYZER, MockDBSession
 from cassio.table.query import Predicate, PredicateOperator
 from cassio.table.tables import (
     ClusteredElasticMetadataVectorCassandraTable,
@@ -111,6 +114,280 @@ class TestTableClassesCQLGeneration:
             ]
         )
 
+    def test_metadata_numeric(self, mock_db_session: MockDBSession) -> None:
+        mt = MetadataCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            metadata_numeric=True,
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "CREATE TABLE IF NOT EXISTS k.tn (  row_id TEXT,   body_blob TEXT, attributes_blob TEXT, metadata_s MAP<TEXT,TEXT>, metadata_n MAP<TEXT,DOUBLE>, PRIMARY KEY ( ( row_id )   )) ;",  # noqa: E501
+                    tuple(),
+                ),
+                (
+                    "CREATE CUSTOM INDEX IF NOT EXISTS eidx_metadata_s_tn ON k.tn (ENTRIES(metadata_s)) USING 'org.apache.cassandra.index.sai.StorageAttachedIndex';",  # noqa: E501
+                    tuple(),
+                ),
+                (
+                    "CREATE CUSTOM INDEX IF NOT EXISTS eidx_metadata_n_tn ON k.tn (ENTRIES(metadata_n)) USING 'org.apache.cassandra.index.sai.StorageAttachedIndex';",  # noqa: E501
+                    tuple(),
+                ),
+            ]
+        )
+
+        # numbers (not booleans) also go to metadata_n
+        mt.put(row_id="ROWID", metadata={"price": 3, "tag": "x", "flag": True})
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "INSERT INTO k.tn (attributes_blob, metadata_s, metadata_n, row_id) VALUES (?, ?, ?, ?)  ;",  # noqa: E501
+                    (
+                        None,
+                        {"price": "3.0", "tag": "x", "flag": "true"},
+                        {"price": 3.0},
+                        "ROWID",
+                    ),
+                ),
+            ]
+        )
+
+        # equality stays on metadata_s, ranges go to metadata_n
+        list(
+            mt.find_entries(
+                n=10,
+                metadata={
+                    "tag": "x",
+                    "price": Predicate(PredicateOperator.LT, 10),
+                    "ts": Predicate(PredicateOperator.GTE, 5.5),
+                },
+            )
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn WHERE metadata_s[?] = ? AND metadata_n[?] < ? AND metadata_n[?] >= ? LIMIT ?;",  # noqa: E501
+                    ("tag", "x", "price", 10.0, "ts", 5.5, 10),
+                ),
+            ]
+        )
+
+        # numbers are read back as floats
+        assert mt._normalize_row(
+            {
+                "row_id": "ROWID",
+                "body_blob": None,
+                "attributes_blob": None,
+                "metadata_s": {"price": "3.0", "tag": "x"},
+                "metadata_n": {"price": 3.0},
+            }
+        ) == {
+            "metadata": {"price": 3.0, "tag": "x"},
+            "row_id": "ROWID",
+            "body_blob": None,
+        }
+
+        # ranges need the numeric column
+        mt_s = MetadataCassandraTable(
+            session=mock_db_session, keyspace="k", table="tn", skip_provisioning=True
+        )
+        with pytest.raises(ValueError):
+            mt_s.get(row_id="ROWID", metadata={"price": Predicate("<", 10)})
+
+    def test_promoted_metadata(self, mock_db_session: MockDBSession) -> None:
+        mt = MetadataCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            promoted_metadata={"tenant": "text", "rank": "INT"},
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "CREATE TABLE IF NOT EXISTS k.tn (  row_id TEXT,   body_blob TEXT, attributes_blob TEXT, metadata_s MAP<TEXT,TEXT>, md_tenant TEXT, md_rank INT, PRIMARY KEY ( ( row_id )   )) ;",  # noqa: E501
+                    tuple(),
+                ),
+                (
+                    "CREATE CUSTOM INDEX IF NOT EXISTS eidx_metadata_s_tn ON k.tn (ENTRIES(metadata_s)) USING 'org.apache.cassandra.index.sai.StorageAttachedIndex';",  # noqa: E501
+                    tuple(),
+                ),
+                (
+                    "CREATE CUSTOM INDEX IF NOT EXISTS idx_md_tenant_tn ON k.tn (md_tenant) USING 'org.apache.cassandra.index.sai.StorageAttachedIndex';",  # noqa: E501
+                    tuple(),
+                ),
+                (
+                    "CREATE CUSTOM INDEX IF NOT EXISTS idx_md_rank_tn ON k.tn (md_rank) USING 'org.apache.cassandra.index.sai.StorageAttachedIndex';",  # noqa: E501
+                    tuple(),
+                ),
+            ]
+        )
+
+        # writes: promoted fields go to their column (unset ones to null)
+        mt.put(row_id="ROWID", metadata={"tenant": "acme", "other": "x"})
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "INSERT INTO k.tn (attributes_blob, metadata_s, md_tenant, md_rank, row_id) VALUES (?, ?, ?, ?, ?)  ;",  # noqa: E501
+                    (None, {"other": "x"}, "acme", None, "ROWID"),
+                ),
+            ]
+        )
+
+        # reads: where clauses on the promoted columns, values converted
+        list(
+            mt.find_entries(
+                n=10,
+                metadata={"tenant": "acme", "rank": Predicate("<", 3.0), "other": "x"},
+            )
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn WHERE metadata_s[?] = ? AND md_rank < ? AND md_tenant = ? LIMIT ?;",  # noqa: E501
+                    ("other", "x", 3, "acme", 10),
+                ),
+            ]
+        )
+
+        # rows: promoted columns are folded back into the metadata
+        assert mt._normalize_row(
+            {
+                "row_id": "ROWID",
+                "body_blob": None,
+                "attributes_blob": None,
+                "metadata_s": {"other": "x"},
+                "md_tenant": "acme",
+                "md_rank": None,
+            }
+        ) == {
+            "metadata": {"other": "x", "tenant": "acme"},
+            "row_id": "ROWID",
+            "body_blob": None,
+        }
+
+        with pytest.raises(ValueError):
+            MetadataCassandraTable(
+                session=mock_db_session,
+                keyspace="k",
+                table="tn",
+                promoted_metadata=["not-a-name"],
+            )
+
+    def test_promoted_boolean(self, mock_db_session: MockDBSession) -> None:
+        mt = MetadataCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            promoted_metadata={"flag": "BOOLEAN"},
+            skip_provisioning=True,
+        )
+        for value, converted in [
+            (True, True),
+            ("false", False),
+            ("True", True),
+            (0, False),
+            (1, True),
+            ("0", False),
+        ]:
+            mt.put(row_id="r", metadata={"flag": value})
+            assert mock_db_session.last(1)[0][1][2] is converted
+        for bad_value in ["no", "", 2, 1.5]:
+            with pytest.raises(ValueError):
+                mt.put(row_id="r", metadata={"flag": bad_value})
+        with pytest.raises(ValueError):
+            list(mt.find_entries(n=1, metadata={"flag": "yes"}))
+
+    def test_disjunctive_find_entries(self, mock_db_session: MockDBSession) -> None:
+        mt = MetadataCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            skip_provisioning=True,
+        )
+        list(
+            mt.find_entries(
+                n=5,
+                metadata={"$or": [{"a": "1"}, {"b": "2"}], "c": {"$in": ["x", "y"]}},
+            )
+        )
+        select_a = "SELECT * FROM k.tn WHERE metadata_s[?] = ? AND metadata_s[?] = ? LIMIT ?;"  # noqa: E501
+        mock_db_session.assert_last_equal(
+            [
+                (select_a, ("a", "1", "c", "x", 5)),
+                (select_a, ("a", "1", "c", "y", 5)),
+                (select_a, ("b", "2", "c", "x", 5)),
+                (select_a, ("b", "2", "c", "y", 5)),
+            ]
+        )
+        # results are merged by primary key
+        merged = mt._merge_result_sets_by_primary_key(
+            [
+                [
+                    {"row_id": "r1", "body_blob": "1"},
+                    {"row_id": "r2", "body_blob": "2"},
+                ],
+                [
+                    {"row_id": "r2", "body_blob": "2"},
+                    {"row_id": "r3", "body_blob": "3"},
+                ],
+            ]
+        )
+        assert [row["row_id"] for row in merged] == ["r1", "r2", "r3"]
+
+    def test_disjunctive_ann_search(self, mock_db_session: MockDBSession) -> None:
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+            skip_provisioning=True,
+            body_index_options=[STANDARD_ANALYZER],
+        )
+        result_sets = [
+            [
+                {"row_id": "r1", "body_blob": None, "vector": [1.0, 1.0]},
+                {"row_id": "r2", "body_blob": None, "vector": [0.0, 1.0]},
+            ],
+            [
+                {"row_id": "r3", "body_blob": None, "vector": [1.0, 0.1]},
+                {"row_id": "r1", "body_blob": None, "vector": [1.0, 1.0]},
+            ],
+        ]
+        with patch.object(
+            vt, "execute_mixed_cql_concurrently", return_value=result_sets
+        ) as mock_execute:
+            results = vt.ann_search([1.0, 0.0], 2, body_search={"$or": ["foo", "bar"]})
+        assert len(mock_execute.call_args[0][0]) == 2
+        assert [row["row_id"] for row in results] == ["r3", "r1"]
+
+    def test_disjunctions_rejected(self, mock_db_session: MockDBSession) -> None:
+        vt = ClusteredMetadataVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            skip_provisioning=True,
+        )
+        in_md = {"a": {"$in": ["1", "2"]}}
+        num_statements = len(mock_db_session.statements)
+        # entry points not expanding $in/$or refuse them (no CQL is run)
+        with pytest.raises(ValueError):
+            vt.metric_ann_search(
+                [1.0, 0.0], 2, "cos", server_similarity=True, metadata=in_md
+            )
+        with pytest.raises(ValueError):
+            vt.ann_search_many([[1.0, 0.0]], 2, metadata={"$or": [{"a": "1"}]})
+        with pytest.raises(ValueError):
+            list(vt.get_partition(partition_id="p", metadata=in_md))
+        with pytest.raises(ValueError):
+            vt.get(partition_id={"$in": ["p", "q"]}, row_id="r")
+        assert len(mock_db_session.statements) == num_statements
+        # writes are not affected
+        vt.put(partition_id="p", row_id="r", metadata={"a": {"$in": "x"}})
+
     def test_vector_cassandra_table(self, mock_db_session: MockDBSession) -> None:
         vt = VectorCassandraTable(
             session=mock_db_session,
@@ -935,3 +1212,151 @@ class TestTableClassesCQLGeneration:
                 ),
             ]
         )
+
+    def test_vector_ann_search_many(self, mock_db_session: MockDBSession) -> None:
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+        )
+        results = vt.ann_search_many([[10, 11], [12, 13], [14, 15]], 2, concurrency=2)
+        assert results == [[], [], []]
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn ORDER BY vector ANN OF ?  LIMIT ?;",
+                    ([10, 11], 2),
+                ),
+                (
+                    "SELECT * FROM k.tn ORDER BY vector ANN OF ?  LIMIT ?;",
+                    ([12, 13], 2),
+                ),
+                (
+                    "SELECT * FROM k.tn ORDER BY vector ANN OF ?  LIMIT ?;",
+                    ([14, 15], 2),
+                ),
+            ]
+        )
+        # a single prepared statement serves all queries
+        assert len(vt._prepared_statements) == 1
+        assert vt.ann_search_many([], 2) == []
+
+    def test_vector_quantization(self, mock_db_session: MockDBSession) -> None:
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+            vector_quantization="binary",
+        )
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "CREATE TABLE IF NOT EXISTS k.tn (  row_id TEXT,   body_blob TEXT, vector VECTOR<FLOAT,2>, vector_q BLOB, PRIMARY KEY ( ( row_id )   )) ;",  # noqa: E501
+                    tuple(),
+                ),
+                (
+                    "CREATE CUSTOM INDEX IF NOT EXISTS idx_vector_tn ON k.tn (vector) USING 'org.apache.cassandra.index.sai.StorageAttachedIndex';",  # noqa: E501
+                    tuple(),
+                ),
+            ]
+        )
+        vt.put(row_id="R", body_blob="B", vector=[1.0, -1.0])
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "INSERT INTO k.tn (body_blob, vector, vector_q, row_id) VALUES (?, ?, ?, ?)  ;",  # noqa: E501
+                    ("B", [1.0, -1.0], b"\x80", "R"),
+                ),
+            ]
+        )
+        assert vt.compact_search([1.0, 1.0], n=2) == []
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT row_id, vector_q FROM k.tn ORDER BY vector ANN OF ? LIMIT ?;",
+                    ([1.0, 1.0], 8),
+                ),
+            ]
+        )
+
+    def test_vector_hybrid_search(self, mock_db_session: MockDBSession) -> None:
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+            body_index_options=[STANDARD_ANALYZER],
+        )
+        assert vt.hybrid_search([1.0, 2.0], "some text", k=3) == []
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn ORDER BY vector ANN OF ? LIMIT ?;",
+                    ([1.0, 2.0], 6),
+                ),
+                (
+                    "SELECT * FROM k.tn WHERE body_blob : ? LIMIT ?;",
+                    ("some text", 6),
+                ),
+            ]
+        )
+
+    def test_vector_server_similarity(self, mock_db_session: MockDBSession) -> None:
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+        )
+        results = vt.metric_ann_search(
+            [1.0, 2.0], n=3, metric="dot", server_similarity=True, row_id="R"
+        )
+        assert list(results) == []
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT body_blob, row_id, similarity_dot_product(vector, ?) AS similarity FROM k.tn WHERE row_id = ? ORDER BY vector ANN OF ? LIMIT ?;",  # noqa: E501
+                    ([1.0, 2.0], "R", [1.0, 2.0], 3),
+                ),
+            ]
+        )
+
+    def test_vector_ann_search_partitions(self, mock_db_session: MockDBSession) -> None:
+        cmvt = ClusteredMetadataVectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type=["PUPPA", "TEXT"],
+        )
+        results = cmvt.ann_search_partitions(
+            [1.0, 2.0], 3, partition_ids=["P1", "P2"], metadata={"k": "v"}
+        )
+        assert results == []
+        mock_db_session.assert_last_equal(
+            [
+                (
+                    "SELECT * FROM k.tn WHERE metadata_s[?] = ? AND partition_id = ? ORDER BY vector ANN OF ? LIMIT ?;",  # noqa: E501
+                    ("k", "v", "P1", [1.0, 2.0], 3),
+                ),
+                (
+                    "SELECT * FROM k.tn WHERE metadata_s[?] = ? AND partition_id = ? ORDER BY vector ANN OF ? LIMIT ?;",  # noqa: E501
+                    ("k", "v", "P2", [1.0, 2.0], 3),
+                ),
+            ]
+        )
+        vt = VectorCassandraTable(
+            session=mock_db_session,
+            keyspace="k",
+            table="tn",
+            vector_dimension=2,
+            primary_key_type="TEXT",
+        )
+        with pytest.raises(ValueError):
+            vt.ann_search_partitions([1.0, 2.0], 3, partition_ids=["P1"])
@@ -0,0 +1,108 @@
+"""
+Client-side scoring, thresholding and top-k selection of ANN results
+"""
+
+from typing import Any, Dict, List
+
+from cassio.table.mixins.vector import VectorMixin
+from cassio.utils.vector.mmr import maximal_marginal_relevance
+
+ROWS: List[Dict[str, Any]] = [
+    {"row_id": "a", "vector": [1.0, 0.0]},
+    {"row_id": "b", "vector": [0.0, 1.0]},
+    {"row_id": "c", "vector": [1.0, 1.0]},
+    {"row_id": "d", "vector": [-1.0, 0.1]},
+]
+QUERY = [1.0, 0.2]
+
+
+class TestVectorRanking:
+    def test_full_sort(self) -> None:
+        hits = list(VectorMixin._get_rows_with_distance(ROWS, QUERY, "cos"))
+        assert [hit["row_id"] for hit in hits] == ["a", "c", "b", "d"]
+        assert all(isinstance(hit["distance"], float) for hit in hits)
+        hits_l2 = list(VectorMixin._get_rows_with_distance(ROWS, QUERY, "l2"))
+        assert [hit["row_id"] for hit in hits_l2] == ["a", "c", "b", "d"]
+
+    def test_threshold_and_top_k(self) -> None:
+        hits = list(
+            VectorMixin._get_rows_with_distance(
+                ROWS, QUERY, "cos", metric_threshold=0.0
+            )
+        )
+        assert [hit["row_id"] for hit in hits] == ["a", "c", "b"]
+        top_hits = list(
+            VectorMixin._get_rows_with_distance(
+                ROWS, QUERY, "cos", metric_threshold=0.0, top_k=2
+            )
+        )
+        assert [hit["row_id"] for hit in top_hits] == ["a", "c"]
+        top_l2_hits = list(
+            VectorMixin._get_rows_with_distance(
+                ROWS, QUERY, "l2", metric_threshold=1.5, top_k=1
+            )
+        )
+        assert [hit["row_id"] for hit in top_l2_hits] == ["a"]
+        assert list(VectorMixin._get_rows_with_distance([], QUERY, "cos")) == []
+
+    def test_threshold_boundary(self) -> None:
+        # distances are float64: equal to those of the plain Python
+        # computation, so that a threshold set at a distance keeps its row
+        rows = [{"row_id": "x", "vector": [0.1, 0.2]}]
+        query = [0.3, 0.4]
+        dot_product = 0.1 * 0.3 + 0.2 * 0.4
+        hits = list(
+            VectorMixin._get_rows_with_distance(
+                rows, query, "dot", metric_threshold=dot_product
+            )
+        )
+        assert [hit["distance"] for hit in hits] == [dot_product]
+        assert (
+            list(
+                VectorMixin._get_rows_with_distance(
+                    rows, query, "dot", metric_threshold=dot_product + 1e-12
+                )
+            )
+            == []
+        )
+        l2_hits = list(
+            VectorMixin._get_rows_with_distance(
+                rows, query, "l2", metric_threshold=0.08**0.5
+            )
+        )
+        assert [hit["row_id"] for hit in l2_hits] == ["x"]
+
+    def test_presorted(self) -> None:
+        hits = list(
+            VectorMixin._get_rows_with_distance(
+                ROWS, QUERY, "cos", metric_threshold=0.0, top_k=2, presorted=True
+            )
+        )
+        # input order is kept, only threshold and cut are applied
+        assert [hit["row_id"] for hit in hits] == ["a", "b"]
+
+    def test_maximal_marginal_relevance(self) -> None:
+        candidates = [
+            [1.0, 0.0],
+            [0.999, 0.01],
+            [0.0, 1.0],
+            [-1.0, 0.0],
+        ]
+        query = [1.0, 0.5]
+        # pure relevance: the two near-duplicates come first
+        assert maximal_marginal_relevance(query, candidates, 2, lambda_mult=1.0) == [
+            1,
+            0,
+        ]
+        # with diversity, the near-duplicate is skipped
+        assert maximal_marginal_relevance(query, candidates, 2, lambda_mult=0.5) == [
+            1,
+            2,
+        ]
+        assert len(maximal_marginal_relevance(query, candidates, 10)) == 4
+        assert maximal_marginal_relevance(query, [], 3) == []
+
+    def test_mmr_rows(self) -> None:
+        hits = VectorMixin._get_mmr_rows(ROWS, QUERY, 2, 0.5, "cos")
+        assert [hit["row_id"] for hit in hits] == ["a", "b"]
+        assert hits[0]["distance"] > hits[1]["distance"]